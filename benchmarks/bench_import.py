@@ -0,0 +1,9 @@
+"""Benchmarks for the time it takes to import pybiopax."""
+
+
+class TimeImport:
+    def timeraw_import_pybiopax(self):
+        return 'import pybiopax'
+
+    def timeraw_import_paths(self):
+        return 'import pybiopax.paths'
@@ -0,0 +1,61 @@
+"""Benchmarks for building derived indexes of models."""
+from pybiopax.fingerprint import get_model_fingerprint
+from pybiopax.validation import validate_model
+
+from .common import SCALES, get_fixture_model, get_synthetic_model
+
+
+class TimeIndexSynthetic:
+    params = SCALES
+    param_names = ['num_reactions']
+
+    def setup(self, num_reactions):
+        self.model = get_synthetic_model(num_reactions)
+
+    def teardown(self, num_reactions):
+        self.model.clear_indexes()
+
+    def time_get_attribute_index(self, num_reactions):
+        self.model.clear_indexes()
+        self.model.get_attribute_index('display_name')
+
+    def time_get_leaf_entity_references(self, num_reactions):
+        self.model.clear_indexes()
+        self.model.get_leaf_entity_references()
+
+    def time_normalized_xrefs(self, num_reactions):
+        self.model.clear_indexes()
+        self.model.normalized_xrefs()
+
+    def time_model_fingerprint(self, num_reactions):
+        self.model.clear_indexes()
+        get_model_fingerprint(self.model)
+
+    def time_validate_model(self, num_reactions):
+        validate_model(self.model)
+
+    def time_to_csr(self, num_reactions):
+        self.model.to_csr()
+
+
+class TimeIndexFixture:
+    timeout = 600
+    repeat = (1, 5, 120.0)
+
+    def setup(self):
+        self.model = get_fixture_model()
+
+    def time_get_attribute_index(self):
+        self.model.clear_indexes()
+        self.model.get_attribute_index('display_name')
+
+    def time_get_leaf_entity_references(self):
+        self.model.clear_indexes()
+        self.model.get_leaf_entity_references()
+
+    def time_model_fingerprint(self):
+        self.model.clear_indexes()
+        get_model_fingerprint(self.model)
+
+    def time_to_csr(self):
+        self.model.to_csr()
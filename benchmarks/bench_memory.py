@@ -0,0 +1,37 @@
+"""Benchmarks for the memory used by loaded models."""
+import pybiopax
+from pybiopax.profiling import memory_report, profile_load
+
+from .common import FIXTURE_PATH, SCALES, get_synthetic_model
+
+
+class MemorySynthetic:
+    params = SCALES
+    param_names = ['num_reactions']
+
+    def setup(self, num_reactions):
+        self.owl_str = pybiopax.model_to_owl_str(
+            get_synthetic_model(num_reactions))
+
+    def peakmem_model_from_owl_str(self, num_reactions):
+        pybiopax.model_from_owl_str(self.owl_str)
+
+    def track_bytes_per_object(self, num_reactions):
+        model = pybiopax.model_from_owl_str(self.owl_str)
+        report = memory_report(model)
+        return sum(stats['total'] for stats in report.values()) / \
+            len(model.objects)
+    track_bytes_per_object.unit = 'bytes'
+
+
+class MemoryFixture:
+    timeout = 1200
+    number = 1
+    repeat = 1
+
+    def track_traced_peak(self):
+        return profile_load(FIXTURE_PATH).peak
+    track_traced_peak.unit = 'bytes'
+
+    def peakmem_model_from_owl_gz(self):
+        pybiopax.model_from_owl_gz(FIXTURE_PATH)
@@ -0,0 +1,60 @@
+"""Benchmarks for deserializing models from OWL and JSON."""
+import gzip
+
+import pybiopax
+from pybiopax.biopax import BioPaxModel
+
+from .common import FIXTURE_PATH, SCALES, get_synthetic_model
+
+
+class TimeParseSynthetic:
+    params = SCALES
+    param_names = ['num_reactions']
+
+    def setup(self, num_reactions):
+        model = get_synthetic_model(num_reactions)
+        self.owl_str = pybiopax.model_to_owl_str(model)
+        self.json_str = model.to_json()
+
+    def time_model_from_owl_str(self, num_reactions):
+        pybiopax.model_from_owl_str(self.owl_str)
+
+    def time_model_from_json(self, num_reactions):
+        pybiopax.model_from_json(self.json_str)
+
+
+class TimeParseFixture:
+    timeout = 600
+    number = 1
+    repeat = (1, 3, 120.0)
+
+    def setup(self):
+        with gzip.open(FIXTURE_PATH, 'rt', encoding='utf-8') as fh:
+            self.owl_str = fh.read()
+
+    def time_model_from_owl_gz(self):
+        pybiopax.model_from_owl_gz(FIXTURE_PATH)
+
+    def time_model_from_owl_str(self):
+        pybiopax.model_from_owl_str(self.owl_str)
+
+    def time_model_from_owl_str_lazy_reverse_links(self):
+        pybiopax.model_from_owl_str(self.owl_str, lazy_reverse_links=True)
+
+
+class TimeAddReverseLinks:
+    params = SCALES
+    param_names = ['num_reactions']
+
+    def setup(self, num_reactions):
+        self.model = get_synthetic_model(num_reactions)
+
+    def time_add_reverse_links(self, num_reactions):
+        self.model.add_reverse_links()
+
+    def time_model_init(self, num_reactions):
+        BioPaxModel(self.model.objects, xml_base=self.model.xml_base)
+
+    def time_model_init_lazy_reverse_links(self, num_reactions):
+        BioPaxModel(self.model.objects, xml_base=self.model.xml_base,
+                    lazy_reverse_links=True)
@@ -0,0 +1,67 @@
+"""Benchmarks for path and graph queries on models."""
+from pybiopax.biopax import Complex, Pathway, Protein
+from pybiopax.paths import find_objects
+from pybiopax.sif import get_sif_edges
+
+from .common import SCALES, get_fixture_model, get_synthetic_model
+
+
+class TimeQuerySynthetic:
+    params = SCALES
+    param_names = ['num_reactions']
+
+    def setup(self, num_reactions):
+        self.model = get_synthetic_model(num_reactions)
+        self.pathways = list(self.model.get_objects_by_type(Pathway))
+        self.proteins = list(self.model.get_objects_by_type(Protein))
+
+    def time_find_objects_recursive(self, num_reactions):
+        for pathway in self.pathways:
+            find_objects(pathway, 'pathway_component*/left/entity_reference')
+
+    def time_find_objects_reverse(self, num_reactions):
+        for protein in self.proteins:
+            find_objects(protein, 'entity_reference/entity_reference_of/'
+                                  'participant_of')
+
+    def time_find_objects_predicate(self, num_reactions):
+        for protein in self.proteins[:100]:
+            find_objects(protein, 'entity_reference/xref[db=HGNC]',
+                         model=self.model)
+
+    def time_get_sif_edges(self, num_reactions):
+        self.model.clear_indexes()
+        get_sif_edges(self.model)
+
+    def time_submodel(self, num_reactions):
+        for pathway in self.pathways[:10]:
+            self.model.submodel([pathway])
+
+
+class TimeQueryFixture:
+    timeout = 600
+    repeat = (1, 5, 120.0)
+
+    def setup(self):
+        self.model = get_fixture_model()
+        self.complexes = list(self.model.get_objects_by_type(Complex))
+        self.proteins = list(self.model.get_objects_by_type(Protein))
+
+    def time_find_objects_recursive(self):
+        for cplx in self.complexes:
+            find_objects(cplx, 'component*:Protein/entity_reference')
+
+    def time_find_objects_reverse(self):
+        for protein in self.proteins:
+            find_objects(protein, 'entity_reference/entity_reference_of/'
+                                  'participant_of')
+
+    def time_find_objects_predicate(self):
+        for protein in self.proteins:
+            find_objects(protein,
+                         'entity_reference/xref[db=UniProt Isoform]',
+                         model=self.model)
+
+    def time_get_sif_edges(self):
+        self.model.clear_indexes()
+        get_sif_edges(self.model)
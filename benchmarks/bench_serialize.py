@@ -0,0 +1,56 @@
+"""Benchmarks for serializing models into OWL, JSON, pickles and columnar
+tables."""
+import pickle
+
+import pybiopax
+from pybiopax.xml_util import xml_to_str
+
+from .common import SCALES, get_fixture_model, get_synthetic_model
+
+
+class TimeSerializeSynthetic:
+    params = SCALES
+    param_names = ['num_reactions']
+
+    def setup(self, num_reactions):
+        self.model = get_synthetic_model(num_reactions)
+        self.xml = self.model.to_xml()
+
+    def time_to_xml(self, num_reactions):
+        self.model.to_xml()
+
+    def time_xml_to_str(self, num_reactions):
+        xml_to_str(self.xml)
+
+    def time_model_to_owl_str(self, num_reactions):
+        pybiopax.model_to_owl_str(self.model)
+
+    def time_to_arrow(self, num_reactions):
+        self.model.to_arrow()
+
+    def time_to_json(self, num_reactions):
+        self.model.to_json()
+
+    def time_pickle_round_trip(self, num_reactions):
+        pickle.loads(pickle.dumps(self.model))
+
+
+class TimeSerializeFixture:
+    timeout = 600
+    number = 1
+    repeat = (1, 3, 120.0)
+
+    def setup(self):
+        self.model = get_fixture_model()
+
+    def time_model_to_owl_str(self):
+        pybiopax.model_to_owl_str(self.model)
+
+    def time_to_arrow(self):
+        self.model.to_arrow()
+
+    def time_to_json(self):
+        self.model.to_json()
+
+    def time_pickle_round_trip(self):
+        pickle.loads(pickle.dumps(self.model))
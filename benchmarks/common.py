@@ -0,0 +1,34 @@
+"""Shared fixtures for the benchmarks."""
+import os
+
+import pybiopax
+from pybiopax.biopax.model import PYBIOPAX_TQDM_CONFIG
+from pybiopax.tests.synthetic import make_synthetic_model
+
+# Progress bars would otherwise be part of the timings
+PYBIOPAX_TQDM_CONFIG['disable'] = True
+
+TESTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                         os.pardir, 'pybiopax', 'tests')
+
+FIXTURE_PATH = os.path.join(TESTS_DIR, 'biopax_test.owl.gz')
+"""The 58,027 object Reactome fixture used by the tests."""
+
+SCALES = [100, 1000, 5000]
+"""Numbers of reactions in the synthetic models, from about a thousand to
+about forty thousand objects."""
+
+_fixture_model = None
+
+
+def get_fixture_model():
+    """Return the fixture model, loading it once per process."""
+    global _fixture_model
+    if _fixture_model is None:
+        _fixture_model = pybiopax.model_from_owl_gz(FIXTURE_PATH)
+    return _fixture_model
+
+
+def get_synthetic_model(num_reactions):
+    """Return a synthetic model with the given number of reactions."""
+    return make_synthetic_model(num_reactions, seed=0)
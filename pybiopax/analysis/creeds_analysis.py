@@ -5,9 +5,9 @@
 import pickle
 import logging
 from collections import defaultdict
-from typing import Optional, Type
+from pathlib import Path
+from typing import Iterable, Optional, Type
 
-import bioregistry
 import bioversions
 import numpy as np
 import pandas as pd
@@ -17,12 +17,12 @@ import pystow
 import seaborn
 from indra.sources import creeds
 from indra.statements import Agent, RegulateAmount, Statement, stmts_to_json_file
-from scipy.stats import fisher_exact
-from statsmodels.stats.multitest import multipletests
 from tqdm import tqdm
 
 import pybiopax
-from pybiopax.biopax import Protein
+from pybiopax.analysis.enrichment import hypergeometric_enrichment
+from pybiopax.analysis.gene_sets import build_gene_set_matrix, get_model_genes
+from pybiopax.biopax import BioPaxModel
 
 logger = logging.getLogger(__name__)
 
@@ -37,46 +37,36 @@ def get_reactome_human_ids() -> set[str]:
     return rv
 
 
-def get_protein_hgnc(protein: Protein) -> Optional[str]:
-    # only useful for reactome
-    if protein.entity_reference is None:
-        return None
-    rv = {bioregistry.normalize_prefix(xref.db): xref.id for xref in protein.entity_reference.xref}
-    hgnc_id = rv.get("hgnc")
-    if hgnc_id is not None:
-        return hgnc_id
-    uniprot_id = rv.get("uniprot")
-    if uniprot_id is not None:
-        hgnc_id = protmapper.uniprot_client.get_hgnc_id(uniprot_id)
-        if hgnc_id:
-            return hgnc_id
-    uniprot_isoform_id = rv.get("uniprot.isoform")
-    if uniprot_isoform_id is not None:
-        hgnc_id = protmapper.uniprot_client.get_hgnc_id(uniprot_isoform_id)
-        if hgnc_id:
-            return hgnc_id
-    return None
-
-
-def ensure_reactome(reactome_id: str, force: bool = False) -> BioPaxModel:
+def ensure_reactome_path(reactome_id: str, force: bool = False) -> Path:
     path = REACTOME_MODULE.join(name=f"{reactome_id}.xml")
     if path.is_file() and not force:
-        with path.open("rb") as file:
-            return pickle.load(file)
+        return path
     logger.info(f'Getting {reactome_id}')
     model = pybiopax.model_from_reactome(reactome_id)
     with path.open("wb") as file:
         pickle.dump(model, file)
-    return model
+    return path
+
+
+def ensure_reactome(reactome_id: str, force: bool = False) -> BioPaxModel:
+    path = ensure_reactome_path(reactome_id, force=force)
+    with path.open("rb") as file:
+        return pickle.load(file)
 
 
 def get_reactome_genes(reactome_id: str) -> set[str]:
     model = ensure_reactome(reactome_id)
-    rv = set()
-    for protein in model.get_objects_by_type(Protein):
-        if (hgnc_id := get_protein_hgnc(protein)) is not None:
-            rv.add(hgnc_id)
-    return rv
+    return get_model_genes(model)
+
+
+def get_reactome_gene_sets(reactome_ids: Iterable[str]) -> dict[str, set[str]]:
+    """Return the gene sets of Reactome pathways, built in parallel and cached."""
+    paths = {
+        reactome_id: ensure_reactome_path(reactome_id)
+        for reactome_id in tqdm(sorted(reactome_ids), desc="Downloading Reactome pathways")
+    }
+    matrix = build_gene_set_matrix(paths, cache_dir=REACTOME_MODULE.join("gene_sets"))
+    return matrix.to_gene_sets()
 
 
 def get_creeds_statements(entity_type: str) -> list[Statement]:
@@ -151,38 +141,9 @@ def get_chemical_groups(
     return dict(rv)
 
 
-def _prepare_hypergeometric_test(
-    query_gene_set: set[str],
-    pathway_gene_set: set[str],
-    gene_universe: int,
-) -> np.ndarray:
-    """Prepare the matrix for hypergeometric test calculations.
-
-    :param query_gene_set: gene set to test against pathway
-    :param pathway_gene_set: pathway gene set
-    :param gene_universe: number of HGNC symbols
-    :return: 2x2 matrix
-    """
-    return np.array(
-        [
-            [
-                len(query_gene_set.intersection(pathway_gene_set)),
-                len(query_gene_set.difference(pathway_gene_set)),
-            ],
-            [
-                len(pathway_gene_set.difference(query_gene_set)),
-                gene_universe - len(pathway_gene_set.union(query_gene_set)),
-            ],
-        ]
-    )
-
-
 def _main():
     reactome_ids = get_reactome_human_ids()
-    reactome_it = [
-        (reactome_id, get_reactome_genes(reactome_id))
-        for reactome_id in tqdm(reactome_ids, desc="Downloading Reactome pathways")
-    ]
+    reactome_it = list(get_reactome_gene_sets(reactome_ids).items())
 
     universe_size = len(pyobo.get_ids("hgnc"))
     groups = [
@@ -195,22 +156,30 @@ def _main():
         tqdm.write(f"generating CREEDS types {entity_type}")
         stmts = get_creeds_statements(entity_type)
         perts = f(stmts)
-        dfs = []
-        for pert_id, pert_genes in tqdm(perts.items()):
-            rows = []
-            for reactome_id, reactome_genes in tqdm(reactome_it, leave=False):
-                table = _prepare_hypergeometric_test(pert_genes, reactome_genes, universe_size)
-                _, p_value = fisher_exact(table, alternative="greater")
-                rows.append((f"{prefix}:{pert_id}", f"reactome:{reactome_id}", p_value))
-            df = pd.DataFrame(rows, columns=["perturbation", "pathway", "p"])
-            correction_test = multipletests(df["p"], method="fdr_bh")
-            df["q"] = correction_test[1]
-            df["mlq"] = -np.log10(df["q"])  # minus log q
-            df.sort_values("q", inplace=True)
-            dfs.append(df)
+        pert_ids = list(perts)
+        # All perturbation x pathway tests are computed at once, with
+        # q-values adjusted over pathways for each perturbation
+        _, p_values, q_values = hypergeometric_enrichment(
+            [perts[pert_id] for pert_id in pert_ids],
+            [reactome_genes for _, reactome_genes in reactome_it],
+            universe_size,
+        )
+        pert_curies = [f"{prefix}:{pert_id}" for pert_id in pert_ids]
+        pathway_curies = [f"reactome:{reactome_id}" for reactome_id, _ in reactome_it]
+        df = pd.DataFrame(
+            {
+                "perturbation": np.repeat(pert_curies, len(pathway_curies)),
+                "pathway": np.tile(pathway_curies, len(pert_curies)),
+                "p": p_values.ravel(),
+                "q": q_values.ravel(),
+            }
+        )
+        df["mlq"] = -np.log10(df["q"])  # minus log q
+        # Sort by q-value within each perturbation, keeping perturbations in order
+        pert_idx = np.repeat(np.arange(len(pert_curies)), len(pathway_curies))
+        df = df.iloc[np.lexsort((df["q"].to_numpy(), pert_idx))]
 
         path = CREEDS_MODULE.join(name=f"{entity_type}.tsv")
-        df = pd.concat(dfs)
         df.to_csv(path, sep="\t", index=False)
         print("output to", path)
 
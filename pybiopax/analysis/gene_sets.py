@@ -0,0 +1,258 @@
+# -*- coding: utf-8 -*-
+
+"""Build pathway gene sets for a corpus of BioPAX models.
+
+The genes of each model are extracted in a pool of worker processes and
+collected into a single sparse pathway x gene membership matrix with row and
+column labels, which can be cached on disk.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import pickle
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Iterable, List, Mapping, Optional, Set, Union
+
+import numpy as np
+from scipy.sparse import csr_matrix, load_npz, save_npz
+
+import pybiopax
+from pybiopax.biopax import (
+    BioPaxModel,
+    EntityReference,
+    PhysicalEntity,
+    Protein,
+    ProteinReference,
+)
+from pybiopax.parallel import map_chunks
+from pybiopax.references import XrefNormalizer
+
+__all__ = [
+    "GeneSetMatrix",
+    "build_gene_set_matrix",
+    "get_entity_genes",
+    "get_hgnc_normalizer",
+    "get_model_genes",
+    "get_protein_hgnc",
+    "get_reference_hgnc",
+]
+
+logger = logging.getLogger(__name__)
+
+ModelSource = Union[str, os.PathLike, BioPaxModel]
+
+
+@lru_cache(maxsize=1)
+def get_hgnc_normalizer() -> XrefNormalizer:
+    """Return a shared xref normalizer with UniProt to HGNC mappings from protmapper."""
+    # protmapper builds its mappings on first use, so this is only done in
+    # processes that actually need it
+    return XrefNormalizer.from_protmapper()
+
+
+def get_reference_hgnc(reference: EntityReference) -> Optional[str]:
+    """Return the HGNC identifier of a protein reference, if available."""
+    # only useful for reactome
+    if not isinstance(reference, ProteinReference):
+        return None
+    return get_hgnc_normalizer().get_hgnc_id(reference.xref)
+
+
+def get_protein_hgnc(protein: Protein) -> Optional[str]:
+    """Return the HGNC identifier of a protein's entity reference, if available."""
+    if protein.entity_reference is None:
+        return None
+    return get_reference_hgnc(protein.entity_reference)
+
+
+def get_entity_genes(
+    model: BioPaxModel,
+    entity: PhysicalEntity,
+    gene_mapper: Callable[[EntityReference], Optional[str]] = get_reference_hgnc,
+) -> Set[str]:
+    """Return the genes an entity is made up of.
+
+    Complexes and generics are resolved to their leaf entity references
+    with :meth:`pybiopax.biopax.BioPaxModel.leaf_entity_references`.
+
+    :param model: the BioPAX model containing the entity
+    :param entity: a physical entity, e.g., a protein or complex
+    :param gene_mapper: a function returning the gene identifier of an entity
+        reference, if available
+    :return: the set of gene identifiers
+    """
+    rv = set()
+    for reference in model.leaf_entity_references(entity):
+        gene_id = gene_mapper(reference)
+        if gene_id is not None:
+            rv.add(gene_id)
+    return rv
+
+
+def get_model_genes(
+    model: BioPaxModel,
+    gene_mapper: Callable[[EntityReference], Optional[str]] = get_reference_hgnc,
+) -> Set[str]:
+    """Return the genes of the physical entities in a model.
+
+    Entities nested in complexes and members of generic entities and entity
+    references are included.
+
+    :param model: a BioPAX model
+    :param gene_mapper: a function returning the gene identifier of an entity
+        reference, if available
+    :return: the set of gene identifiers
+    """
+    references = set()
+    for leaves in model.get_leaf_entity_references().values():
+        references |= leaves
+    rv = set()
+    for reference in references:
+        gene_id = gene_mapper(reference)
+        if gene_id is not None:
+            rv.add(gene_id)
+    return rv
+
+
+class GeneSetMatrix:
+    """A sparse binary pathway x gene membership matrix with labels."""
+
+    def __init__(self, matrix: csr_matrix, pathways: List[str], genes: List[str]):
+        self.matrix = matrix
+        self.pathways = pathways
+        self.genes = genes
+
+    def get_gene_set(self, pathway: str) -> Set[str]:
+        """Return the genes of a pathway."""
+        return self._get_row_genes(self.pathways.index(pathway))
+
+    def to_gene_sets(self) -> Mapping[str, Set[str]]:
+        """Return a dict from pathways to their gene sets."""
+        return {pathway: self._get_row_genes(row) for row, pathway in enumerate(self.pathways)}
+
+    def _get_row_genes(self, row: int) -> Set[str]:
+        start, end = self.matrix.indptr[row], self.matrix.indptr[row + 1]
+        return {self.genes[idx] for idx in self.matrix.indices[start:end]}
+
+    def save(self, directory: Union[str, os.PathLike], key: Optional[str] = None):
+        """Save the matrix and its labels into a directory.
+
+        :param directory: the directory to save into
+        :param key: a key identifying the inputs the matrix was built from
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        save_npz(directory / "matrix.npz", self.matrix)
+        with open(directory / "labels.json", "w") as file:
+            json.dump({"key": key, "pathways": self.pathways, "genes": self.genes}, file)
+
+    @classmethod
+    def load(
+        cls, directory: Union[str, os.PathLike], key: Optional[str] = None
+    ) -> Optional["GeneSetMatrix"]:
+        """Load a matrix saved into a directory.
+
+        :param directory: the directory the matrix was saved into
+        :param key: if given, the matrix is only loaded if it was saved with the same key
+        :return: the matrix, or None if it is not available
+        """
+        directory = Path(directory)
+        if not (directory / "labels.json").is_file():
+            return None
+        with open(directory / "labels.json") as file:
+            labels = json.load(file)
+        if key is not None and labels["key"] != key:
+            return None
+        return cls(load_npz(directory / "matrix.npz").tocsr(), labels["pathways"], labels["genes"])
+
+
+def build_gene_set_matrix(
+    sources: Mapping[str, ModelSource],
+    gene_mapper: Callable[[EntityReference], Optional[str]] = get_reference_hgnc,
+    n_jobs: Optional[int] = None,
+    cache_dir: Union[None, str, os.PathLike] = None,
+) -> GeneSetMatrix:
+    """Build a pathway x gene matrix for a corpus of models.
+
+    :param sources: a dict from pathway labels to BioPAX models or to paths of
+        OWL (optionally gzipped) or pickled model files. Models are loaded and
+        their genes are extracted in worker processes forked from the current
+        process.
+    :param gene_mapper: a module-level function returning the gene identifier
+        of an entity reference, if available
+    :param n_jobs: the number of worker processes. By default, the number of CPUs.
+    :param cache_dir: a directory to cache the matrix in. The cache is reused
+        if the sources (paths with their size and modification time, or
+        models with their number of objects) are unchanged.
+    :return: the gene set matrix
+    """
+    labels = list(sources)
+    key = _get_cache_key(sources, gene_mapper) if cache_dir is not None else None
+    if cache_dir is not None:
+        cached = GeneSetMatrix.load(cache_dir, key=key)
+        if cached is not None:
+            logger.info("Loaded cached gene set matrix from %s", cache_dir)
+            return cached
+
+    state = ([sources[label] for label in labels], gene_mapper)
+    gene_sets = []
+    chunks = map_chunks(_get_chunk_genes, state, len(labels), n_jobs=n_jobs, chunk_size=1)
+    for chunk_genes in chunks:
+        gene_sets += chunk_genes
+
+    matrix = _get_matrix(labels, gene_sets)
+    if cache_dir is not None:
+        matrix.save(cache_dir, key=key)
+    return matrix
+
+
+def _get_matrix(labels: List[str], gene_sets: Iterable[Set[str]]) -> GeneSetMatrix:
+    gene_sets = list(gene_sets)
+    genes = sorted(set().union(*gene_sets)) if gene_sets else []
+    gene_index = {gene: idx for idx, gene in enumerate(genes)}
+    indptr = [0]
+    indices = []
+    for gene_set in gene_sets:
+        indices.extend(sorted(gene_index[gene] for gene in gene_set))
+        indptr.append(len(indices))
+    data = np.ones(len(indices), dtype=np.int8)
+    matrix = csr_matrix(
+        (data, np.array(indices, dtype=np.int64), np.array(indptr, dtype=np.int64)),
+        shape=(len(labels), len(genes)),
+    )
+    return GeneSetMatrix(matrix, labels, genes)
+
+
+def _get_chunk_genes(state, start, end) -> List[Set[str]]:
+    sources, gene_mapper = state
+    return [get_model_genes(_load_model(source), gene_mapper) for source in sources[start:end]]
+
+
+def _load_model(source: ModelSource) -> BioPaxModel:
+    if isinstance(source, BioPaxModel):
+        return source
+    path = Path(source)
+    # Files are told apart by their content since cached pickles don't
+    # necessarily have a .pkl suffix
+    with path.open("rb") as file:
+        magic = file.read(2)
+        if magic[:1] == b"\x80":
+            file.seek(0)
+            return pickle.load(file)
+    if magic == b"\x1f\x8b":
+        return pybiopax.model_from_owl_gz(path)
+    return pybiopax.model_from_owl_file(path)
+
+
+def _get_cache_key(sources: Mapping[str, ModelSource], gene_mapper) -> str:
+    parts = [f"{gene_mapper.__module__}.{gene_mapper.__qualname__}"]
+    for label, source in sources.items():
+        if isinstance(source, BioPaxModel):
+            parts.append(f"{label}\tmodel\t{len(source.objects)}")
+        else:
+            stat = os.stat(source)
+            parts.append(f"{label}\t{os.fspath(source)}\t{stat.st_size}\t{stat.st_mtime_ns}")
+    return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
@@ -2,40 +2,65 @@ __all__ = ['model_from_owl_str', 'model_from_owl_file', 'model_to_owl_str',
            'model_to_owl_file', 'model_from_owl_url', 'model_from_pc_query',
            'model_from_reactome', 'model_from_ecocyc', 'model_from_metacyc',
            'model_from_biocyc', 'model_from_humancyc', 'model_from_netpath',
-           'model_from_owl_gz', 'PYBIOPAX_TQDM_CONFIG'
+           'model_from_owl_gz', 'model_from_json', 'PYBIOPAX_TQDM_CONFIG'
            ]
 
 import gzip
 import os
 import pathlib
 
-import requests
-from lxml import etree
 from typing import Any, Mapping, Optional, Union
 from .biopax.model import BioPaxModel, PYBIOPAX_TQDM_CONFIG
+from .instrumentation import LoadInstrumentation, timed_phase
+from .jsonld import model_from_json
+from .resolver import ReferenceResolver
 from .xml_util import xml_to_str, xml_to_file
 from .pc_client import graph_query
 
 
-def model_from_owl_str(owl_str: str) -> BioPaxModel:
+def model_from_owl_str(owl_str: str,
+                       instrumentation: Optional[LoadInstrumentation] = None,
+                       resolver: Optional[ReferenceResolver] = None,
+                       lazy_reverse_links: bool = False) -> BioPaxModel:
     """Return a BioPAX Model from an OWL string.
 
     Parameters
     ----------
     owl_str :
         A OWL string of BioPAX content.
+    instrumentation :
+        An instrumentation object notified of the progress of loading,
+        e.g., a :class:`pybiopax.instrumentation.LoadStats` collecting
+        the time taken by each phase.
+    resolver :
+        A resolver for references to objects defined outside of the
+        content, e.g., in other files of a split corpus, see
+        :mod:`pybiopax.resolver`. By default, such references are kept as
+        uid strings.
+    lazy_reverse_links :
+        If True, reverse links (e.g., ``participant_of``) are looked up in
+        an index of the model built on first access rather than added to
+        the objects when loading, see
+        :class:`pybiopax.biopax.BioPaxModel`. Default: False
 
     Returns
     -------
     pybiopax.biopax.BioPaxModel
         A BioPAX Model deserialized from the OWL string.
     """
-    return BioPaxModel.from_xml(etree.fromstring(owl_str.encode('utf-8')))
+    from lxml import etree
+    with timed_phase(instrumentation, 'parse_xml'):
+        tree = etree.fromstring(owl_str.encode('utf-8'))
+    return BioPaxModel.from_xml(tree, instrumentation=instrumentation,
+                                resolver=resolver,
+                                lazy_reverse_links=lazy_reverse_links)
 
 
 def model_from_owl_file(fname: Union[str, pathlib.Path, os.PathLike],
-                        encoding: Optional[str] = None) \
-        -> BioPaxModel:
+                        encoding: Optional[str] = None,
+                        instrumentation: Optional[LoadInstrumentation] = None,
+                        resolver: Optional[ReferenceResolver] = None,
+                        lazy_reverse_links: bool = False) -> BioPaxModel:
     """Return a BioPAX Model from an OWL string.
 
     Parameters
@@ -44,6 +69,15 @@ def model_from_owl_file(fname: Union[str, pathlib.Path, os.PathLike],
         A path to an OWL file of BioPAX content.
     encoding :
         The encoding type to be passed to :func:`open`.
+    instrumentation :
+        An instrumentation object notified of the progress of loading, see
+        :func:`model_from_owl_str`.
+    resolver :
+        A resolver for references to objects defined outside of the
+        content, see :func:`model_from_owl_str`.
+    lazy_reverse_links :
+        Whether to look up reverse links in an index of the model, see
+        :func:`model_from_owl_str`. Default: False
 
     Returns
     -------
@@ -52,12 +86,17 @@ def model_from_owl_file(fname: Union[str, pathlib.Path, os.PathLike],
     """
     with open(fname, 'r', encoding=encoding) as fh:
         owl_str = fh.read()
-        return model_from_owl_str(owl_str)
+        return model_from_owl_str(owl_str, instrumentation=instrumentation,
+                                  resolver=resolver,
+                                  lazy_reverse_links=lazy_reverse_links)
 
 
 def model_from_owl_gz(
     path: Union[str, pathlib.Path, os.PathLike],
     encoding: Optional[str] = None,
+    instrumentation: Optional[LoadInstrumentation] = None,
+    resolver: Optional[ReferenceResolver] = None,
+    lazy_reverse_links: bool = False,
 ) -> BioPaxModel:
     """Return a BioPAX Model from an OWL file (gzipped).
 
@@ -69,30 +108,60 @@ def model_from_owl_gz(
         The encoding to read the file with. Defaults to the
         system default. Sometimes, windows users will need to
         explicitly set this to utf-8.
+    instrumentation :
+        An instrumentation object notified of the progress of loading, see
+        :func:`model_from_owl_str`.
+    resolver :
+        A resolver for references to objects defined outside of the
+        content, see :func:`model_from_owl_str`.
+    lazy_reverse_links :
+        Whether to look up reverse links in an index of the model, see
+        :func:`model_from_owl_str`. Default: False
 
     Returns
     -------
     :
         A BioPAX Model deserialized from the OWL file.
     """
+    from lxml import etree
     with gzip.open(path, 'rt', encoding=encoding) as fh:
-        return BioPaxModel.from_xml(etree.parse(fh).getroot())
-
-
-def model_from_owl_gz_str(owl_gz_str: bytes) -> BioPaxModel:
+        with timed_phase(instrumentation, 'parse_xml'):
+            tree = etree.parse(fh).getroot()
+    return BioPaxModel.from_xml(tree, instrumentation=instrumentation,
+                                resolver=resolver,
+                                lazy_reverse_links=lazy_reverse_links)
+
+
+def model_from_owl_gz_str(owl_gz_str: bytes,
+                          instrumentation: Optional[LoadInstrumentation]
+                          = None,
+                          resolver: Optional[ReferenceResolver] = None,
+                          lazy_reverse_links: bool = False) -> BioPaxModel:
     """Return a BioPAX Model from an OWL string.
 
     Parameters
     ----------
     owl_gz_str :
         A OWL string of BioPAX content.
+    instrumentation :
+        An instrumentation object notified of the progress of loading, see
+        :func:`model_from_owl_str`.
+    resolver :
+        A resolver for references to objects defined outside of the
+        content, see :func:`model_from_owl_str`.
+    lazy_reverse_links :
+        Whether to look up reverse links in an index of the model, see
+        :func:`model_from_owl_str`. Default: False
 
     Returns
     -------
     pybiopax.biopax.BioPaxModel
         A BioPAX Model deserialized from the OWL string.
     """
-    return model_from_owl_str(gzip.decompress(owl_gz_str).decode('utf-8'))
+    return model_from_owl_str(gzip.decompress(owl_gz_str).decode('utf-8'),
+                              instrumentation=instrumentation,
+                              resolver=resolver,
+                              lazy_reverse_links=lazy_reverse_links)
 
 
 def model_from_owl_url(url: str,
@@ -112,6 +181,7 @@ def model_from_owl_url(url: str,
     :
         A BioPAX Model deserialized from the OWL file.
     """
+    import requests
     request_params = {} if not request_params else request_params
     res = requests.get(url, **request_params)
     res.raise_for_status()
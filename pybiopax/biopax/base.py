@@ -1,7 +1,7 @@
 __all__ = ['BioPaxObject', 'Controller', 'Entity', 'Pathway', 'Gene',
-           'Unresolved', 'Observable', 'Named', 'XReferrable']
+           'Unresolved', 'Observable', 'Named', 'XReferrable', 'ReverseLink']
 
-from typing import List, Optional, TYPE_CHECKING
+from typing import List, Optional, Tuple, TYPE_CHECKING
 
 from ..xml_util import *
 
@@ -15,6 +15,108 @@ class Unresolved:
         self.obj_id = obj_id
 
 
+_attribute_keys = {}
+
+
+def get_attribute_keys(obj) -> Tuple[Tuple[str, str], ...]:
+    """Return the BioPAX attributes of an object with the keys under which
+    their values are stored in the object's __dict__.
+
+    The attributes are determined once per class and cached. The attribute
+    name and key only differ for the plain names of Named objects which are
+    stored under ``_name``. The uid and reverse links are not included.
+
+    Parameters
+    ----------
+    obj : BioPaxObject
+        A BioPAX object.
+
+    Returns
+    -------
+    :
+        A tuple of (attribute name, key) pairs.
+    """
+    cls = obj.__class__
+    keys = _attribute_keys.get(cls)
+    if keys is None:
+        keys = tuple((key, key) for key in vars(obj)
+                     if not key.startswith('_') and key != 'uid')
+        if '_name' in vars(obj):
+            keys += (('name', '_name'),)
+        _attribute_keys[cls] = keys
+    return keys
+
+
+class ReverseLink:
+    """The reverse link of an attribute referring to other objects, i.e.,
+    the set of objects referring to an object via the attribute, e.g.,
+    ``participant_of`` for ``participant``.
+
+    Reverse links are stored in the objects as sets under ``_<name>``,
+    filled in by :meth:`BioPaxModel.add_reverse_links` and otherwise
+    created empty when first accessed. For objects of models with lazy
+    reverse links, they are instead looked up in an index of the model,
+    built on first access, see :class:`BioPaxModel`.
+
+    Parameters
+    ----------
+    attribute :
+        The name of the attribute, e.g., ``participant``.
+    """
+    def __init__(self, attribute: str):
+        self.attribute = attribute
+        self.key = '_%s_of' % attribute
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        obj_dict = obj.__dict__
+        links = obj_dict.get(self.key)
+        if links is None:
+            model = obj_dict.get('_model')
+            if model is not None:
+                return model.get_reverse_links(obj, self.attribute)
+            links = set()
+            obj_dict[self.key] = links
+        return links
+
+    def __set__(self, obj, value):
+        raise AttributeError("can't set reverse link %s_of"
+                             % self.attribute)
+
+
+_reverse_link_keys = {}
+
+
+def get_reverse_link_keys(cls) -> Tuple[str, ...]:
+    """Return the keys under which the reverse links of the objects of a
+    class are stored in their __dict__, e.g., ``_participant_of``.
+
+    Parameters
+    ----------
+    cls : type
+        A BioPAX class.
+
+    Returns
+    -------
+    :
+        The keys in alphabetical order, determined once per class.
+    """
+    keys = _reverse_link_keys.get(cls)
+    if keys is None:
+        keys = tuple(link.key for link in
+                     (getattr(cls, attr, None) for attr in dir(cls))
+                     if isinstance(link, ReverseLink))
+        _reverse_link_keys[cls] = keys
+    return keys
+
+
+def is_reverse_link(key: str, val) -> bool:
+    """Return True if an entry of an object's __dict__ holds reverse links,
+    i.e., a set of reverse links or the model whose index holds them."""
+    return (isinstance(val, set) and key.endswith('_of')) or key == '_model'
+
+
 class BioPaxObject:
     """Generic BioPAX Object. It is the parent class of all more specific
     BioPAX classes."""
@@ -26,50 +128,60 @@ class BioPaxObject:
         super().__init__(**kwargs)
         self.uid = uid
         self.comment = comment if comment else []
+        # Reverse links and the model whose index holds them are only set
+        # when needed, but their keys are reserved here so that the objects
+        # of a class share the keys of their __dict__
+        for key in get_reverse_link_keys(self.__class__):
+            setattr(self, key, None)
+        self._model = None
 
     @classmethod
     def from_xml(cls, element):
-        uid = get_id_or_about(element)
-        kwargs = {'uid': uid}
-        for key in cls.list_types:
-            kwargs[key] = []
-        for child in element.getchildren():
-            key = get_attr_tag(child)
-            # In some OWL formats, the child is directly defined
-            # under this tag, in that case we directly deserialize it.
-            if child.getchildren():
-                gchild = child.getchildren()[0]
-                obj_cls = globals()[get_tag(gchild)]
-                val_to_add = obj_cls.from_xml(gchild)
-            # Otherwise, we check if the element is a simple type that we
-            # can just get as a text value
-            elif (get_datatype(child.attrib) is None
-                  and not get_resource(child.attrib)) \
-                    or is_datatype(child.attrib, 'xsd', 'string') \
-                    or is_datatype(child.attrib, 'xsd', 'int') \
-                    or is_datatype(child.attrib, 'xsd', 'float'):
-                val_to_add = child.text
-            # If neither of the above is the case, then we assume that the
-            # element is a reference that is defined in another block
-            # somewhere so we treat is as Unresolved until later.
-            else:
-                res = get_resource(child.attrib)
-                val_to_add = Unresolved(res)
-
-            if key in cls.list_types:
-                kwargs[key].append(val_to_add)
-            else:
-                kwargs[key] = val_to_add
-        return cls(**kwargs)
+        """Return an object from its OWL/XML element.
+
+        Objects defined inline in the element are deserialized along with
+        it, see :func:`parse_element`.
+        """
+        obj, _ = parse_element(element, cls=cls)
+        return obj
+
+    def __getstate__(self):
+        # Reverse links, and the model whose index holds them, are left
+        # out, otherwise pickling an object would pickle the objects
+        # referring to it, and recursively most of its model. They are
+        # rebuilt when the object is added to a model.
+        return {key: (None if is_reverse_link(key, val) else val)
+                for key, val in self.__dict__.items()}
+
+    def to_json_dict(self, depth: int = 0):
+        """Return the JSON-LD node of the object.
+
+        See :func:`pybiopax.jsonld.object_to_json_dict` for details.
+
+        Parameters
+        ----------
+        depth :
+            The number of levels of referenced objects to embed in the node.
+            Default: 0
+
+        Returns
+        -------
+        dict
+            A JSON-serializable dict.
+        """
+        from ..jsonld import object_to_json_dict
+        return object_to_json_dict(self, depth=depth)
 
     def to_xml(self):
         id_type = 'about' if is_url(self.uid) else 'ID'
         element = makers['bp'](self.__class__.__name__,
                                **{nselem('rdf', id_type): self.uid})
+        cls = self.__class__
         for attr in [a for a in dir(self)
                      if not a.startswith('_')
                      and a not in {'list_types', 'xml_types',
-                                   'to_xml', 'from_xml', 'uid'}]:
+                                   'to_xml', 'from_xml', 'uid'}
+                     and not isinstance(getattr(cls, a, None), ReverseLink)]:
             val = getattr(self, attr)
             if val is None:
                 continue
@@ -109,6 +221,117 @@ class BioPaxObject:
         return None
 
 
+def parse_element(element, objects=None, cls=None) \
+        -> Tuple[BioPaxObject, List[BioPaxObject]]:
+    """Return the object defined by an OWL/XML element and the objects
+    defined inline in it.
+
+    Inline objects, i.e., objects defined within the element of an
+    attribute rather than referred to by URI, can be nested arbitrarily
+    deep. They are parsed with an explicit stack rather than recursively,
+    and each object is parsed once per URI: other inline definitions of the
+    same URI are references to the same object.
+
+    Parameters
+    ----------
+    element : lxml.etree._Element
+        The element defining the object.
+    objects : Optional[Mapping[str, BioPaxObject]]
+        Objects that were already deserialized, by URI. Inline definitions
+        of these URIs aren't parsed, they refer to the existing objects.
+    cls : Optional[type]
+        The class of the object. By default, it is determined by the tag
+        of the element.
+
+    Returns
+    -------
+    :
+        The object and the list of the objects defined inline in it, each
+        once.
+    """
+    # The class, constructor arguments and (attribute, list position,
+    # entry) of inline values of each object, in the order they are found
+    entries = [None]
+    entry_uids = {}
+    stack = [(element, 0, cls or globals()[get_tag(element)])]
+    while stack:
+        elem, idx, obj_cls = stack.pop()
+        kwargs = {'uid': get_id_or_about(elem)}
+        for key in obj_cls.list_types:
+            kwargs[key] = []
+        inline_values = []
+        for child in elem:
+            # Skip comments and processing instructions
+            if not isinstance(child.tag, str):
+                continue
+            key = get_attr_tag(child)
+            is_list = key in obj_cls.list_types
+            # In some OWL formats, objects are directly defined under the
+            # tag of the attribute, in that case they are deserialized
+            # along with this object
+            if len(child):
+                for gchild in child:
+                    if not isinstance(gchild.tag, str):
+                        continue
+                    uid = get_id_or_about(gchild)
+                    val = objects.get(uid) if objects and uid is not None \
+                        else None
+                    if val is None:
+                        child_idx = entry_uids.get(uid) \
+                            if uid is not None else None
+                        if child_idx is None:
+                            child_idx = len(entries)
+                            entries.append(None)
+                            if uid is not None:
+                                entry_uids[uid] = child_idx
+                            stack.append((gchild, child_idx,
+                                          globals()[get_tag(gchild)]))
+                        inline_values.append(
+                            (key, len(kwargs[key]) if is_list else None,
+                             child_idx, uid))
+                    if is_list:
+                        kwargs[key].append(val)
+                    else:
+                        kwargs[key] = val
+                continue
+            # Otherwise, we check if the element is a simple type that we
+            # can just get as a text value
+            elif (get_datatype(child.attrib) is None
+                  and not get_resource(child.attrib)) \
+                    or is_datatype(child.attrib, 'xsd', 'string') \
+                    or is_datatype(child.attrib, 'xsd', 'int') \
+                    or is_datatype(child.attrib, 'xsd', 'float'):
+                val_to_add = child.text
+            # If neither of the above is the case, then we assume that the
+            # element is a reference that is defined in another block
+            # somewhere so we treat is as Unresolved until later.
+            else:
+                res = get_resource(child.attrib)
+                val_to_add = Unresolved(res)
+
+            if is_list:
+                kwargs[key].append(val_to_add)
+            else:
+                kwargs[key] = val_to_add
+        entries[idx] = (obj_cls, kwargs, inline_values)
+
+    # Inline objects are found after the objects they are defined in, so
+    # they are instantiated first in reverse order
+    objs = [None] * len(entries)
+    for idx in range(len(entries) - 1, -1, -1):
+        obj_cls, kwargs, inline_values = entries[idx]
+        for key, pos, child_idx, uid in inline_values:
+            # An object defined inline within itself is referred to by URI
+            # and resolved along with other references
+            val = objs[child_idx] if child_idx > idx else Unresolved(uid)
+            if pos is None:
+                kwargs[key] = val
+            else:
+                kwargs[key][pos] = val
+        objs[idx] = obj_cls(**kwargs)
+    return objs[0], objs[1:]
+
+
 class XReferrable:
     """A mixin class to add xrefs to a BioPaxObject.
 
@@ -187,11 +410,8 @@ class Entity(BioPaxObject, Observable, Named):
         super().__init__(**kwargs)
         self.availability = availability
         self.data_source = data_source if data_source else []
-        self._participant_of = set()
 
-    @property
-    def participant_of(self):
-        return self._participant_of
+    participant_of = ReverseLink('participant')
 
 
 class Gene(Entity):
@@ -208,13 +428,7 @@ class Gene(Entity):
 
 class Controller:
     """BioPAX Controller."""
-    def __init__(self, **kwargs):
-        super().__init__(**kwargs)
-        self._controller_of = set()
-
-    @property
-    def controller_of(self):
-        return self._controller_of
+    controller_of = ReverseLink('controller')
 
 
 class Pathway(Entity, Controller):
@@ -5,29 +5,14 @@ __all__ = ['Process', 'Interaction', 'GeneticInteraction',
            'ComplexAssembly', 'BiochemicalReaction',
            'Degradation', 'Transport', 'TransportWithBiochemicalReaction']
 
-from .base import Entity
+from .base import Entity, ReverseLink
 
 
 class Process(Entity):
     """BioPAX Process."""
-    def __init__(self,
-                 **kwargs):
-        super().__init__(**kwargs)
-        self._controlled_of = set()
-        self._step_process_of = set()
-        self._pathway_component_of = set()
-
-    @property
-    def controlled_of(self):
-        return self._controlled_of
-
-    @property
-    def step_process_of(self):
-        return self._step_process_of
-
-    @property
-    def pathway_component_of(self):
-        return self._pathway_component_of
+    controlled_of = ReverseLink('controlled')
+    step_process_of = ReverseLink('step_process')
+    pathway_component_of = ReverseLink('pathway_component')
 
 
 class Interaction(Process):
@@ -102,6 +87,18 @@ class Control(Interaction):
         self.controller = controller if controller else []
         self.controlled = controlled
 
+    def get_controlled_process(self):
+        """Return the process ultimately controlled by this control,
+        following chains of controls such as a Modulation of a Catalysis.
+        """
+        controlled = self.controlled
+        visited = {self.uid}
+        while isinstance(controlled, Control) and \
+                controlled.uid not in visited:
+            visited.add(controlled.uid)
+            controlled = controlled.controlled
+        return controlled
+
 
 class Conversion(Interaction):
     """BioPAX Conversion.
@@ -1,10 +1,14 @@
-__all__ = ['BioPaxModel', 'PYBIOPAX_TQDM_CONFIG']
+__all__ = ['BioPaxModel', 'PYBIOPAX_TQDM_CONFIG', 'PYBIOPAX_TQDM_BATCH_SIZE']
 
-from typing import Any, Mapping, Optional
-
-from tqdm.auto import tqdm
+from array import array
+from collections import defaultdict, deque
+from typing import (Any, Callable, FrozenSet, Iterable, List, Mapping,
+                    Optional, Set, Tuple, Union)
 
 from . import *
+from .base import (get_attribute_keys, get_reverse_link_keys,
+                   is_reverse_link, parse_element)
+from ..instrumentation import LoadInstrumentation, timed_phase
 from ..xml_util import get_id_or_about, get_tag, has_ns, wrap_xml_elements
 
 default_xml_base = 'http://www.biopax.org/release/biopax-level3.owl#'
@@ -14,6 +18,11 @@ PYBIOPAX_TQDM_CONFIG = {"unit_scale": True}
 the tqdm configuration, modify this module-level variable. For example,
 to disable the progress bars, set the ``disable`` key to ``True``."""
 
+PYBIOPAX_TQDM_BATCH_SIZE = 1000
+"""The number of elements processed between updates of the progress bar
+when loading or serializing a model. Setting it to 1 updates the progress
+bar for every element."""
+
 
 class BioPaxModel:
     """BioPAX Model.
@@ -26,6 +35,14 @@ class BioPaxModel:
         their URI strings
     xml_base : str
         The XML base namespace for the content being represented.
+    lazy_reverse_links : bool
+        If True, reverse links of objects (e.g., ``participant_of``) are
+        looked up in an index of the model built per reverse link on first
+        access, rather than stored in each object when the model is
+        created, which makes creating the model faster and its objects
+        smaller if reverse links are rarely used. Reverse links then only
+        include objects in the model and are returned as new sets, and the
+        index is rebuilt after :meth:`clear_indexes`. Default: False
 
     Attributes
     ----------
@@ -35,24 +52,66 @@ class BioPaxModel:
     xml_base : Optional[str]
         The XML base namespace for the content being represented. If not
         provided, the default BioPAX Level 3 base namespace is used.
+    uri_aliases : dict
+        A dict from the URIs of objects removed by :meth:`deduplicate` to
+        the URIs of the equivalent objects kept in their place.
+    lazy_reverse_links : bool
+        Whether reverse links are looked up in an index of the model.
     """
 
-    def __init__(self, objects, xml_base=default_xml_base):
+    def __init__(self, objects, xml_base=default_xml_base,
+                 lazy_reverse_links=False):
         if isinstance(objects, list):
             self.objects = {o.uid: o for o in objects}
         else:
             self.objects = objects
         self.xml_base = xml_base
+        self.uri_aliases = {}
+        self.lazy_reverse_links = lazy_reverse_links
+        # Lazily constructed indexes derived from the objects in the model
+        self._indexes = {}
         self.add_reverse_links()
 
+    def __reduce__(self):
+        # Models are pickled as a flat table of their objects in which
+        # references are replaced by the positions of the referenced objects
+        # in the table, leaving out reverse links, so that pickling doesn't
+        # recurse through the references and reverse links of objects. The
+        # reverse links are rebuilt when the model is unpickled.
+        return _model_from_pickle_state, (self.__class__,
+                                          _get_pickle_state(self))
+
+    def __copy__(self):
+        # A shallow copy shares the objects of the model, as without
+        # __reduce__
+        model = self.__class__.__new__(self.__class__)
+        model.__dict__.update(self.__dict__)
+        return model
+
     @classmethod
-    def from_xml(cls, tree) -> "BioPaxModel":
+    def from_xml(cls, tree,
+                 instrumentation: Optional[LoadInstrumentation] = None,
+                 resolver=None,
+                 lazy_reverse_links: bool = False) -> "BioPaxModel":
         """Return a BioPAX Model from an OWL/XML element tree.
 
         Parameters
         ----------
         tree :
             An element tree from which the model is extracted
+        instrumentation : Optional[LoadInstrumentation]
+            An instrumentation object notified of the time taken by each
+            phase of loading, the number of elements per class and the
+            references that couldn't be resolved, see
+            :mod:`pybiopax.instrumentation`.
+        resolver : Optional[pybiopax.resolver.ReferenceResolver]
+            A resolver for references to objects not defined in the tree,
+            see :mod:`pybiopax.resolver`. By default, such references are
+            kept as uid strings.
+        lazy_reverse_links :
+            If True, reverse links are looked up in an index of the model
+            on first access rather than added to the objects, see
+            :class:`BioPaxModel`. Default: False
 
         Returns
         -------
@@ -60,39 +119,68 @@ class BioPaxModel:
             A BioPAX Model deserialized from the OWL XML tree.
         """
         objects = {}
-        tqdm_kwargs = {'desc': 'Processing OWL elements'}
+        class_counts = defaultdict(int) if instrumentation is not None \
+            else None
+        tqdm_kwargs = {'desc': 'Processing OWL elements', 'total': len(tree)}
         tqdm_kwargs.update(PYBIOPAX_TQDM_CONFIG)
-        for element in tqdm(tree, **tqdm_kwargs):
-            if not has_ns(element, 'bp'):
-                continue
-            id = get_id_or_about(element)
-            obj_cls = globals()[get_tag(element)]
-            obj = obj_cls.from_xml(element)
-            objects[id] = obj
-            # We now register objects that were recursively
-            # extracted but have not been registered yet
-            sub_objs = get_sub_objects(obj)
-            for sub_obj in sub_objs:
-                if sub_obj.uid not in objects:
-                    objects[sub_obj.uid] = sub_obj
-
-        for obj_id, obj in objects.items():
-            for attr in [a for a in dir(obj) if not a.startswith('_')]:
-                # This is to avoid properties
-                if attr not in obj.__dict__:
+        batch_size = max(1, PYBIOPAX_TQDM_BATCH_SIZE)
+        with timed_phase(instrumentation, 'instantiate'), \
+                _get_progress_bar(**tqdm_kwargs) as progress:
+            for idx, element in enumerate(tree):
+                # The progress bar is only updated once per batch of
+                # elements to avoid its per-element overhead
+                if idx % batch_size == 0 and idx:
+                    progress.update(batch_size)
+                if not has_ns(element, 'bp'):
                     continue
-                val = getattr(obj, attr)
-                resolved_val = resolve_value(objects, val)
-                setattr(obj, attr, resolved_val)
+                id = get_id_or_about(element)
+                obj_cls = globals()[get_tag(element)]
+                # Inline definitions of objects that were already
+                # registered refer to the registered objects
+                obj, sub_objs = parse_element(element, objects, obj_cls)
+                objects[id] = obj
+                if class_counts is not None:
+                    class_counts[obj_cls.__name__] += 1
+                # We now register objects that were defined inline but
+                # have not been registered yet
+                for sub_obj in sub_objs:
+                    if sub_obj.uid not in objects:
+                        objects[sub_obj.uid] = sub_obj
+                        if class_counts is not None:
+                            class_counts[sub_obj.__class__.__name__] += 1
+            progress.update(progress.total - progress.n)
+        if instrumentation is not None:
+            instrumentation.elements_processed(dict(class_counts))
+
+        unresolved = [] if instrumentation is not None else None
+        with timed_phase(instrumentation, 'resolve_references'):
+            for obj in objects.values():
+                obj_dict = obj.__dict__
+                for _, key in get_attribute_keys(obj):
+                    val = obj_dict.get(key)
+                    if isinstance(val, (Unresolved, list)):
+                        obj_dict[key] = resolve_value(objects, val,
+                                                      unresolved, resolver)
+        if instrumentation is not None:
+            instrumentation.references_unresolved(unresolved)
 
-        return cls(objects, tree.base)
+        with timed_phase(instrumentation, 'add_reverse_links'):
+            return cls(objects, tree.base,
+                       lazy_reverse_links=lazy_reverse_links)
 
     def to_xml(self) -> str:
         """Return an OWL string from the content of the model."""
-        tqdm_kwargs = {'desc': 'Serializing OWL elements'}
+        tqdm_kwargs = {'desc': 'Serializing OWL elements',
+                       'total': len(self.objects)}
         tqdm_kwargs.update(PYBIOPAX_TQDM_CONFIG)
-        elements = [obj.to_xml() for obj in tqdm(self.objects.values(),
-                                                 **tqdm_kwargs)]
+        batch_size = max(1, PYBIOPAX_TQDM_BATCH_SIZE)
+        elements = []
+        with _get_progress_bar(**tqdm_kwargs) as progress:
+            for idx, obj in enumerate(self.objects.values()):
+                if idx % batch_size == 0 and idx:
+                    progress.update(batch_size)
+                elements.append(obj.to_xml())
+            progress.update(progress.total - progress.n)
         return wrap_xml_elements(elements, self.xml_base)
 
     def get_objects_by_type(self, obj_type):
@@ -100,51 +188,856 @@ class BioPaxModel:
             if isinstance(obj, obj_type):
                 yield obj
 
-    def add_reverse_links(self):
+    def get_attribute_index(self, attribute: str) \
+            -> Mapping[str, Set[BioPaxObject]]:
+        """Return an index of objects in the model by the value of an
+        attribute.
+
+        The index is built on first use and cached. If the model is
+        modified after an index is built, :meth:`clear_indexes` should be
+        called to make sure indexes are rebuilt.
+
+        Parameters
+        ----------
+        attribute :
+            The name of an attribute, e.g., ``db`` or ``display_name``.
+
+        Returns
+        -------
+        :
+            A dict whose keys are values of the given attribute (for
+            attributes whose value is another object, its uid) and whose
+            values are the sets of objects having that value. For list-valued
+            attributes, each object is indexed under each of its values.
+        """
+        key = ('attribute', attribute)
+        index = self._indexes.get(key)
+        if index is None:
+            index = defaultdict(set)
+            for obj in self.objects.values():
+                val = getattr(obj, attribute, None)
+                if val is None:
+                    continue
+                vals = val if isinstance(val, (list, set)) else [val]
+                for v in vals:
+                    if isinstance(v, BioPaxObject):
+                        v = v.uid
+                    elif v is None:
+                        continue
+                    index[str(v)].add(obj)
+            index = dict(index)
+            self._indexes[key] = index
+        return index
+
+    def get_reverse_links(self, obj: BioPaxObject, attribute: str) \
+            -> Set[BioPaxObject]:
+        """Return the objects in the model referring to an object via an
+        attribute, from an index of the model.
+
+        This is how the reverse links of objects (e.g., ``participant_of``)
+        are looked up in models with lazy reverse links. The index of the
+        references via an attribute is built on first use, in compressed
+        sparse row form over the positions of the objects in the model, and
+        cached.
+
+        Parameters
+        ----------
+        obj :
+            A BioPAX object.
+        attribute :
+            The name of the reverse link without the ``_of`` suffix, e.g.,
+            ``participant`` which includes references via ``left`` and
+            ``right``.
+
+        Returns
+        -------
+        :
+            A new set of the objects referring to the object.
+        """
+        positions = self._indexes.get('positions')
+        if positions is None:
+            positions = ({id(o): pos for pos, o
+                          in enumerate(self.objects.values())},
+                         list(self.objects.values()))
+            self._indexes['positions'] = positions
+        key = ('reverse_links', attribute)
+        index = self._indexes.get(key)
+        if index is None:
+            index = _build_reverse_link_index(attribute, *positions)
+            self._indexes[key] = index
+        pos = positions[0].get(id(obj))
+        if pos is None:
+            return set()
+        indptr, indices = index
+        objs = positions[1]
+        return {objs[idx] for idx in indices[indptr[pos]:indptr[pos + 1]]}
+
+    def get_index(self, name: str,
+                  build: Callable[['BioPaxModel'], Any]) -> Any:
+        """Return a cached index of the model, building it on first use.
+
+        This allows modules deriving other indexes from the objects of a
+        model, e.g., graphs, to cache them along with the indexes of the
+        model, so that they are rebuilt after :meth:`clear_indexes`.
+
+        Parameters
+        ----------
+        name :
+            The name of the index.
+        build :
+            A function taking the model and returning the index, called if
+            the index isn't cached.
+
+        Returns
+        -------
+        :
+            The index.
+        """
+        index = self._indexes.get(name)
+        if index is None:
+            index = build(self)
+            self._indexes[name] = index
+        return index
+
+    def clear_indexes(self):
+        """Remove all cached indexes derived from the objects in the model.
+
+        This needs to be called after objects in the model are added,
+        removed or modified.
+        """
+        self._indexes = {}
+
+    def leaf_entity_references(self, entity: BioPaxObject) \
+            -> FrozenSet[EntityReference]:
+        """Return the entity references an entity is ultimately made up of.
+
+        Complex components, generic physical entity members and generic
+        entity reference members are followed recursively, so for instance
+        the leaf entity references of a complex are the entity references
+        of all the proteins, small molecules, etc. in its (possibly nested)
+        subcomplexes. Results are memoized per uid in the model, so shared
+        subcomplexes are only resolved once, and cycles in components or
+        members are handled.
+
+        Parameters
+        ----------
+        entity :
+            A PhysicalEntity or EntityReference in the model.
+
+        Returns
+        -------
+        :
+            The set of leaf EntityReferences of the entity.
+        """
+        cache = self._indexes.setdefault('leaf_entity_references', {})
+        if entity.uid not in cache:
+            _resolve_leaf_entity_references([entity], cache)
+        return cache[entity.uid]
+
+    def get_leaf_entity_references(
+            self, entities: Optional[Iterable[BioPaxObject]] = None) \
+            -> Mapping[str, FrozenSet[EntityReference]]:
+        """Return the leaf entity references of many entities at once.
+
+        See :meth:`leaf_entity_references` for details. Resolving all the
+        physical entities of a model takes time linear in the size of the
+        model.
+
+        Parameters
+        ----------
+        entities :
+            PhysicalEntities and EntityReferences in the model. By default,
+            all PhysicalEntities in the model are resolved.
+
+        Returns
+        -------
+        :
+            A dict from the uids of the entities to their sets of leaf
+            EntityReferences.
+        """
+        if entities is None:
+            entities = self.get_objects_by_type(PhysicalEntity)
+        entities = list(entities)
+        cache = self._indexes.setdefault('leaf_entity_references', {})
+        _resolve_leaf_entity_references(
+            [entity for entity in entities if entity.uid not in cache],
+            cache)
+        return {entity.uid: cache[entity.uid] for entity in entities}
+
+    def normalized_xrefs(self, normalizer=None) \
+            -> Mapping[str, Tuple[str, str]]:
+        """Return the normalized prefixes and identifiers of all xrefs.
+
+        This is computed once per model and normalizer, and each distinct
+        database name is only normalized once.
+
+        Parameters
+        ----------
+        normalizer : Optional[pybiopax.references.XrefNormalizer]
+            The normalizer to use. By default, a shared normalizer is used,
+            see :func:`pybiopax.references.get_default_normalizer`.
+
+        Returns
+        -------
+        :
+            A dict from the uids of xrefs to their (prefix, identifier)
+            pairs. Database names that can't be normalized are kept as is.
+        """
+        from ..references import get_default_normalizer
+        if normalizer is None:
+            normalizer = get_default_normalizer()
+        key = ('normalized_xrefs', normalizer)
+        xrefs = self._indexes.get(key)
+        if xrefs is None:
+            xrefs = {}
+            for xref in self.get_objects_by_type(Xref):
+                prefix = normalizer.normalize_prefix(xref.db)
+                xrefs[xref.uid] = (prefix or xref.db, xref.id)
+            self._indexes[key] = xrefs
+        return xrefs
+
+    def submodel(self, uids: Iterable[Union[str, BioPaxObject]],
+                 closure: str = 'forward',
+                 depth: Optional[int] = None) -> "BioPaxModel":
+        """Return a model with a slice of the objects in this model.
+
+        The objects of the submodel are shallow copies of the objects in
+        this model, so modifying them doesn't affect this model. Their
+        reverse links (e.g., ``participant_of``) only refer to objects in
+        the submodel, and references to objects outside the submodel are
+        replaced by the uids of those objects, the same way unresolvable
+        references are represented when loading a model. The objects in the
+        slice are collected and linked in a single traversal, so the cost is
+        proportional to the size of the slice rather than this model.
+
+        Parameters
+        ----------
+        uids :
+            The uids of the objects (or the objects themselves) to start
+            the slice from.
+        closure :
+            If 'forward', objects referenced by the given objects are
+            included, recursively. If 'none', only the given objects are
+            included. Default: 'forward'
+        depth :
+            The maximum number of references to follow from the given
+            objects when the closure is 'forward'. By default, the whole
+            closure is included.
+
+        Returns
+        -------
+        :
+            A new BioPAX Model with copies of the objects in the slice.
+        """
+        if closure not in {'forward', 'none'}:
+            raise ValueError('Invalid closure %s' % closure)
+        if closure == 'none':
+            depth = 0
+        copies = {}
+        queue = deque()
+        for uid in uids:
+            obj = self.objects[uid if isinstance(uid, str) else uid.uid]
+            if obj.uid not in copies:
+                copies[obj.uid] = _copy_object(obj)
+                queue.append((obj, 0))
+        # Objects are copied as they are reached, then their references
+        # are pointed to the copies, or to uids outside the slice
+        while queue:
+            obj, dist = queue.popleft()
+            follow = depth is None or dist < depth
+            obj_copy = copies[obj.uid]
+            for attr, key in get_attribute_keys(obj):
+                val = obj.__dict__.get(key)
+                if isinstance(val, list):
+                    vals = []
+                    for v in val:
+                        v = _get_slice_value(v, copies, queue, dist, follow)
+                        vals.append(v)
+                        if isinstance(v, BioPaxObject):
+                            _add_reverse_link(obj_copy, attr, v)
+                    obj_copy.__dict__[key] = vals
+                elif isinstance(val, BioPaxObject):
+                    v = _get_slice_value(val, copies, queue, dist, follow)
+                    obj_copy.__dict__[key] = v
+                    if isinstance(v, BioPaxObject):
+                        _add_reverse_link(obj_copy, attr, v)
+        model = self.__class__.__new__(self.__class__)
+        model.objects = copies
+        model.xml_base = self.xml_base
+        model.uri_aliases = {}
+        model.lazy_reverse_links = False
+        model._indexes = {}
+        return model
+
+    def deduplicate(self, classes: Optional[Tuple[type, ...]] = None) \
+            -> Mapping[str, str]:
+        """Merge objects of the given classes that have the same content.
+
+        Content equivalence is determined by deep fingerprints (see
+        :mod:`pybiopax.fingerprint`), so e.g. two BioSources are equivalent
+        if their taxon xrefs have the same content even if these xrefs have
+        different URIs. Of each group of equivalent objects, the one with the
+        smallest URI is kept, all references to the others, as well as their
+        reverse links, are pointed to it, and the others are removed from the
+        model. The URIs of removed objects are recorded in
+        :attr:`uri_aliases`. Cached indexes are cleared.
+
+        Parameters
+        ----------
+        classes :
+            The classes of the objects to deduplicate, including their
+            subclasses. By default, Xref, ControlledVocabulary, BioSource
+            and Provenance objects are deduplicated.
+
+        Returns
+        -------
+        :
+            A dict from the URIs of the removed objects to the URIs of the
+            objects kept in their place.
+        """
+        from ..fingerprint import get_deep_fingerprints
+        if classes is None:
+            classes = (Xref, ControlledVocabulary, BioSource, Provenance)
+        fingerprints = get_deep_fingerprints(self)
+        canonical = {}
+        for uid, obj in self.objects.items():
+            if isinstance(obj, classes):
+                fingerprint = fingerprints[uid]
+                if fingerprint not in canonical or \
+                        uid < canonical[fingerprint]:
+                    canonical[fingerprint] = uid
+        aliases = {}
         for uid, obj in self.objects.items():
-            for attr in [a for a in dir(obj) if not a.startswith('_')
-                         and a not in {'list_types', 'xml_types',
-                                       'to_xml', 'from_xml', 'uid'}]:
-                val = getattr(obj, attr)
-                if isinstance(val, BioPaxObject) or \
-                        (isinstance(val, list) and
-                         all(isinstance(v, BioPaxObject) for v in val)):
-                    if attr in ['left', 'right']:
-                        of_attr = '_participant_of'
-                    else:
-                        of_attr = '_%s_of' % attr
-                    vals = val if isinstance(val, list) else [val]
-                    for v in vals:
-                        if of_attr in dir(v):
-                            of_attr_val = getattr(v, of_attr)
-                            of_attr_val.add(obj)
-
-
-def get_sub_objects(obj):
-    """Get all the children of an object that were extracted and
-    are BioPaxObjects that need to be registered in the model."""
+            if isinstance(obj, classes):
+                canonical_uid = canonical[fingerprints[uid]]
+                if canonical_uid != uid:
+                    aliases[uid] = canonical_uid
+        if not aliases:
+            return aliases
+
+        # The removed objects are unlinked from the objects they refer to
+        # and references to them are rewired in a single pass over the
+        # objects that are kept
+        removed = [self.objects.pop(uid) for uid in aliases]
+        for obj in removed:
+            for attr, key in get_attribute_keys(obj):
+                val = obj.__dict__.get(key)
+                for v in (val if isinstance(val, list) else [val]):
+                    if isinstance(v, BioPaxObject):
+                        _remove_reverse_link(obj, attr, v)
+        for obj in self.objects.values():
+            for attr, key in get_attribute_keys(obj):
+                val = obj.__dict__.get(key)
+                if isinstance(val, list):
+                    if not any(isinstance(v, BioPaxObject) and
+                               v.uid in aliases for v in val):
+                        continue
+                    vals = []
+                    for v in val:
+                        if isinstance(v, BioPaxObject) and v.uid in aliases:
+                            v = self.objects[aliases[v.uid]]
+                            _add_reverse_link(obj, attr, v)
+                        # References to several equivalent objects are
+                        # merged into one
+                        if v not in vals:
+                            vals.append(v)
+                    obj.__dict__[key] = vals
+                elif isinstance(val, BioPaxObject) and val.uid in aliases:
+                    v = self.objects[aliases[val.uid]]
+                    obj.__dict__[key] = v
+                    _add_reverse_link(obj, attr, v)
+
+        for alias, uid in self.uri_aliases.items():
+            self.uri_aliases[alias] = aliases.get(uid, uid)
+        self.uri_aliases.update(aliases)
+        self.clear_indexes()
+        return aliases
+
+    def to_csr(self, edge_types: Optional[Iterable[str]] = None):
+        """Return a CSR adjacency representation of the model.
+
+        This requires numpy to be installed, see
+        :func:`pybiopax.csr.model_to_csr` for details.
+
+        Parameters
+        ----------
+        edge_types :
+            The names of the attributes whose references should be included
+            as edges. By default, references via all attributes are included.
+
+        Returns
+        -------
+        pybiopax.csr.CsrGraph
+            The CSR adjacency of the model with dense integer ids for objects,
+            indptr/indices arrays and an edge type array.
+        """
+        from ..csr import model_to_csr
+        return model_to_csr(self, edge_types=edge_types)
+
+    def to_arrow(self):
+        """Return the contents of the model as Arrow tables.
+
+        This requires pyarrow to be installed, see
+        :func:`pybiopax.columnar.model_to_arrow` for details.
+
+        Returns
+        -------
+        pybiopax.columnar.ArrowTables
+            A table per BioPAX class with literal attributes and references
+            by uid as columns, and an edge table per reference attribute.
+        """
+        from ..columnar import model_to_arrow
+        return model_to_arrow(self)
+
+    def to_parquet(self, directory):
+        """Write the contents of the model to Parquet files.
+
+        This requires pyarrow to be installed, see :meth:`to_arrow` and
+        :meth:`pybiopax.columnar.ArrowTables.to_parquet` for details.
+
+        Parameters
+        ----------
+        directory : str or os.PathLike
+            The directory to write a file per class table and edge table to.
+        """
+        self.to_arrow().to_parquet(directory)
+
+    def to_json(self, objects=None, depth: int = 0, fp=None):
+        """Return the JSON-LD serialization of the model or of objects in it.
+
+        See :func:`pybiopax.jsonld.model_to_json` for details.
+
+        Parameters
+        ----------
+        objects : Optional[Iterable[Union[str, BioPaxObject]]]
+            The objects, or their uids, to serialize. By default, all objects
+            of the model are serialized.
+        depth :
+            The number of levels of referenced objects to embed in the node
+            of each object. Default: 0
+        fp : Optional[TextIO]
+            If given, the JSON is written to this text file object in chunks
+            rather than returned.
+
+        Returns
+        -------
+        Optional[str]
+            The JSON string, or None if it was written to a file.
+        """
+        from ..jsonld import model_to_json
+        return model_to_json(self, objects=objects, depth=depth, fp=fp)
+
+    def add_reverse_links(self):
+        """Add the reverse links of the references between the objects of
+        the model.
+
+        Reverse links are only added to objects of the model, so objects
+        outside the model that it refers to, e.g., ones resolved with a
+        :class:`pybiopax.resolver.ReferenceResolver`, aren't modified, the
+        same way as they aren't part of the index of the model with lazy
+        reverse links. With lazy reverse links, the objects are pointed to
+        the index of the model instead, which is rebuilt on first access.
+        """
+        if self.lazy_reverse_links:
+            for obj in self.objects.values():
+                obj_dict = obj.__dict__
+                for key in get_reverse_link_keys(obj.__class__):
+                    obj_dict[key] = None
+                obj_dict['_model'] = self
+            self.clear_indexes()
+            return
+        members = set()
+        for obj in self.objects.values():
+            obj.__dict__['_model'] = None
+            members.add(id(obj))
+        for obj in self.objects.values():
+            obj_dict = obj.__dict__
+            for attr, key in get_attribute_keys(obj):
+                val = obj_dict.get(key)
+                if isinstance(val, BioPaxObject):
+                    if id(val) in members:
+                        _add_reverse_link(obj, attr, val)
+                elif isinstance(val, list):
+                    for v in val:
+                        if isinstance(v, BioPaxObject) and id(v) in members:
+                            _add_reverse_link(obj, attr, v)
+
+
+def _get_constituents(entity):
+    """Return the entities an entity is directly made up of."""
+    if isinstance(entity, EntityReference):
+        return [member for member in entity.member_entity_reference
+                if isinstance(member, EntityReference)]
+    constituents = []
+    if isinstance(entity, SimplePhysicalEntity) and \
+            isinstance(entity.entity_reference, EntityReference):
+        constituents.append(entity.entity_reference)
+    if isinstance(entity, Complex):
+        constituents += [component for component in entity.component
+                         if isinstance(component, PhysicalEntity)]
+    if isinstance(entity, PhysicalEntity):
+        constituents += [member for member in entity.member_physical_entity
+                         if isinstance(member, PhysicalEntity)]
+    return constituents
+
+
+def _resolve_leaf_entity_references(entities, cache):
+    """Add the leaf entity references of entities and of all entities they
+    are made up of to the cache.
+
+    Components are completed in reverse topological order, so the leaves of
+    each component are the union of the leaves of the components it points
+    to. All entities in a cycle end up with the same leaves.
+    """
+    for component in _iter_components(entities, _get_constituents, cache):
+        uids = {member.uid for member in component}
+        leaves = set()
+        for member in component:
+            constituents = _get_constituents(member)
+            if isinstance(member, EntityReference) and not constituents:
+                leaves.add(member)
+            for child in constituents:
+                if child.uid not in uids:
+                    leaves |= cache[child.uid]
+        leaves = frozenset(leaves)
+        for member in component:
+            cache[member.uid] = leaves
+
+
+def _iter_components(roots, get_successors, done):
+    """Generate the strongly connected components of the objects reachable
+    from the roots, in reverse topological order.
+
+    This is an iterative version of Tarjan's algorithm so that deeply
+    nested objects don't hit the recursion limit. Objects whose uid is in
+    done are skipped, and the caller is expected to add the uids of the
+    objects of each component to done before the next one is generated, so
+    each component can be processed using the results of the components it
+    points to.
+
+    Parameters
+    ----------
+    roots :
+        The objects to start from.
+    get_successors :
+        A function returning the objects an object points to.
+    done :
+        A container of uids of objects that were already processed.
+
+    Returns
+    -------
+    :
+        An iterator over lists of objects forming strongly connected
+        components.
+    """
+    index = {}
+    lowlink = {}
+    stack = []
+    on_stack = set()
+    for root in roots:
+        if root.uid in done or root.uid in index:
+            continue
+        work = [(root, iter(get_successors(root)))]
+        index[root.uid] = lowlink[root.uid] = len(index)
+        stack.append(root)
+        on_stack.add(root.uid)
+        while work:
+            obj, children = work[-1]
+            for child in children:
+                if child.uid in done:
+                    continue
+                if child.uid not in index:
+                    index[child.uid] = lowlink[child.uid] = len(index)
+                    stack.append(child)
+                    on_stack.add(child.uid)
+                    work.append((child, iter(get_successors(child))))
+                    break
+                elif child.uid in on_stack:
+                    lowlink[obj.uid] = min(lowlink[obj.uid],
+                                           index[child.uid])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent.uid] = min(lowlink[parent.uid],
+                                              lowlink[obj.uid])
+                if lowlink[obj.uid] != index[obj.uid]:
+                    continue
+                component = []
+                while True:
+                    member = stack.pop()
+                    on_stack.discard(member.uid)
+                    component.append(member)
+                    if member is obj:
+                        break
+                yield component
+
+
+def _get_pickle_state(model):
+    """Return the state of a model as a flat table of its objects."""
+    # The objects in the table, starting with those in the model followed
+    # by objects outside the model they refer to, and their positions
+    table_objs = list(model.objects.values())
+    positions = {id(obj): idx for idx, obj in enumerate(table_objs)}
+    # Per class, its position in the class table and the keys of the
+    # __dict__ of its objects
+    classes = {}
+    class_table = []
+    table = []
+    idx = 0
+    while idx < len(table_objs):
+        obj = table_objs[idx]
+        idx += 1
+        # Lazy proxies are pickled as the objects they load
+        if '_lazy_loader' in obj.__dict__:
+            obj._load()
+        obj_dict = obj.__dict__
+        cls = obj.__class__
+        entry = classes.get(cls)
+        if entry is None:
+            entry = (len(class_table), tuple(obj_dict))
+            classes[cls] = entry
+            class_table.append((cls, entry[1]))
+        cls_idx, keys = entry
+        # Objects whose __dict__ has other keys than that of the first
+        # object of their class are stored with their own keys
+        obj_keys = tuple(obj_dict)
+        if obj_keys == keys:
+            obj_keys = keys
+        values = []
+        ref_positions = []
+        for pos, key in enumerate(obj_keys):
+            val = obj_dict[key]
+            # Reverse links are rebuilt when unpickling
+            if is_reverse_link(key, val):
+                val = None
+            elif isinstance(val, BioPaxObject):
+                val = _get_table_position(val, positions, table_objs)
+                ref_positions.append(pos)
+            elif isinstance(val, list) and \
+                    any(isinstance(v, BioPaxObject) for v in val):
+                val = [_get_table_position(v, positions, table_objs)
+                       if isinstance(v, BioPaxObject)
+                       else (v if v is None or isinstance(v, str)
+                             else _PickledLiteral(v))
+                       for v in val]
+                ref_positions.append(pos)
+            values.append(val)
+        if obj_keys is keys:
+            table.append((cls_idx, values, tuple(ref_positions)))
+        else:
+            table.append((cls_idx, values, tuple(ref_positions), obj_keys))
+    model_dict = {key: val for key, val in model.__dict__.items()
+                  if key not in {'objects', '_indexes'}}
+    return model_dict, list(model.objects), class_table, table
+
+
+def _get_table_position(obj, positions, table_objs):
+    """Return the position of an object in the pickle table, adding it to
+    the table if it isn't in it yet."""
+    pos = positions.get(id(obj))
+    if pos is None:
+        pos = len(table_objs)
+        positions[id(obj)] = pos
+        table_objs.append(obj)
+    return pos
+
+
+def _model_from_pickle_state(model_cls, state):
+    """Return a model from its state as a flat table of its objects."""
+    model_dict, uids, class_table, table = state
+    objs = [class_table[entry[0]][0].__new__(class_table[entry[0]][0])
+            for entry in table]
+    for obj, entry in zip(objs, table):
+        keys = class_table[entry[0]][1]
+        values = entry[1]
+        if len(entry) == 4:
+            keys = entry[3]
+        for pos in entry[2]:
+            val = values[pos]
+            if isinstance(val, list):
+                values[pos] = [objs[v] if isinstance(v, int)
+                               else (v.value if isinstance(v, _PickledLiteral)
+                                     else v)
+                               for v in val]
+            else:
+                values[pos] = objs[val]
+        obj.__dict__ = dict(zip(keys, values))
+    model = model_cls.__new__(model_cls)
+    model.__dict__.update(model_dict)
+    model.objects = dict(zip(uids, objs))
+    model._indexes = {}
+    model.add_reverse_links()
+    return model
+
+
+class _PickledLiteral:
+    """A literal value in a list of references in the pickle table of a
+    model, which would otherwise be mistaken for a reference if it is an
+    int."""
+    def __init__(self, value):
+        self.value = value
+
+
+def _copy_object(obj):
+    """Return a shallow copy of an object with no reverse links."""
+    obj_copy = obj.__class__.__new__(obj.__class__)
+    obj_copy.__dict__ = {key: (None if is_reverse_link(key, val) else val)
+                         for key, val in obj.__dict__.items()}
+    return obj_copy
+
+
+def _get_slice_value(val, copies, queue, dist, follow):
+    """Return the value to refer to an object with in a slice."""
+    if not isinstance(val, BioPaxObject):
+        return val
+    val_copy = copies.get(val.uid)
+    if val_copy is None:
+        if not follow:
+            return val.uid
+        val_copy = _copy_object(val)
+        copies[val.uid] = val_copy
+        queue.append((val, dist + 1))
+    return val_copy
+
+
+# The reverse links of attributes whose reverse link is named differently
+_reverse_link_attributes = {'left': 'participant', 'right': 'participant'}
+
+
+def _build_reverse_link_index(attribute, positions, objs):
+    """Return the index of the references via the attributes of a reverse
+    link as (indptr, indices) arrays, with the positions of the objects
+    referring to the object at position i in indices[indptr[i]:indptr[i +
+    1]]."""
+    attrs = [attr for attr, link in _reverse_link_attributes.items()
+             if link == attribute] + [attribute]
+    sources = array('q')
+    targets = array('q')
+    for source, obj in enumerate(objs):
+        obj_dict = obj.__dict__
+        for attr in attrs:
+            val = obj_dict.get(attr)
+            if val is None:
+                continue
+            for v in (val if isinstance(val, list) else [val]):
+                if isinstance(v, BioPaxObject):
+                    target = positions.get(id(v))
+                    if target is not None:
+                        sources.append(source)
+                        targets.append(target)
+    indptr = array('q', [0]) * (len(objs) + 1)
+    for target in targets:
+        indptr[target + 1] += 1
+    for idx in range(len(objs)):
+        indptr[idx + 1] += indptr[idx]
+    indices = array('q', [0]) * len(sources)
+    cursors = indptr[:-1]
+    for source, target in zip(sources, targets):
+        indices[cursors[target]] = source
+        cursors[target] += 1
+    return indptr, indices
+
+
+def _add_reverse_link(obj, attr, target):
+    """Add the reverse link of a reference via an attribute, if the target
+    has one and doesn't look up its reverse links in a model index."""
+    key = '_%s_of' % _reverse_link_attributes.get(attr, attr)
+    target_dict = target.__dict__
+    links = target_dict.get(key)
+    if links is None:
+        if target_dict.get('_model') is not None or \
+                key not in get_reverse_link_keys(target.__class__):
+            return
+        links = set()
+        target_dict[key] = links
+    links.add(obj)
+
+
+def _remove_reverse_link(obj, attr, target):
+    """Remove the reverse link of a reference via an attribute, if the
+    target has one."""
+    key = '_%s_of' % _reverse_link_attributes.get(attr, attr)
+    links = target.__dict__.get(key)
+    if links is not None:
+        links.discard(obj)
+
+
+def _get_progress_bar(**kwargs):
+    """Return a tqdm progress bar, or a stand-in doing nothing if progress
+    bars are disabled, in which case tqdm isn't imported at all."""
+    if kwargs.get('disable'):
+        return _NullProgressBar(kwargs.get('total'))
+    from tqdm.auto import tqdm
+    return tqdm(**kwargs)
+
+
+class _NullProgressBar:
+    """A stand-in for a disabled tqdm progress bar."""
+    def __init__(self, total=None):
+        self.total = total
+        self.n = 0
+
+    def update(self, n=1):
+        self.n += n
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+
+def get_sub_objects(obj: BioPaxObject) -> List[BioPaxObject]:
+    """Return the objects an object refers to, directly or indirectly.
+
+    The references are followed iteratively, so deeply nested objects don't
+    hit the recursion limit, and each object is returned once. Reverse links
+    aren't followed. Models loaded from OWL register inline objects
+    while parsing them, see :func:`pybiopax.biopax.base.parse_element`, but
+    this can be used to collect the objects to build a model from.
+
+    Parameters
+    ----------
+    obj :
+        A BioPAX object.
+
+    Returns
+    -------
+    :
+        The objects referred to by the object, in the order they are
+        reached.
+    """
     sub_objs = []
-    for attr in [a for a in dir(obj) if not a.startswith('__')]:
-        val = getattr(obj, attr)
-        if isinstance(val, BioPaxObject):
-            sub_objs.append(val)
-            sub_objs += get_sub_objects(val)
-        elif isinstance(val, list):
-            for elem in val:
-                if isinstance(elem, BioPaxObject):
-                    sub_objs.append(elem)
-                    sub_objs += get_sub_objects(elem)
+    seen = {id(obj)}
+    stack = [obj]
+    while stack:
+        for key, val in stack.pop().__dict__.items():
+            # Reverse links refer to objects referring to this one
+            if isinstance(val, set) and key.endswith('_of'):
+                continue
+            for v in (val if isinstance(val, list) else [val]):
+                if isinstance(v, BioPaxObject) and id(v) not in seen:
+                    seen.add(id(v))
+                    sub_objs.append(v)
+                    stack.append(v)
     return sub_objs
 
 
-def resolve_value(objects, val):
+def resolve_value(objects, val, unresolved=None, resolver=None):
     if isinstance(val, Unresolved):
-        if val.obj_id not in objects:
-            resolved_val = val.obj_id
-        else:
+        if val.obj_id in objects:
             resolved_val = objects[val.obj_id]
+        else:
+            resolved_val = resolver.resolve(val.obj_id) \
+                if resolver is not None else None
+            if resolved_val is None:
+                resolved_val = val.obj_id
+                if unresolved is not None:
+                    unresolved.append(val.obj_id)
     elif isinstance(val, list):
-        resolved_val = [resolve_value(objects, v) for v in val]
+        resolved_val = [resolve_value(objects, v, unresolved, resolver)
+                        for v in val]
     else:
         resolved_val = val
     return resolved_val
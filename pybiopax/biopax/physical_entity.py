@@ -4,7 +4,7 @@ __all__ = ['PhysicalEntity', 'SimplePhysicalEntity', 'Protein',
 
 from typing import List, Optional
 
-from .base import Entity, Controller
+from .base import Entity, Controller, ReverseLink
 from .util import EntityFeature, EntityReference
 
 
@@ -33,16 +33,9 @@ class PhysicalEntity(Entity, Controller):
         self.member_physical_entity = member_physical_entity if \
             member_physical_entity else []
         self.cellular_location = cellular_location
-        self._component_of = set()
-        self._member_physical_entity_of = set()
 
-    @property
-    def component_of(self):
-        return self._component_of
-
-    @property
-    def member_physical_entity_of(self):
-        return self._member_physical_entity_of
+    component_of = ReverseLink('component')
+    member_physical_entity_of = ReverseLink('member_physical_entity')
 
     def __str__(self):
         name = self.display_name if self.display_name else self.standard_name
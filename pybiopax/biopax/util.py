@@ -17,7 +17,7 @@ __all__ = ['BindingFeature', 'BioSource', 'BiochemicalPathwayStep',
 
 from typing import List, Optional
 
-from .base import BioPaxObject, Named, Observable, XReferrable
+from .base import BioPaxObject, Named, Observable, ReverseLink, XReferrable
 
 
 class UtilityClass(BioPaxObject):
@@ -50,7 +50,7 @@ class Evidence(UtilityClass, XReferrable):
 
 class Provenance(UtilityClass, Named):
     """BioPAX Provenance."""
-    list_types = Named.list_types
+    list_types = UtilityClass.list_types + Named.list_types
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
@@ -79,26 +79,11 @@ class EntityFeature(UtilityClass, Observable):
         self.feature_location = feature_location
         self.member_feature = member_feature
         self.feature_location_type = feature_location_type
-        self._feature_of = set()
-        self._not_feature_of = set()
-        self._entity_feature_of = set()
-        self._member_feature_of = set()
 
-    @property
-    def feature_of(self):
-        return self._feature_of
-
-    @property
-    def not_feature_of(self):
-        return self._not_feature_of
-
-    @property
-    def entity_feature_of(self):
-        return self._entity_feature_of
-
-    @property
-    def member_feature_of(self):
-        return self._member_feature_of
+    feature_of = ReverseLink('feature')
+    not_feature_of = ReverseLink('not_feature')
+    entity_feature_of = ReverseLink('entity_feature')
+    member_feature_of = ReverseLink('member_feature')
 
 
 class ModificationFeature(EntityFeature):
@@ -233,7 +218,7 @@ class BioSource(UtilityClass, Named):
     cell_type : CellVocabulary
     tissue : TissueVocabulary
     """
-    list_types = Named.list_types
+    list_types = UtilityClass.list_types + Named.list_types
 
     def __init__(self,
                  cell_type=None,
@@ -348,16 +333,9 @@ class PathwayStep(UtilityClass, Observable):
         super().__init__(**kwargs)
         self.step_process = step_process  if step_process else []
         self.next_step = next_step  if next_step else []
-        self._next_step_of = set()
-        self._pathway_order_of = set()
 
-    @property
-    def next_step_of(self):
-        return self._next_step_of
-
-    @property
-    def pathway_order_of(self):
-        return self._pathway_order_of
+    next_step_of = ReverseLink('next_step')
+    pathway_order_of = ReverseLink('pathway_order')
 
 
 class BiochemicalPathwayStep(PathwayStep):
@@ -398,11 +376,8 @@ class Xref(UtilityClass):
         self.db_version = db_version
         self.id_version = id_version
         self.id = id
-        self._xref_of = set()
 
-    @property
-    def xref_of(self):
-        return self._xref_of
+    xref_of = ReverseLink('xref')
 
 
 class PublicationXref(Xref):
@@ -461,7 +436,7 @@ class Score(UtilityClass, XReferrable):
     score_source : Provenance
     value : str
     """
-    list_types = XReferrable.list_types
+    list_types = UtilityClass.list_types + XReferrable.list_types
 
     def __init__(self,
                  score_source=None,
@@ -499,16 +474,9 @@ class EntityReference(UtilityClass, Named, Observable):
             member_entity_reference else []
         self.owner_entity_reference = owner_entity_reference if \
             owner_entity_reference else []
-        self._entity_reference_of = set()
-        self._member_entity_reference_of = set()
-
-    @property
-    def entity_reference_of(self):
-        return self._entity_reference_of
 
-    @property
-    def member_entity_reference_of(self):
-        return self._member_entity_reference_of
+    entity_reference_of = ReverseLink('entity_reference')
+    member_entity_reference_of = ReverseLink('member_entity_reference')
 
 
 class SequenceEntityReference(EntityReference):
@@ -561,11 +529,8 @@ class NucleicAcidRegionReference(NucleicAcidReference):
         super().__init__(**kwargs)
         self.absolute_region = absolute_region
         self.region_type = region_type if region_type else []
-        self._sub_region_of = set()
 
-    @property
-    def sub_region_of(self):
-        return self._sub_region_of
+    sub_region_of = ReverseLink('sub_region')
 
 
 class RnaReference(NucleicAcidReference):
@@ -0,0 +1,148 @@
+"""This module implements exporting the contents of a BioPaxModel into
+columnar Apache Arrow tables, which can be written to Parquet files and
+queried with tools such as pandas or DuckDB.
+
+There is one table per BioPAX class, with a ``uid`` column and one column
+per attribute of the class. Literal attributes are string columns,
+references to other objects are columns of the uids of the referenced
+objects, and list-valued attributes are list columns. In addition, there
+is one edge table per attribute referring to other objects, with
+``source`` and ``target`` uid columns, so that, e.g., the participants of
+all conversions can be joined without unnesting list columns.
+"""
+__all__ = ['ArrowTables', 'model_to_arrow']
+
+import logging
+import os
+import pathlib
+from typing import Mapping, Union
+
+import pyarrow as pa
+
+from .biopax import BioPaxModel, BioPaxObject
+from .biopax.base import get_attribute_keys
+
+logger = logging.getLogger(__name__)
+
+
+class ArrowTables:
+    """The contents of a BioPaxModel as Arrow tables.
+
+    Parameters
+    ----------
+    classes :
+        A dict from BioPAX class names to the tables of the objects of that
+        exact class.
+    edges :
+        A dict from attribute names to the tables of the references via
+        that attribute.
+    """
+    def __init__(self, classes: Mapping[str, pa.Table],
+                 edges: Mapping[str, pa.Table]):
+        self.classes = classes
+        self.edges = edges
+
+    def to_parquet(self, directory: Union[str, pathlib.Path, os.PathLike]):
+        """Write the tables to Parquet files in a directory.
+
+        Class tables are written to ``<class name>.parquet`` and edge tables
+        to ``edges/<attribute>.parquet``.
+
+        Parameters
+        ----------
+        directory :
+            The directory to write to, created if it doesn't exist.
+        """
+        import pyarrow.parquet as pq
+        edges_dir = os.path.join(directory, 'edges')
+        os.makedirs(edges_dir, exist_ok=True)
+        for name, table in self.classes.items():
+            pq.write_table(table, os.path.join(directory,
+                                               '%s.parquet' % name))
+        for name, table in self.edges.items():
+            pq.write_table(table, os.path.join(edges_dir,
+                                               '%s.parquet' % name))
+
+
+def model_to_arrow(model: BioPaxModel) -> ArrowTables:
+    """Return the contents of a model as Arrow tables.
+
+    Columns are filled in a single pass over the objects of the model. Non-
+    string literal values are converted to strings, and references that
+    couldn't be resolved, which are kept as uid strings, are exported as
+    such in class tables but not in edge tables.
+
+    Parameters
+    ----------
+    model :
+        A BioPAX Model.
+
+    Returns
+    -------
+    :
+        The class and edge tables.
+    """
+    # Per class, the attribute keys and a column per attribute, and per
+    # attribute the source and target columns of edges
+    class_columns = {}
+    edge_columns = {}
+    for obj in model.objects.values():
+        cls = obj.__class__
+        entry = class_columns.get(cls)
+        if entry is None:
+            keys = get_attribute_keys(obj)
+            entry = (keys, [[] for _ in range(len(keys) + 1)])
+            class_columns[cls] = entry
+        keys, columns = entry
+        columns[0].append(obj.uid)
+        for (attr, key), column in zip(keys, columns[1:]):
+            val = obj.__dict__.get(key)
+            if isinstance(val, list):
+                if not val:
+                    column.append(val)
+                    continue
+                vals = []
+                for v in val:
+                    if isinstance(v, BioPaxObject):
+                        _add_edge(edge_columns, attr, obj.uid, v.uid)
+                        vals.append(v.uid)
+                    elif v is not None:
+                        vals.append(v if isinstance(v, str) else str(v))
+                column.append(vals)
+            elif isinstance(val, BioPaxObject):
+                _add_edge(edge_columns, attr, obj.uid, val.uid)
+                column.append(val.uid)
+            else:
+                column.append(val if val is None or isinstance(val, str)
+                              else str(val))
+
+    classes = {}
+    for cls, (keys, columns) in class_columns.items():
+        arrays = [pa.array(columns[0], type=pa.string())]
+        for (attr, _), column in zip(keys, columns[1:]):
+            list_valued = attr in cls.list_types or \
+                any(isinstance(v, list) for v in column)
+            if list_valued:
+                column = [v if isinstance(v, list) or v is None else [v]
+                          for v in column]
+            arrays.append(pa.array(column, type=pa.list_(pa.string())
+                                   if list_valued else pa.string()))
+        classes[cls.__name__] = pa.Table.from_arrays(
+            arrays, names=['uid'] + [attr for attr, _ in keys])
+    edges = {attr: pa.Table.from_arrays(
+                 [pa.array(sources, type=pa.string()),
+                  pa.array(targets, type=pa.string())],
+                 names=['source', 'target'])
+             for attr, (sources, targets) in sorted(edge_columns.items())}
+    logger.info('Exported %d objects into %d class tables and %d edge tables'
+                % (len(model.objects), len(classes), len(edges)))
+    return ArrowTables(dict(sorted(classes.items())), edges)
+
+
+def _add_edge(edge_columns, attr, source, target):
+    columns = edge_columns.get(attr)
+    if columns is None:
+        columns = ([], [])
+        edge_columns[attr] = columns
+    columns[0].append(source)
+    columns[1].append(target)
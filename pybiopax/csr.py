@@ -0,0 +1,169 @@
+"""This module implements exporting the graph of references between objects
+in a BioPaxModel into a compressed sparse row (CSR) adjacency structure
+that graph algorithms can be run on efficiently."""
+__all__ = ['CsrGraph', 'model_to_csr']
+
+from typing import Iterable, List, Optional
+
+import numpy as np
+
+from .biopax import BioPaxModel, BioPaxObject
+from .biopax.base import get_attribute_keys
+
+
+class CsrGraph:
+    """A CSR adjacency representation of the objects in a BioPaxModel.
+
+    Objects are assigned dense integer ids and each edge corresponds to a
+    forward reference from one object to another via an attribute.
+
+    Parameters
+    ----------
+    uids :
+        The uids of the objects in the order of their integer ids.
+    indptr :
+        An array of length ``len(uids) + 1`` such that the targets of edges
+        starting from object i are ``indices[indptr[i]:indptr[i + 1]]``.
+    indices :
+        An array of the integer ids of edge targets.
+    edge_types :
+        An array parallel to ``indices`` with the index of each edge's
+        attribute in ``edge_type_names``.
+    edge_type_names :
+        The names of the attributes that edges correspond to.
+
+    Attributes
+    ----------
+    index : dict
+        A dict mapping uids to integer ids.
+    """
+    def __init__(self, uids: List[str], indptr: np.ndarray,
+                 indices: np.ndarray, edge_types: np.ndarray,
+                 edge_type_names: List[str]):
+        self.uids = uids
+        self.indptr = indptr
+        self.indices = indices
+        self.edge_types = edge_types
+        self.edge_type_names = edge_type_names
+        self.index = {uid: idx for idx, uid in enumerate(uids)}
+
+    @property
+    def num_nodes(self) -> int:
+        """The number of objects in the graph."""
+        return len(self.uids)
+
+    @property
+    def num_edges(self) -> int:
+        """The number of edges in the graph."""
+        return len(self.indices)
+
+    def to_scipy(self, edge_type: Optional[str] = None):
+        """Return the graph as a scipy.sparse CSR adjacency matrix.
+
+        Parameters
+        ----------
+        edge_type :
+            If given, only edges of this type are included. If the graph
+            has no edges of this type, the matrix is empty.
+
+        Returns
+        -------
+        scipy.sparse.csr_matrix
+            A square matrix whose entry (i, j) is the number of edges from
+            object i to object j.
+        """
+        from scipy.sparse import csr_matrix
+        shape = (self.num_nodes, self.num_nodes)
+        if edge_type is None:
+            data = np.ones(self.num_edges, dtype=np.int32)
+            return csr_matrix((data, self.indices, self.indptr), shape=shape)
+        if edge_type not in self.edge_type_names:
+            return csr_matrix(shape, dtype=np.int32)
+        # Rows of the CSR structure are consecutive, so we can expand them
+        # and filter edges by their type
+        rows = np.repeat(np.arange(self.num_nodes), np.diff(self.indptr))
+        mask = self.edge_types == self.edge_type_names.index(edge_type)
+        data = np.ones(int(mask.sum()), dtype=np.int32)
+        return csr_matrix((data, (rows[mask], self.indices[mask])),
+                          shape=shape)
+
+    def to_networkx(self):
+        """Return the graph as a networkx MultiDiGraph.
+
+        Returns
+        -------
+        networkx.MultiDiGraph
+            A graph whose nodes are object uids and whose edges have a
+            ``type`` attribute with the name of the attribute they
+            correspond to.
+        """
+        import networkx as nx
+        graph = nx.MultiDiGraph()
+        graph.add_nodes_from(self.uids)
+        rows = np.repeat(np.arange(self.num_nodes), np.diff(self.indptr))
+        graph.add_edges_from(
+            (self.uids[source], self.uids[target],
+             {'type': self.edge_type_names[edge_type]})
+            for source, target, edge_type
+            in zip(rows.tolist(), self.indices.tolist(),
+                   self.edge_types.tolist())
+        )
+        return graph
+
+
+def model_to_csr(model: BioPaxModel,
+                 edge_types: Optional[Iterable[str]] = None) -> CsrGraph:
+    """Return a CSR adjacency representation of a BioPaxModel.
+
+    The adjacency is built in a single pass over the objects in the model.
+    References to objects that are not part of the model are not included.
+
+    Parameters
+    ----------
+    model :
+        A BioPAX Model.
+    edge_types :
+        The names of the attributes whose references should be included as
+        edges, e.g., ``['left', 'right', 'controller', 'controlled']``. By
+        default, references via all attributes are included.
+
+    Returns
+    -------
+    :
+        The CSR adjacency of the model.
+    """
+    edge_types = set(edge_types) if edge_types is not None else None
+    uids = list(model.objects)
+    index = {uid: idx for idx, uid in enumerate(uids)}
+    edge_type_ids = {}
+    indptr = [0]
+    indices = []
+    types = []
+    for obj in model.objects.values():
+        obj_dict = obj.__dict__
+        for attr, key in get_attribute_keys(obj):
+            if edge_types is not None and attr not in edge_types:
+                continue
+            val = obj_dict.get(key)
+            if isinstance(val, list):
+                targets = [v for v in val if isinstance(v, BioPaxObject)]
+            elif isinstance(val, BioPaxObject):
+                targets = [val]
+            else:
+                continue
+            for target in targets:
+                target_idx = index.get(target.uid)
+                if target_idx is None:
+                    continue
+                type_id = edge_type_ids.get(attr)
+                if type_id is None:
+                    type_id = edge_type_ids[attr] = len(edge_type_ids)
+                indices.append(target_idx)
+                types.append(type_id)
+        indptr.append(len(indices))
+    edge_type_names = sorted(edge_type_ids, key=edge_type_ids.get)
+    return CsrGraph(uids,
+                    np.array(indptr, dtype=np.int64),
+                    np.array(indices, dtype=np.int64),
+                    np.array(types, dtype=np.int32),
+                    edge_type_names)
@@ -0,0 +1,204 @@
+"""This module implements a structural diff between two BioPAX models, e.g.,
+two releases of the same pathway database.
+
+Objects are matched by uid. Optionally, objects only present in one of the
+models can be matched by content, for sources which don't keep uids stable
+across releases. Objects present in both models are compared by their
+content fingerprints (see :mod:`pybiopax.fingerprint`) and only those whose
+fingerprints differ are compared attribute by attribute, so the diff takes
+time linear in the size of the models rather than quadratic.
+"""
+__all__ = ['ModelDiff', 'diff_models']
+
+import logging
+from collections import defaultdict, deque
+from typing import Any, List, Mapping
+
+from .biopax import BioPaxModel, BioPaxObject
+from .biopax.base import get_attribute_keys
+from .fingerprint import get_deep_fingerprints, get_fingerprints
+
+logger = logging.getLogger(__name__)
+
+
+class ModelDiff:
+    """The differences between an old and a new BioPAX model.
+
+    References to other objects are represented by uid throughout so that
+    diffs can be serialized, see :meth:`to_dict`.
+
+    Attributes
+    ----------
+    added : list of str
+        The uids of objects only in the new model.
+    removed : list of str
+        The uids of objects only in the old model.
+    modified : dict
+        A dict keyed by the uids of objects whose content changed. Values
+        are dicts keyed by the names of the changed attributes. For
+        single-valued attributes, the changes are dicts with the ``old`` and
+        ``new`` values, for list-valued attributes, they are dicts with the
+        ``added`` and ``removed`` values. Objects whose class changed are
+        reported here too, with an additional ``class`` entry with the
+        ``old`` and ``new`` class names, and the changes of the attributes
+        of both classes.
+    matched : dict
+        A dict from the uids of objects in the old model to the uids of
+        objects with the same content in the new model, for objects matched
+        by content rather than uid. Matched objects are in neither
+        ``added`` nor ``removed``.
+    """
+    def __init__(self, added: List[str], removed: List[str],
+                 modified: Mapping[str, Mapping[str, Mapping[str, Any]]],
+                 matched: Mapping[str, str]):
+        self.added = added
+        self.removed = removed
+        self.modified = modified
+        self.matched = matched
+
+    @property
+    def changed_uids(self) -> List[str]:
+        """The uids of all added, removed and modified objects, e.g., to
+        invalidate cache entries derived from them."""
+        return sorted(set(self.added) | set(self.removed) |
+                      set(self.modified))
+
+    def is_empty(self) -> bool:
+        """Return True if the models have the same content."""
+        return not (self.added or self.removed or self.modified)
+
+    def to_dict(self) -> Mapping[str, Any]:
+        """Return the diff as a JSON-serializable dict.
+
+        Returns
+        -------
+        :
+            A dict with the attributes of the diff.
+        """
+        return {'added': self.added, 'removed': self.removed,
+                'modified': self.modified, 'matched': self.matched}
+
+    @classmethod
+    def from_dict(cls, diff_dict: Mapping[str, Any]) -> 'ModelDiff':
+        """Return a diff from its dict representation.
+
+        Parameters
+        ----------
+        diff_dict :
+            A dict as returned by :meth:`to_dict`.
+
+        Returns
+        -------
+        :
+            The diff.
+        """
+        return cls(added=list(diff_dict['added']),
+                   removed=list(diff_dict['removed']),
+                   modified=dict(diff_dict['modified']),
+                   matched=dict(diff_dict.get('matched', {})))
+
+    def __str__(self):
+        return '%d added, %d removed, %d modified, %d matched by content' % \
+            (len(self.added), len(self.removed), len(self.modified),
+             len(self.matched))
+
+
+def diff_models(old: BioPaxModel, new: BioPaxModel,
+                match_by_content: bool = False) -> ModelDiff:
+    """Return the differences between two BioPAX models.
+
+    Parameters
+    ----------
+    old :
+        The old BioPAX Model.
+    new :
+        The new BioPAX Model.
+    match_by_content :
+        If True, objects whose uid is only in one of the models are matched
+        with objects of the same content in the other model, using their
+        deep fingerprints. Objects with the same content are matched in uid
+        order. References to matched objects are considered unchanged.
+        Default: False
+
+    Returns
+    -------
+    :
+        The differences between the models.
+    """
+    added = sorted(uid for uid in new.objects if uid not in old.objects)
+    removed = sorted(uid for uid in old.objects if uid not in new.objects)
+    matched = {}
+    if match_by_content and added and removed:
+        matched = _match_by_content(old, new, removed, added)
+        matched_new = set(matched.values())
+        added = [uid for uid in added if uid not in matched_new]
+        removed = [uid for uid in removed if uid not in matched]
+
+    old_fingerprints = get_fingerprints(old)
+    new_fingerprints = get_fingerprints(new)
+    modified = {}
+    for uid, old_obj in old.objects.items():
+        new_obj = new.objects.get(uid)
+        if new_obj is None or \
+                old_fingerprints[uid] == new_fingerprints[uid]:
+            continue
+        changes = _diff_objects(old_obj, new_obj, matched)
+        if changes:
+            modified[uid] = changes
+    logger.info('Diff of models: %d added, %d removed, %d modified'
+                % (len(added), len(removed), len(modified)))
+    return ModelDiff(added=sorted(added), removed=sorted(removed),
+                     modified=modified, matched=matched)
+
+
+def _match_by_content(old, new, removed, added):
+    candidates = defaultdict(deque)
+    new_deep = get_deep_fingerprints(new)
+    for uid in added:
+        candidates[new_deep[uid]].append(uid)
+    old_deep = get_deep_fingerprints(old)
+    matched = {}
+    for uid in removed:
+        same_content = candidates.get(old_deep[uid])
+        if same_content:
+            matched[uid] = same_content.popleft()
+    return matched
+
+
+def _diff_objects(old_obj, new_obj, matched):
+    changes = {}
+    keys = get_attribute_keys(old_obj)
+    if old_obj.__class__ is not new_obj.__class__:
+        changes['class'] = {'old': old_obj.__class__.__name__,
+                            'new': new_obj.__class__.__name__}
+        keys = list(keys) + [attr_key for attr_key
+                             in get_attribute_keys(new_obj)
+                             if attr_key not in keys]
+    for attr, key in keys:
+        old_val = old_obj.__dict__.get(key)
+        new_val = new_obj.__dict__.get(key)
+        if isinstance(old_val, list) or isinstance(new_val, list):
+            old_vals = [_get_value(v, matched) for v in old_val or []]
+            new_vals = [_get_value(v) for v in new_val or []]
+            old_set = set(old_vals)
+            new_set = set(new_vals)
+            if old_set != new_set:
+                changes[attr] = {
+                    'added': [v for v in new_vals if v not in old_set],
+                    'removed': [v for v in old_vals if v not in new_set]}
+        else:
+            old_val = _get_value(old_val, matched)
+            new_val = _get_value(new_val)
+            if old_val != new_val:
+                changes[attr] = {'old': old_val, 'new': new_val}
+    return changes
+
+
+def _get_value(val, matched=None):
+    """Return the serializable value of an attribute value, with references
+    from the old model translated to the uids they were matched with."""
+    if isinstance(val, BioPaxObject):
+        val = val.uid
+        if matched:
+            val = matched.get(val, val)
+    return val
@@ -0,0 +1,251 @@
+"""This module implements content fingerprints of BioPAX objects and models.
+
+A fingerprint is a hash of the content of an object which, unlike its uid,
+is the same for two objects with the same content. There are two kinds of
+object fingerprints:
+
+- shallow fingerprints cover the class and literal attribute values of an
+  object and the uids of the objects it refers to,
+- deep fingerprints cover the class and literal attribute values of an
+  object and the deep fingerprints of the objects it refers to, so they
+  change if anything reachable from the object changes, in the manner of a
+  Merkle tree. References within a reference cycle are represented by uid
+  since the objects in a cycle can't be hashed one after the other, and the
+  deep fingerprints of objects in a cycle cover the content of the whole
+  cycle instead.
+
+Neither kind includes the uid of the object itself. The values of
+list-valued attributes are treated as unordered. The model fingerprint is a
+hash of the uids and deep fingerprints of all objects in the model.
+
+Fingerprints of all objects in a model are computed in a single pass over
+the model and cached in the model. Fingerprints are recomputed if objects
+were added to or removed from the model since they were cached. After
+modifying objects, or replacing an object by another one with the same uid,
+:func:`invalidate_fingerprints` needs to be called, or
+:meth:`pybiopax.biopax.BioPaxModel.clear_indexes`, which drops the cache.
+"""
+__all__ = ['get_fingerprint', 'get_fingerprints', 'get_deep_fingerprints',
+           'get_model_fingerprint', 'invalidate_fingerprints']
+
+import hashlib
+from typing import Iterable, Mapping, Optional, Tuple, Union
+
+from .biopax import BioPaxModel, BioPaxObject
+from .biopax.base import get_attribute_keys
+from .biopax.model import _iter_components
+
+_sorted_keys = {}
+
+
+def get_fingerprint(obj: BioPaxObject) -> str:
+    """Return the shallow fingerprint of an object without caching.
+
+    Parameters
+    ----------
+    obj :
+        A BioPAX object.
+
+    Returns
+    -------
+    :
+        The hexadecimal shallow fingerprint of the object.
+    """
+    return _hash(_encode(obj)[0])
+
+
+def get_fingerprints(model: BioPaxModel) -> Mapping[str, str]:
+    """Return the shallow fingerprints of all objects in a model.
+
+    Parameters
+    ----------
+    model :
+        A BioPAX Model.
+
+    Returns
+    -------
+    :
+        A dict from the uids of objects to their shallow fingerprints.
+    """
+    return _get_cache(model)['shallow']
+
+
+def get_deep_fingerprints(model: BioPaxModel) -> Mapping[str, str]:
+    """Return the deep fingerprints of all objects in a model.
+
+    Parameters
+    ----------
+    model :
+        A BioPAX Model.
+
+    Returns
+    -------
+    :
+        A dict from the uids of objects to their deep fingerprints.
+    """
+    return _get_cache(model)['deep']
+
+
+def get_model_fingerprint(model: BioPaxModel) -> str:
+    """Return a fingerprint of the content of a whole model.
+
+    Parameters
+    ----------
+    model :
+        A BioPAX Model.
+
+    Returns
+    -------
+    :
+        The hexadecimal fingerprint of the model.
+    """
+    cache = _get_cache(model)
+    if cache['model'] is None:
+        hasher = hashlib.blake2b(digest_size=16)
+        for uid, fingerprint in sorted(cache['deep'].items()):
+            hasher.update(('%d:%s%s' % (len(uid), uid, fingerprint))
+                          .encode('utf-8'))
+        cache['model'] = hasher.hexdigest()
+    return cache['model']
+
+
+def invalidate_fingerprints(model: BioPaxModel,
+                            objects: Iterable[Union[str, BioPaxObject]]):
+    """Invalidate cached fingerprints after objects were modified.
+
+    The shallow fingerprints of the given objects and all deep fingerprints
+    are dropped and recomputed on next use. Objects added to or removed
+    from the model don't need to be invalidated.
+
+    Parameters
+    ----------
+    model :
+        A BioPAX Model.
+    objects :
+        The modified objects or their uids.
+    """
+    cache = model.get_index('fingerprints', _new_cache)
+    for obj in objects:
+        cache['shallow'].pop(obj if isinstance(obj, str) else obj.uid, None)
+    cache['deep'] = None
+    cache['model'] = None
+
+
+def _new_cache(model):
+    # The uids of the objects of the model the fingerprints were computed
+    # for are kept to detect added and removed objects
+    return {'shallow': {}, 'deep': None, 'model': None, 'uids': None}
+
+
+def _get_cache(model):
+    cache = model.get_index('fingerprints', _new_cache)
+    uids = cache['uids']
+    if cache['deep'] is None or uids != model.objects.keys():
+        if uids is not None:
+            for uid in uids - model.objects.keys():
+                cache['shallow'].pop(uid, None)
+        _compute_fingerprints(model, cache)
+        cache['uids'] = set(model.objects)
+    return cache
+
+
+def _compute_fingerprints(model, cache):
+    """Compute missing shallow and all deep fingerprints in one pass over
+    the strongly connected components of the reference graph, in reverse
+    topological order."""
+    shallow = cache['shallow']
+    deep = {}
+    for component in _iter_components(model.objects.values(),
+                                      _get_references, deep):
+        uids = {obj.uid for obj in component}
+
+        def get_ref(ref):
+            # Components are generated after the components they refer to
+            # so only references within the component aren't hashed yet
+            return 'u' + ref.uid if ref.uid in uids else deep[ref.uid]
+
+        encodings = {}
+        for obj in component:
+            shallow_encoding, encodings[obj.uid] = _encode(obj, get_ref)
+            if obj.uid not in shallow:
+                shallow[obj.uid] = _hash(shallow_encoding)
+        if len(component) == 1:
+            deep[obj.uid] = _hash(encodings[obj.uid])
+            continue
+        # The objects in a cycle also cover the content of the rest of the
+        # cycle so that changes anywhere in it change all their fingerprints
+        cycle = '|'.join('%d:%s%s' % (len(uid), uid, encoding)
+                         for uid, encoding in sorted(encodings.items()))
+        for uid, encoding in encodings.items():
+            deep[uid] = _hash('%s|%s' % (encoding, cycle))
+    cache['deep'] = deep
+    cache['model'] = None
+
+
+def _get_references(obj):
+    refs = []
+    for _, key in _get_sorted_keys(obj):
+        val = obj.__dict__.get(key)
+        if isinstance(val, BioPaxObject):
+            refs.append(val)
+        elif isinstance(val, list):
+            refs += [v for v in val if isinstance(v, BioPaxObject)]
+    return refs
+
+
+def _get_sorted_keys(obj):
+    keys = _sorted_keys.get(obj.__class__)
+    if keys is None:
+        keys = tuple(sorted(get_attribute_keys(obj)))
+        _sorted_keys[obj.__class__] = keys
+    return keys
+
+
+def _encode(obj, get_ref=None) -> Tuple[str, Optional[str]]:
+    """Return the canonical encodings of an object's content with
+    references encoded by uid and, if get_ref is given, with references
+    encoded by that function, in a single pass over the attributes."""
+    shallow_parts = [obj.__class__.__name__]
+    deep_parts = [obj.__class__.__name__]
+    for attr, key in _get_sorted_keys(obj):
+        val = obj.__dict__.get(key)
+        # Empty values are skipped so that the fingerprints don't depend on
+        # whether an empty attribute is present
+        if val is None:
+            continue
+        if isinstance(val, list):
+            if not val:
+                continue
+            values = [_encode_value(v, get_ref) for v in val]
+            shallow = '[%s]' % ','.join(sorted(v[0] for v in values))
+            deep = '[%s]' % ','.join(sorted(v[1] for v in values)) \
+                if get_ref else None
+        else:
+            shallow, deep = _encode_value(val, get_ref)
+        shallow_parts.append('%s=%s' % (attr, shallow))
+        deep_parts.append('%s=%s' % (attr, deep))
+    return ';'.join(shallow_parts), \
+        ';'.join(deep_parts) if get_ref else None
+
+
+def _encode_value(val, get_ref):
+    # Values are prefixed by their length so that separators in values
+    # can't make different contents encode the same way
+    if isinstance(val, BioPaxObject):
+        shallow = 'u' + val.uid
+        shallow = '%d:%s' % (len(shallow), shallow)
+        if get_ref is None:
+            return shallow, None
+        deep = get_ref(val)
+        return shallow, '%d:%s' % (len(deep), deep)
+    elif isinstance(val, str):
+        val = 's' + val
+    else:
+        val = '%s:%s' % (type(val).__name__, val)
+    val = '%d:%s' % (len(val), val)
+    return val, val
+
+
+def _hash(content: str) -> str:
+    return hashlib.blake2b(content.encode('utf-8'),
+                           digest_size=16).hexdigest()
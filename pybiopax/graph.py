@@ -0,0 +1,300 @@
+"""This module implements graph queries on a locally loaded BioPaxModel
+with the same semantics as the neighborhood, pathsbetween and pathsfromto
+graph queries of the Pathway Commons web service (see
+:func:`pybiopax.pc_client.graph_query`).
+
+Queries are run on a bipartite interaction graph whose nodes are entity
+references and interactions, with physical entities (including complexes
+and generics) resolved to the entity references they are made up of. The
+graph is directed: inputs (left side, controllers) point to interactions,
+and interactions point to their outputs (right side, products). Controls
+are not nodes of their own, rather, controllers point directly to the
+process that is ultimately controlled, and the controls are added to the
+results along with the controllers and the controlled processes. The
+length of a path is the number of interactions it goes through, so with a
+limit of 1, the neighborhood of an entity consists of the interactions it
+takes part in and their other participants. Results are extracted with
+:meth:`pybiopax.biopax.BioPaxModel.submodel`, so they contain copies of the
+objects in the queried model.
+"""
+__all__ = ['neighborhood', 'paths_between', 'paths_from_to']
+
+import logging
+from collections import defaultdict, deque
+from typing import Iterable, Mapping, Optional, Set, Union
+
+from .biopax import *
+
+logger = logging.getLogger(__name__)
+
+QueryEntities = Union[str, BioPaxObject, Iterable[Union[str, BioPaxObject]]]
+
+
+def neighborhood(model: BioPaxModel, sources: QueryEntities,
+                 limit: int = 1, direction: str = 'both') -> BioPaxModel:
+    """Return the neighborhood of the given entities as a BioPAX Model.
+
+    Parameters
+    ----------
+    model :
+        The BioPAX Model to query.
+    sources :
+        A gene name, an xref identifier (optionally prefixed with the
+        database name, e.g., ``uniprot:P28482``), an EntityReference or
+        PhysicalEntity, or a list of these.
+    limit :
+        The maximum length of paths from the sources. Default: 1
+    direction :
+        One of 'both', 'downstream' or 'upstream'. Default: 'both'
+
+    Returns
+    -------
+    :
+        A BioPAX Model with the interactions and entities in the
+        neighborhood, and all objects they reference.
+    """
+    graph = _get_interaction_graph(model)
+    source_nodes = _get_query_nodes(model, sources)
+    if direction == 'both':
+        dists = _bfs(graph, source_nodes, limit, forward=True, backward=True)
+    elif direction == 'downstream':
+        dists = _bfs(graph, source_nodes, limit, forward=True)
+    elif direction == 'upstream':
+        dists = _bfs(graph, source_nodes, limit, backward=True)
+    else:
+        raise ValueError('Invalid direction %s' % direction)
+    return _get_result_model(model, graph, set(dists))
+
+
+def paths_between(model: BioPaxModel, sources: QueryEntities,
+                  limit: int = 1) -> BioPaxModel:
+    """Return the paths between any two of the given entities as a BioPAX
+    Model.
+
+    Parameters
+    ----------
+    model :
+        The BioPAX Model to query.
+    sources :
+        A list of gene names, xref identifiers, EntityReferences or
+        PhysicalEntities, see :func:`neighborhood`.
+    limit :
+        The maximum length of paths between sources. Default: 1
+
+    Returns
+    -------
+    :
+        A BioPAX Model with the interactions and entities on the paths,
+        and all objects they reference.
+    """
+    graph = _get_interaction_graph(model)
+    source_nodes = _get_query_nodes(model, sources)
+    # A single search from all sources finds the two nearest distinct
+    # sources of each node
+    nodes = set()
+    for node, dists in _nearest_sources(graph, source_nodes, limit).items():
+        if len(dists) == 2 and sum(dists.values()) <= 2 * limit:
+            nodes.add(node)
+    return _get_result_model(model, graph, nodes)
+
+
+def paths_from_to(model: BioPaxModel, sources: QueryEntities,
+                  targets: QueryEntities, limit: int = 1) -> BioPaxModel:
+    """Return the directed paths from source to target entities as a BioPAX
+    Model.
+
+    A breadth-first search runs forward from the sources, bounded by the
+    limit. A second search then runs backward from the targets, only
+    through nodes reached by the first one that are close enough to the
+    sources to be on a path within the limit.
+
+    Parameters
+    ----------
+    model :
+        The BioPAX Model to query.
+    sources :
+        A list of gene names, xref identifiers, EntityReferences or
+        PhysicalEntities, see :func:`neighborhood`.
+    targets :
+        A list of gene names, xref identifiers, EntityReferences or
+        PhysicalEntities.
+    limit :
+        The maximum length of paths from sources to targets. Default: 1
+
+    Returns
+    -------
+    :
+        A BioPAX Model with the interactions and entities on the paths,
+        and all objects they reference.
+    """
+    graph = _get_interaction_graph(model)
+    source_nodes = _get_query_nodes(model, sources)
+    target_nodes = _get_query_nodes(model, targets)
+    forward = _bfs(graph, source_nodes, limit, forward=True)
+    backward = _bfs(graph, target_nodes, limit, backward=True,
+                    other_dists=forward)
+    return _get_result_model(model, graph, set(backward))
+
+
+class _InteractionGraph:
+    """The interaction graph and lookup tables of a model."""
+    def __init__(self):
+        self.successors = defaultdict(set)
+        self.predecessors = defaultdict(set)
+        # Controls by controlled process and controller entity reference
+        self.controls = defaultdict(lambda: defaultdict(set))
+        self.lookup = defaultdict(set)
+
+    def add_edge(self, source, target):
+        self.successors[source].add(target)
+        self.predecessors[target].add(source)
+
+
+def _get_interaction_graph(model) -> _InteractionGraph:
+    """Return the interaction graph of a model, building it on first use."""
+    return model.get_index('interaction_graph', _build_interaction_graph)
+
+
+def _build_interaction_graph(model) -> _InteractionGraph:
+    graph = _InteractionGraph()
+    er_index = model.get_leaf_entity_references()
+
+    def get_ers(entities):
+        ers = set()
+        for entity in entities:
+            if isinstance(entity, BioPaxObject):
+                ers |= {er.uid for er in er_index.get(entity.uid, ())}
+        return ers
+
+    for obj in model.objects.values():
+        if isinstance(obj, EntityReference):
+            _add_lookup_keys(graph.lookup, obj)
+        elif isinstance(obj, Control):
+            controlled = obj.get_controlled_process()
+            if not isinstance(controlled, Interaction):
+                continue
+            for er in get_ers(obj.controller):
+                graph.add_edge(er, controlled.uid)
+                graph.controls[controlled.uid][er].add(obj.uid)
+        elif isinstance(obj, Conversion):
+            for er in get_ers(obj.left):
+                graph.add_edge(er, obj.uid)
+            for er in get_ers(obj.right):
+                graph.add_edge(obj.uid, er)
+        elif isinstance(obj, TemplateReaction):
+            for er in get_ers(obj.product):
+                graph.add_edge(obj.uid, er)
+        elif isinstance(obj, Interaction):
+            for er in get_ers(obj.participant):
+                graph.add_edge(er, obj.uid)
+                graph.add_edge(obj.uid, er)
+    return graph
+
+
+def _add_lookup_keys(lookup, er):
+    for name in er.name:
+        lookup[name.lower()].add(er.uid)
+    for xref in er.xref:
+        if not isinstance(xref, Xref) or not xref.id:
+            continue
+        lookup[xref.id.lower()].add(er.uid)
+        if xref.db:
+            lookup['%s:%s' % (xref.db.lower(), xref.id.lower())].add(er.uid)
+
+
+def _get_query_nodes(model, entities) -> Set[str]:
+    """Return the uids of entity references for query entities."""
+    if isinstance(entities, (str, BioPaxObject)):
+        entities = [entities]
+    graph = _get_interaction_graph(model)
+    nodes = set()
+    for entity in entities:
+        if isinstance(entity, (EntityReference, PhysicalEntity)):
+            nodes |= {er.uid
+                      for er in model.leaf_entity_references(entity)}
+        elif not isinstance(entity, str):
+            desc = '%s %s' % (entity.__class__.__name__, entity.uid) \
+                if isinstance(entity, BioPaxObject) else repr(entity)
+            raise TypeError('Query entities need to be names, identifiers, '
+                            'EntityReferences or PhysicalEntities, not %s'
+                            % desc)
+        else:
+            matches = graph.lookup.get(entity.lower())
+            if not matches:
+                logger.warning('Could not find entity %s in the model.'
+                               % entity)
+                continue
+            nodes |= matches
+    return nodes
+
+
+def _bfs(graph, starts, limit, forward=False, backward=False,
+         other_dists: Optional[Mapping[str, int]] = None) \
+        -> Mapping[str, int]:
+    """Return the number of edges to nodes reachable from the start nodes
+    going through at most limit interactions.
+
+    If other_dists is given, only nodes whose distance in it plus their
+    distance from the start nodes is within the limit are visited.
+    """
+    def within_limit(node, dist):
+        if other_dists is None:
+            return True
+        other_dist = other_dists.get(node)
+        return other_dist is not None and other_dist + dist <= 2 * limit
+
+    dists = {node: 0 for node in starts if within_limit(node, 0)}
+    queue = deque(dists)
+    while queue:
+        node = queue.popleft()
+        dist = dists[node] + 1
+        if dist > 2 * limit:
+            continue
+        neighbors = set()
+        if forward:
+            neighbors |= graph.successors.get(node, set())
+        if backward:
+            neighbors |= graph.predecessors.get(node, set())
+        for neighbor in neighbors:
+            if neighbor not in dists and within_limit(neighbor, dist):
+                dists[neighbor] = dist
+                queue.append(neighbor)
+    return dists
+
+
+def _nearest_sources(graph, sources, limit) \
+        -> Mapping[str, Mapping[str, int]]:
+    """Return the distances of nodes from their (at most) two nearest
+    sources, ignoring edge directions, going through at most limit
+    interactions.
+
+    This is a breadth-first search from all sources at once in which each
+    node is reached from at most two distinct sources, so it visits each
+    node at most twice.
+    """
+    nearest = {source: {source: 0} for source in sources}
+    queue = deque((source, source) for source in sources)
+    while queue:
+        node, source = queue.popleft()
+        dist = nearest[node][source] + 1
+        if dist > 2 * limit:
+            continue
+        for neighbor in graph.successors.get(node, set()) | \
+                graph.predecessors.get(node, set()):
+            dists = nearest.setdefault(neighbor, {})
+            if len(dists) < 2 and source not in dists:
+                dists[source] = dist
+                queue.append((neighbor, source))
+    return nearest
+
+
+def _get_result_model(model, graph, nodes) -> BioPaxModel:
+    """Return a model with the objects for the given nodes, the controls
+    linking them, and all the objects they reference."""
+    uids = set(nodes)
+    for process in nodes:
+        for er, controls in graph.controls.get(process, {}).items():
+            if er in nodes:
+                uids |= controls
+    return model.submodel([uid for uid in uids if uid in model.objects],
+                          closure='forward')
@@ -0,0 +1,139 @@
+"""This module implements hooks to instrument the loading of BioPAX models.
+
+Loading functions such as :func:`pybiopax.model_from_owl_file` and
+:meth:`pybiopax.biopax.BioPaxModel.from_xml` take an optional
+instrumentation object which is notified once per loading phase, so
+instrumentation adds no per-element overhead. The phases of loading are:
+
+- parse_xml: parsing OWL content into an XML tree (only reported when
+  loading from a string or a file)
+- instantiate: traversing the XML tree, instantiating BioPAX objects and
+  registering objects nested inline in other objects with the model
+- resolve_references: replacing references by uid with the referenced
+  objects
+- add_reverse_links: linking objects to the objects referring to them
+"""
+__all__ = ['LoadInstrumentation', 'LoadStats', 'timed_phase']
+
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Collection, Mapping, Optional
+
+
+class LoadInstrumentation:
+    """Base class of instrumentation for model loading.
+
+    Subclasses override the methods for the events they are interested in.
+    All methods do nothing by default.
+    """
+    def phase_finished(self, phase: str, wall_time: float,
+                       cpu_time: float):
+        """Called when a phase of loading is finished.
+
+        Parameters
+        ----------
+        phase :
+            The name of the phase.
+        wall_time :
+            The elapsed wall time of the phase in seconds.
+        cpu_time :
+            The CPU time used by the process during the phase in seconds.
+        """
+
+    def elements_processed(self, class_counts: Mapping[str, int]):
+        """Called once all elements are instantiated.
+
+        Parameters
+        ----------
+        class_counts :
+            The number of elements instantiated per BioPAX class, including
+            elements nested inline in other elements.
+        """
+
+    def references_unresolved(self, obj_ids: Collection[str]):
+        """Called once references are resolved.
+
+        Parameters
+        ----------
+        obj_ids :
+            The uids that were referred to but not defined in the content,
+            one entry per unresolved reference. These references are kept
+            as uid strings.
+        """
+
+
+class LoadStats(LoadInstrumentation):
+    """Instrumentation collecting statistics on model loading.
+
+    Attributes
+    ----------
+    phases : dict
+        A dict from phase names to (wall time, CPU time) pairs in seconds,
+        in the order the phases finished.
+    class_counts : collections.Counter
+        The number of elements instantiated per BioPAX class.
+    num_unresolved : int
+        The number of references that couldn't be resolved.
+    unresolved_ids : set
+        The distinct uids of references that couldn't be resolved.
+    """
+    def __init__(self):
+        self.phases = {}
+        self.class_counts = Counter()
+        self.num_unresolved = 0
+        self.unresolved_ids = set()
+
+    def phase_finished(self, phase, wall_time, cpu_time):
+        # Phases can be reported more than once, e.g., when loading
+        # several models with the same stats object
+        prev_wall, prev_cpu = self.phases.get(phase, (0.0, 0.0))
+        self.phases[phase] = (prev_wall + wall_time, prev_cpu + cpu_time)
+
+    def elements_processed(self, class_counts):
+        self.class_counts.update(class_counts)
+
+    def references_unresolved(self, obj_ids):
+        self.num_unresolved += len(obj_ids)
+        self.unresolved_ids |= set(obj_ids)
+
+    @property
+    def wall_time(self) -> float:
+        """The total wall time of all phases in seconds."""
+        return sum(wall for wall, _ in self.phases.values())
+
+    @property
+    def cpu_time(self) -> float:
+        """The total CPU time of all phases in seconds."""
+        return sum(cpu for _, cpu in self.phases.values())
+
+    def __str__(self):
+        lines = ['%-22s%12s%12s' % ('Phase', 'wall (s)', 'CPU (s)')]
+        for phase, (wall, cpu) in self.phases.items():
+            lines.append('%-22s%12.3f%12.3f' % (phase, wall, cpu))
+        lines.append('%-22s%12.3f%12.3f' % ('Total', self.wall_time,
+                                             self.cpu_time))
+        lines.append('%d elements, %d unresolved references' %
+                     (sum(self.class_counts.values()), self.num_unresolved))
+        return '\n'.join(lines)
+
+
+@contextmanager
+def timed_phase(instrumentation: Optional[LoadInstrumentation], phase: str):
+    """Time the enclosed block as a phase reported to instrumentation.
+
+    Parameters
+    ----------
+    instrumentation :
+        The instrumentation to report to. If None, nothing is timed.
+    phase :
+        The name of the phase.
+    """
+    if instrumentation is None:
+        yield
+        return
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    yield
+    instrumentation.phase_finished(phase, time.perf_counter() - wall_start,
+                                   time.process_time() - cpu_start)
@@ -0,0 +1,315 @@
+"""This module implements serializing BioPAX objects and models into a
+compact JSON-LD compatible form, e.g., for returning fragments of models
+from web APIs, and loading models back from it.
+
+Each object is a JSON object (a node) with its uid as ``@id``, its class
+as ``@type`` and its attributes under the names of the corresponding BioPAX
+properties, e.g., ``displayName``. Literal values are strings and
+references to other objects are given as ``{"@id": uid}``, or as the node
+of the referenced object itself when it is embedded. As in the OWL
+serialization, uids which aren't URIs (given by ``rdf:ID`` in OWL) are
+written as fragments, e.g., ``#protein_1``, so that they resolve to the
+same URIs against the xml:base of the model. A model, or a set of objects
+from it, is serialized as::
+
+    {"@context": {"@vocab": "http://www.biopax.org/release/biopax-level3.owl#",
+                  "@base": <xml:base of the model>},
+     "@graph": [<node>, ...]}
+
+so that the document can be read by JSON-LD processors as the same RDF
+graph as the OWL serialization of the objects. Attributes with no value
+are left out. Reverse links aren't serialized since they are derived from
+the references when a model is loaded.
+
+Nodes are built from the attributes of each class, which are determined
+once per class. If `orjson <https://github.com/ijl/orjson>`_ is installed
+it is used to encode and decode JSON, otherwise the built-in json module
+is used.
+"""
+__all__ = ['object_to_json_dict', 'model_to_json', 'iter_model_json',
+           'model_from_json']
+
+import json
+import logging
+from typing import (Any, Iterable, Iterator, List, Mapping, Optional, TextIO,
+                    Union)
+
+from .biopax import BioPaxModel, BioPaxObject
+from .biopax import model as biopax_model
+from .biopax.base import Unresolved, get_attribute_keys
+from .biopax.model import default_xml_base, resolve_value
+from .xml_util import camel_to_snake, is_url, namespaces, snake_to_camel
+
+logger = logging.getLogger(__name__)
+
+# The (JSON key, __dict__ key) pairs of the attributes of each class
+_json_keys = {}
+# The attribute names of JSON keys
+_attr_names = {}
+_orjson = None
+
+
+def object_to_json_dict(obj: BioPaxObject, depth: int = 0) \
+        -> Mapping[str, Any]:
+    """Return the JSON-LD node of an object.
+
+    Parameters
+    ----------
+    obj :
+        A BioPAX object.
+    depth :
+        The number of levels of referenced objects to embed as nodes in the
+        node of the object. Objects referenced beyond this depth are given
+        as ``{"@id": uid}``. Default: 0
+
+    Returns
+    -------
+    :
+        A JSON-serializable dict.
+    """
+    # Lazy proxies only have their uid until loaded
+    if '_lazy_loader' in obj.__dict__:
+        obj._load()
+    cls = obj.__class__
+    keys = _json_keys.get(cls)
+    if keys is None:
+        keys = tuple((snake_to_camel(attr), key)
+                     for attr, key in get_attribute_keys(obj))
+        _json_keys[cls] = keys
+    node = {'@id': _to_json_id(obj.uid), '@type': cls.__name__}
+    obj_dict = obj.__dict__
+    for json_key, key in keys:
+        val = obj_dict.get(key)
+        if val is None:
+            continue
+        if isinstance(val, list):
+            if not val:
+                continue
+            node[json_key] = [_to_json_value(v, depth) for v in val]
+        else:
+            node[json_key] = _to_json_value(val, depth)
+    return node
+
+
+def _to_json_value(val, depth):
+    if isinstance(val, BioPaxObject):
+        if depth > 0:
+            return object_to_json_dict(val, depth - 1)
+        return {'@id': _to_json_id(val.uid)}
+    return val
+
+
+def _to_json_id(uid):
+    return uid if is_url(uid) else '#' + uid
+
+
+def _from_json_id(json_id):
+    return json_id[1:] if json_id.startswith('#') else json_id
+
+
+def model_to_json(model: BioPaxModel,
+                  objects: Optional[Iterable[Union[str, BioPaxObject]]] = None,
+                  depth: int = 0, fp: Optional[TextIO] = None) \
+        -> Optional[str]:
+    """Return the JSON-LD serialization of a model or of objects in it.
+
+    Parameters
+    ----------
+    model :
+        A BioPAX Model.
+    objects :
+        The objects, or their uids, to serialize. By default, all objects of
+        the model are serialized.
+    depth :
+        The number of levels of referenced objects to embed in the node of
+        each object, see :func:`object_to_json_dict`. Default: 0
+    fp :
+        If given, the JSON is written to this text file object in chunks as
+        it is produced, see :func:`iter_model_json`, rather than returned.
+
+    Returns
+    -------
+    :
+        The JSON string, or None if it was written to a file.
+    """
+    if fp is not None:
+        for chunk in iter_model_json(model, objects, depth=depth):
+            fp.write(chunk)
+        return None
+    return _dumps({'@context': _get_context(model),
+                   '@graph': [object_to_json_dict(obj, depth) for obj
+                              in _get_objects(model, objects)]})
+
+
+def iter_model_json(model: BioPaxModel,
+                    objects: Optional[Iterable[Union[str,
+                                                     BioPaxObject]]] = None,
+                    depth: int = 0, chunk_size: int = 1000) -> Iterator[str]:
+    """Generate the JSON-LD serialization of a model in chunks.
+
+    This allows streaming the serialization of large numbers of objects,
+    e.g., into a file or an HTTP response, without building it in memory.
+
+    Parameters
+    ----------
+    model :
+        A BioPAX Model.
+    objects :
+        The objects, or their uids, to serialize. By default, all objects of
+        the model are serialized.
+    depth :
+        The number of levels of referenced objects to embed in the node of
+        each object, see :func:`object_to_json_dict`. Default: 0
+    chunk_size :
+        The number of objects serialized per chunk. Default: 1000
+
+    Yields
+    ------
+    :
+        Consecutive chunks of the JSON string.
+    """
+    yield '{"@context":%s,"@graph":[' % _dumps(_get_context(model))
+    nodes = []
+    first = True
+    for obj in _get_objects(model, objects):
+        nodes.append(object_to_json_dict(obj, depth))
+        if len(nodes) == chunk_size:
+            yield ('' if first else ',') + _dumps(nodes)[1:-1]
+            first = False
+            nodes = []
+    if nodes:
+        yield ('' if first else ',') + _dumps(nodes)[1:-1]
+    yield ']}'
+
+
+def model_from_json(content: Union[str, bytes, Mapping[str, Any],
+                                   List[Mapping[str, Any]]]) -> BioPaxModel:
+    """Return a BioPAX Model from its JSON-LD serialization.
+
+    The content is expected in the form produced by :func:`model_to_json`.
+    Embedded nodes are added to the model as objects, unless the same
+    object is also defined elsewhere in the content, and references are
+    resolved as when loading OWL, i.e., references to objects not defined
+    in the content are kept as uid strings.
+
+    Parameters
+    ----------
+    content :
+        A JSON string, or a decoded JSON document, a list of nodes or a
+        single node.
+
+    Returns
+    -------
+    :
+        A BioPAX Model deserialized from the JSON.
+    """
+    if isinstance(content, (str, bytes)):
+        content = _loads(content)
+    xml_base = default_xml_base
+    if isinstance(content, dict):
+        if '@graph' in content:
+            xml_base = content.get('@context', {}).get('@base', xml_base)
+            nodes = content['@graph']
+        else:
+            nodes = [content]
+    else:
+        nodes = content
+
+    # Objects defined as top-level nodes take precedence over embedded ones
+    objects = {}
+    embedded = {}
+    for node in nodes:
+        obj = _node_to_object(node, embedded)
+        objects[obj.uid] = obj
+    for uid, obj in embedded.items():
+        objects.setdefault(uid, obj)
+    unresolved = []
+    for obj in objects.values():
+        obj_dict = obj.__dict__
+        for key, val in obj_dict.items():
+            if isinstance(val, (Unresolved, list)):
+                obj_dict[key] = resolve_value(objects, val, unresolved)
+    if unresolved:
+        logger.info('%d references could not be resolved'
+                    % len(unresolved))
+    return BioPaxModel(objects, xml_base=xml_base)
+
+
+def _node_to_object(node, embedded):
+    cls_name = node.get('@type')
+    cls = getattr(biopax_model, cls_name, None) \
+        if isinstance(cls_name, str) else None
+    if not isinstance(cls, type) or not issubclass(cls, BioPaxObject):
+        raise ValueError('Invalid BioPAX class %s of %s'
+                         % (cls_name, node.get('@id')))
+    kwargs = {'uid': _from_json_id(node['@id'])}
+    for key, val in node.items():
+        if key.startswith('@'):
+            continue
+        attr = _attr_names.get(key)
+        if attr is None:
+            attr = camel_to_snake(key)
+            _attr_names[key] = attr
+        if isinstance(val, list):
+            kwargs[attr] = [_from_json_value(v, embedded) for v in val]
+        else:
+            kwargs[attr] = _from_json_value(val, embedded)
+    # List-valued attributes given a single value in the JSON
+    for attr in cls.list_types:
+        val = kwargs.get(attr)
+        if val is not None and not isinstance(val, list):
+            kwargs[attr] = [val]
+    return cls(**kwargs)
+
+
+def _from_json_value(val, embedded):
+    if isinstance(val, dict):
+        if '@value' in val:
+            return val['@value']
+        # Embedded nodes are turned into references so that all references
+        # to an object are resolved to the same object
+        if '@type' in val:
+            obj = _node_to_object(val, embedded)
+            embedded.setdefault(obj.uid, obj)
+        return Unresolved(_from_json_id(val['@id']))
+    return val
+
+
+def _get_objects(model, objects):
+    if objects is None:
+        return model.objects.values()
+    return (model.objects[obj] if isinstance(obj, str) else obj
+            for obj in objects)
+
+
+def _get_context(model):
+    context = {'@vocab': namespaces['bp']}
+    if model.xml_base:
+        context['@base'] = model.xml_base
+    return context
+
+
+def _get_orjson():
+    """Return the orjson module if it is installed, otherwise False."""
+    global _orjson
+    if _orjson is None:
+        try:
+            import orjson
+            _orjson = orjson
+        except ImportError:
+            _orjson = False
+    return _orjson
+
+
+def _dumps(obj) -> str:
+    orjson = _get_orjson()
+    if orjson:
+        return orjson.dumps(obj).decode('utf-8')
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':'))
+
+
+def _loads(content):
+    orjson = _get_orjson()
+    if orjson:
+        return orjson.loads(content)
+    return json.loads(content)
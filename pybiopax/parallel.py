@@ -0,0 +1,75 @@
+"""This module implements running a function over chunks of a sequence of
+items in parallel worker processes. Workers are forked from the current
+process so they share large read-only structures such as a BioPaxModel
+without having to pickle them."""
+__all__ = ['map_chunks']
+
+import logging
+import multiprocessing
+from typing import Any, Callable, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+# The state shared with forked worker processes
+_worker_state = None
+
+
+def map_chunks(func: Callable[[Any, int, int], Any], state: Any,
+               num_items: int, n_jobs: Optional[int] = 1,
+               chunk_size: int = 10000) -> Iterator[Any]:
+    """Generate the results of a function over chunks of items in order.
+
+    Parameters
+    ----------
+    func :
+        A module-level function taking the shared state and the start and
+        end index of a chunk of items, returning a picklable result.
+    state :
+        An arbitrary object shared with the function. It is inherited by
+        worker processes when forking rather than pickled.
+    num_items :
+        The total number of items to process.
+    n_jobs :
+        The number of worker processes to use. If 1, or if forking
+        processes is not supported on the platform, chunks are processed
+        serially in the current process. If None, the number of CPUs is
+        used.
+    chunk_size :
+        The number of items in each chunk.
+
+    Returns
+    -------
+    :
+        An iterator over the results of the function for each chunk, in the
+        order of the chunks.
+    """
+    global _worker_state
+    chunks = [(start, min(start + chunk_size, num_items))
+              for start in range(0, num_items, chunk_size)]
+    if n_jobs is None:
+        n_jobs = multiprocessing.cpu_count()
+    n_jobs = min(n_jobs, len(chunks))
+    if n_jobs > 1 and \
+            'fork' not in multiprocessing.get_all_start_methods():
+        logger.warning('Forking processes is not supported on this platform, '
+                       'processing chunks serially.')
+        n_jobs = 1
+    if n_jobs <= 1:
+        for start, end in chunks:
+            yield func(state, start, end)
+        return
+
+    _worker_state = state
+    try:
+        ctx = multiprocessing.get_context('fork')
+        with ctx.Pool(n_jobs) as pool:
+            yield from pool.imap(_run_chunk,
+                                 [(func, start, end)
+                                  for start, end in chunks])
+    finally:
+        _worker_state = None
+
+
+def _run_chunk(args):
+    func, start, end = args
+    return func(_worker_state, start, end)
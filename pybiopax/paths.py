@@ -1,16 +1,22 @@
 """This module implements finding paths in a BioPaxModel starting from a
 given object using a path constraint string."""
-__all__ = ['find_objects', 'BiopaxClassConstraintError']
+__all__ = ['find_objects', 'iter_objects', 'exists', 'count',
+           'BiopaxClassConstraintError', 'BiopaxPathPredicateError']
 
 import logging
-from typing import List
+import re
+from collections import deque
+from itertools import islice
+from typing import Iterator, List, Mapping, Optional
 from .biopax import *
 
 
 logger = logging.getLogger(__name__)
 
 
-def find_objects(start_obj: BioPaxObject, path_str: str) -> List[BioPaxObject]:
+def find_objects(start_obj: BioPaxObject, path_str: str,
+                 model: Optional[BioPaxModel] = None) \
+        -> List[BioPaxObject]:
     """Return objects matching the given path specification.
 
     Parameters
@@ -24,64 +30,288 @@ def find_objects(start_obj: BioPaxObject, path_str: str) -> List[BioPaxObject]:
         can optionally contain a class name as well, separated by : to
         constrain the class of the target of the attribute to consider.
         Optionally, each attribute can also have a * suffix to make the
-        search recursive.
+        search recursive. Finally, each part can end with one or more
+        predicates in square brackets of the form [attribute OP value]
+        which constrain the attributes of the target objects. The supported
+        operators are = (equals), != (does not equal), ^= (starts with),
+        $= (ends with) and *= (contains). Values can optionally be quoted.
+        For list-valued attributes, a predicate is satisfied if any
+        element satisfies it. For example,
+        ``xref:UnificationXref[db=UniProt]`` or
+        ``participant[display_name^='MAPK']``.
+    model :
+        The model that the start object is part of. If given, equality
+        predicates are evaluated using the model's attribute indexes (see
+        :meth:`pybiopax.biopax.BioPaxModel.get_attribute_index`) instead
+        of inspecting each candidate object.
 
     Returns
     -------
     :
         A list of BioPaxObjects satisfying the given path specification.
     """
-    # We split off the first part and separate out the rest
-    part, rest = path_str.split('/', maxsplit=1) \
-        if '/' in path_str else (path_str, None)
-
-    # Handle class constraint
-    if ':' in part:
-        attribute, class_constraint_str = part.split(':', maxsplit=1)
-        try:
-            cls = biopax_cls_map[class_constraint_str]
-        except KeyError:
-            raise BiopaxClassConstraintError(class_constraint_str) from None
-    else:
-        attribute, cls = part, None
+    return list(iter_objects(start_obj, path_str, model=model))
 
-    # Handle recursion marker
-    if attribute.endswith('*'):
-        attribute = attribute[:-1]
-        recursive = True
-    else:
-        recursive = False
 
-    # Get the attribute we are looking for
-    attr_val = getattr(start_obj, attribute, None)
-    # We turn the value into a flat list of BioPaxObjects
-    val = _get_object_list(attr_val)
+def iter_objects(start_obj: BioPaxObject, path_str: str,
+                 limit: Optional[int] = None,
+                 model: Optional[BioPaxModel] = None) \
+        -> Iterator[BioPaxObject]:
+    """Return an iterator over objects matching the given path specification.
+
+    Unlike :func:`find_objects`, results are generated depth-first as they
+    are found so the traversal only proceeds as far as the caller consumes
+    the iterator.
+
+    Parameters
+    ----------
+    start_obj :
+        The object to start the search from.
+    path_str :
+        A path specification string, see :func:`find_objects` for details.
+    limit :
+        If given, at most this many objects are generated.
+    model :
+        The model that the start object is part of, used to evaluate
+        equality predicates via attribute indexes.
+
+    Returns
+    -------
+    :
+        An iterator over BioPaxObjects satisfying the given path
+        specification, in the same order as returned by
+        :func:`find_objects`.
+    """
+    # The path is parsed eagerly so that errors in the path specification
+    # are raised here rather than on the first iteration.
+    parts = _parse_path(path_str)
+    objects = _iter_path(start_obj, parts, 0, model)
+    if limit is not None:
+        objects = islice(objects, limit)
+    return objects
+
+
+def exists(start_obj: BioPaxObject, path_str: str,
+           model: Optional[BioPaxModel] = None) -> bool:
+    """Return True if at least one object matches the path specification.
+
+    The traversal stops as soon as the first matching object is found.
+
+    Parameters
+    ----------
+    start_obj :
+        The object to start the search from.
+    path_str :
+        A path specification string, see :func:`find_objects` for details.
+    model :
+        The model that the start object is part of, used to evaluate
+        equality predicates via attribute indexes.
+
+    Returns
+    -------
+    :
+        True if there is an object satisfying the path specification,
+        False otherwise.
+    """
+    for _ in iter_objects(start_obj, path_str, limit=1, model=model):
+        return True
+    return False
+
+
+def count(start_obj: BioPaxObject, path_str: str,
+          model: Optional[BioPaxModel] = None) -> int:
+    """Return the number of objects matching the path specification.
+
+    The count is the same as the length of the list returned by
+    :func:`find_objects` but no list of results is constructed.
+
+    Parameters
+    ----------
+    start_obj :
+        The object to start the search from.
+    path_str :
+        A path specification string, see :func:`find_objects` for details.
+    model :
+        The model that the start object is part of, used to evaluate
+        equality predicates via attribute indexes.
+
+    Returns
+    -------
+    :
+        The number of objects satisfying the path specification.
+    """
+    return sum(1 for _ in iter_objects(start_obj, path_str,
+                                       model=model))
+
+
+def _parse_path(path_str):
+    """Return a list of (attribute, class, recursive, predicates) tuples
+    for each part of a path specification string."""
+    parts = []
+    for part in _split_path(path_str):
+        # Split off predicates
+        part, predicates = _parse_predicates(part)
+
+        # Handle class constraint
+        if ':' in part:
+            attribute, class_constraint_str = part.split(':', maxsplit=1)
+            try:
+                cls = biopax_cls_map[class_constraint_str]
+            except KeyError:
+                raise BiopaxClassConstraintError(class_constraint_str) \
+                    from None
+        else:
+            attribute, cls = part, None
+
+        # Handle recursion marker
+        if attribute.endswith('*'):
+            attribute = attribute[:-1]
+            recursive = True
+        else:
+            recursive = False
+        parts.append((attribute, cls, recursive, predicates))
+    return parts
+
+
+def _split_path(path_str):
+    """Split a path string at the / separators that are not inside a
+    predicate."""
+    parts = []
+    depth = 0
+    start = 0
+    quote = None
+    prev = ''
+    for idx, char in enumerate(path_str):
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in '\'"' and depth > 0 and prev == '=':
+            # Quoted predicate values can contain any character
+            quote = char
+        elif char == '[':
+            depth += 1
+        elif char == ']':
+            depth -= 1
+        elif char == '/' and depth == 0:
+            parts.append(path_str[start:idx])
+            start = idx + 1
+        if not char.isspace():
+            prev = char
+    parts.append(path_str[start:])
+    return parts
+
+
+_predicate_pattern = \
+    re.compile(r'\[\s*(\w+)\s*(=|!=|\^=|\$=|\*=)\s*'
+               r'(?:\'([^\']*)\'|"([^"]*)"|([^\]]*?))\s*\]')
+
+
+def _parse_predicates(part):
+    """Return the part without its predicates and a list of
+    (attribute, operator, value) tuples for the predicates."""
+    start = part.find('[')
+    if start == -1:
+        return part, []
+    predicates = []
+    pos = start
+    while pos < len(part):
+        match = _predicate_pattern.match(part, pos)
+        if not match:
+            # Predicates have to come last in a part, e.g., after the
+            # class constraint
+            raise BiopaxPathPredicateError(part[pos:])
+        attribute, op, single, double, plain = match.groups()
+        value = single if single is not None else \
+            double if double is not None else plain
+        predicates.append((attribute, op, value))
+        pos = match.end()
+    return part[:start], predicates
+
+
+_predicate_operators = {
+    '=': lambda val, ref: val == ref,
+    '^=': lambda val, ref: val.startswith(ref),
+    '$=': lambda val, ref: val.endswith(ref),
+    '*=': lambda val, ref: ref in val,
+}
+
+
+def _literal_values(val):
+    """Return the values of an attribute as a list of strings that
+    predicates can be evaluated on."""
+    if val is None:
+        return []
+    vals = val if isinstance(val, (list, set)) else [val]
+    return [v.uid if isinstance(v, BioPaxObject) else str(v)
+            for v in vals if v is not None]
+
+
+def _matches(obj, attribute, op, value):
+    if op == '!=':
+        return not _matches(obj, attribute, '=', value)
+    fun = _predicate_operators[op]
+    return any(fun(v, value)
+               for v in _literal_values(getattr(obj, attribute, None)))
+
+
+def _iter_path(start_obj, parts, idx, model=None):
+    attribute, cls, recursive, predicates = parts[idx]
+    # Equality predicates are pushed down to the model's indexes if
+    # available. Objects that aren't part of the model, e.g., ones reached
+    # via references to objects outside of it, aren't in the indexes so
+    # the predicates are evaluated on them directly.
+    indexed = []
+    if model is not None:
+        for pred in predicates:
+            pred_attr, op, value = pred
+            if op in {'=', '!='}:
+                bucket = model.get_attribute_index(pred_attr).get(value, ())
+                indexed.append((pred, bucket))
+        predicates = [p for p in predicates if p[1] not in {'=', '!='}]
+
+    # Get the attribute we are looking for and turn the value into a flat
+    # list of BioPaxObjects
+    val = _get_object_list(getattr(start_obj, attribute, None))
 
     # If this is a recursive part, we run a BFS to get all the downstream
     # objects that can be reached via one or more of the given type of
     # attribute links
     if recursive:
-        queue = val[:]
-        visited = val[:]
-        while queue:
-            obj = queue.pop(0)
-            obj_val = getattr(obj, attribute, None)
-            for child in _get_object_list(obj_val):
-                if child not in visited:
-                    visited.append(child)
-                    queue.append(child)
-        val = visited
-
-    # At this point, val is guaranteed to be a list of BioPaxObjects
-    results = []
+        val = _iter_reachable(val, attribute)
+
+    last = (idx == len(parts) - 1)
     for v in val:
         if cls and not isinstance(v, cls):
             continue
-        if rest:
-            results += find_objects(v, rest)
+        if indexed:
+            if model.objects.get(v.uid) is v:
+                if not all((v in bucket) == (pred[1] == '=')
+                           for pred, bucket in indexed):
+                    continue
+            elif not all(_matches(v, *pred) for pred, _ in indexed):
+                continue
+        if predicates and not all(_matches(v, *pred) for pred in predicates):
+            continue
+        if last:
+            yield v
         else:
-            results.append(v)
-    return results
+            yield from _iter_path(v, parts, idx + 1, model)
+
+
+def _iter_reachable(val, attribute):
+    """Generate objects in BFS order as they are reached from the given
+    objects via one or more links of the given attribute."""
+    visited = set(val)
+    queue = deque(val)
+    yield from val
+    while queue:
+        obj = queue.popleft()
+        obj_val = getattr(obj, attribute, None)
+        for child in _get_object_list(obj_val):
+            if child not in visited:
+                visited.add(child)
+                queue.append(child)
+                yield child
 
 
 def _get_object_list(val):
@@ -93,14 +323,31 @@ def _get_object_list(val):
         return []
 
 
-def _make_biopax_cls_map():
-    import inspect
-    from pybiopax import biopax
-    return {k: v for k, v in inspect.getmembers(biopax, inspect.isclass)
-            if issubclass(v, BioPaxObject)}
+class _BiopaxClassMap(Mapping):
+    """A read-only mapping of BioPAX class names to classes, constructed on
+    first use rather than when the module is imported."""
+    def __init__(self):
+        self._classes = None
+
+    def _get_classes(self):
+        if self._classes is None:
+            from pybiopax import biopax
+            self._classes = {k: v for k, v in vars(biopax).items()
+                             if isinstance(v, type)
+                             and issubclass(v, BioPaxObject)}
+        return self._classes
+
+    def __getitem__(self, key):
+        return self._get_classes()[key]
+
+    def __iter__(self):
+        return iter(self._get_classes())
+
+    def __len__(self):
+        return len(self._get_classes())
 
 
-biopax_cls_map = _make_biopax_cls_map()
+biopax_cls_map = _BiopaxClassMap()
 
 
 class BiopaxClassConstraintError(KeyError):
@@ -109,3 +356,11 @@ class BiopaxClassConstraintError(KeyError):
 
     def __str__(self):
         return f'{self.cls_str} is not a valid BioPAX class name.'
+
+
+class BiopaxPathPredicateError(ValueError):
+    def __init__(self, predicate_str):
+        self.predicate_str = predicate_str
+
+    def __str__(self):
+        return f'{self.predicate_str} is not a valid path predicate.'
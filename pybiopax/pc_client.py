@@ -3,7 +3,6 @@ the service, see the documentation at https://www.pathwaycommons.org/pc2/."""
 __all__ = ['graph_query']
 
 import logging
-import requests
 
 logger = logging.getLogger(__name__)
 pc2_url = 'https://www.pathwaycommons.org/pc2/'
@@ -65,6 +64,8 @@ def graph_query(kind, source, target=None, **query_params):
     for k, v in params.items():
         logger.info(' %s: %s' % (k, v))
 
+    # requests is only imported when a query is actually made
+    import requests
     res = requests.get(pc2_url + 'graph', params=params)
     if not res.status_code == 200:
         logger.error('Response is HTTP code %d.' % res.status_code)
@@ -0,0 +1,249 @@
+"""This module implements tools to find out where the memory used by BioPAX
+models goes: an estimate of the memory used by the objects of a model
+broken down by BioPAX class and by kind of storage, and a tracemalloc-based
+harness recording the memory used while loading a model phase by phase."""
+__all__ = ['MEMORY_CATEGORIES', 'memory_report', 'format_memory_report',
+           'LoadMemoryProfile', 'profile_load']
+
+import gc
+import gzip
+import logging
+import os
+import pathlib
+import sys
+import time
+import tracemalloc
+from typing import List, Mapping, Optional, Tuple, Union
+
+from lxml import etree
+
+from .biopax import BioPaxModel, BioPaxObject
+from .instrumentation import LoadInstrumentation
+
+logger = logging.getLogger(__name__)
+
+MEMORY_CATEGORIES = ['header', 'dict', 'reverse_links', 'lists', 'strings',
+                     'other']
+"""The kinds of storage memory is accounted to by :func:`memory_report`:
+the objects themselves, their attribute dicts, their reverse link sets,
+the lists holding list-valued attributes, the strings they refer to, and
+any other attribute values, such as numbers."""
+
+
+def memory_report(model: BioPaxModel) -> Mapping[str, Mapping[str, int]]:
+    """Return an estimate of the memory used by a model per BioPAX class.
+
+    Sizes are shallow sizes as reported by :func:`sys.getsizeof`. Strings
+    and other values shared between several objects (e.g., interned
+    strings or identical values deduplicated during loading) are counted
+    only once, for the first object referring to them. Other BioPAX
+    objects referred to by attributes are not counted as part of the
+    referring object.
+
+    Parameters
+    ----------
+    model :
+        A BioPAX Model.
+
+    Returns
+    -------
+    :
+        A dict keyed by BioPAX class name whose values are dicts with the
+        number of objects of the class under ``count``, the estimated
+        number of bytes used for each of :data:`MEMORY_CATEGORIES` and
+        their sum under ``total``. The memory used by the model's own dict
+        of objects is reported under the ``BioPaxModel`` key.
+    """
+    report = {}
+    seen = set()
+
+    def add_value(stats, val):
+        if isinstance(val, BioPaxObject) or id(val) in seen:
+            return
+        seen.add(id(val))
+        if isinstance(val, str):
+            stats['strings'] += sys.getsizeof(val)
+        else:
+            stats['other'] += sys.getsizeof(val)
+
+    for obj in model.objects.values():
+        stats = report.get(obj.__class__.__name__)
+        if stats is None:
+            stats = dict.fromkeys(['count'] + MEMORY_CATEGORIES, 0)
+            report[obj.__class__.__name__] = stats
+        stats['count'] += 1
+        stats['header'] += sys.getsizeof(obj)
+        stats['dict'] += sys.getsizeof(obj.__dict__)
+        for key, val in obj.__dict__.items():
+            # The model whose index holds lazy reverse links
+            if val is None or key == '_model':
+                continue
+            elif isinstance(val, set) and key.endswith('_of'):
+                stats['reverse_links'] += sys.getsizeof(val)
+            elif isinstance(val, list):
+                stats['lists'] += sys.getsizeof(val)
+                for v in val:
+                    add_value(stats, v)
+            else:
+                add_value(stats, val)
+
+    model_stats = dict.fromkeys(['count'] + MEMORY_CATEGORIES, 0)
+    model_stats['count'] = 1
+    model_stats['header'] = sys.getsizeof(model)
+    model_stats['dict'] = sys.getsizeof(model.objects)
+    report['BioPaxModel'] = model_stats
+
+    for stats in report.values():
+        stats['total'] = sum(stats[category]
+                             for category in MEMORY_CATEGORIES)
+    return dict(sorted(report.items(), key=lambda x: x[1]['total'],
+                       reverse=True))
+
+
+def format_memory_report(report: Mapping[str, Mapping[str, int]]) -> str:
+    """Return a memory report formatted as a table.
+
+    Parameters
+    ----------
+    report :
+        A memory report returned by :func:`memory_report`.
+
+    Returns
+    -------
+    :
+        A table with one row per class and a row with the totals, with
+        sizes in kilobytes.
+    """
+    columns = ['count'] + MEMORY_CATEGORIES + ['total']
+    totals = {column: sum(stats[column] for stats in report.values())
+              for column in columns}
+    width = max([len(cls) for cls in report] + [len('Total')])
+    lines = ['%-*s' % (width, 'Class') +
+             ''.join('%14s' % column for column in columns)]
+    for cls, stats in list(report.items()) + [('Total', totals)]:
+        lines.append('%-*s' % (width, cls) +
+                     '%14d' % stats['count'] +
+                     ''.join('%14.1f' % (stats[column] / 1024)
+                             for column in columns[1:]))
+    return '\n'.join(lines)
+
+
+class LoadMemoryProfile:
+    """The memory used while loading a model, phase by phase.
+
+    Attributes
+    ----------
+    phases : list of tuple
+        A list of (phase name, wall time in seconds, allocated bytes at the
+        end of the phase, peak allocated bytes during the phase, resident
+        set size at the end of the phase) tuples. Allocations are traced by
+        tracemalloc, which only sees memory allocated through Python, so
+        memory used by lxml for XML trees only shows up in the resident set
+        size. The resident set size is None on platforms other than Linux.
+        On Python versions before 3.9, peaks can't be reset between phases,
+        so the peak of a phase is the peak since the start of loading.
+    model : BioPaxModel
+        The loaded model.
+    """
+    def __init__(self, phases: List[Tuple[str, float, int, int,
+                                          Optional[int]]],
+                 model: BioPaxModel):
+        self.phases = phases
+        self.model = model
+
+    @property
+    def peak(self) -> int:
+        """The peak number of bytes allocated during loading."""
+        return max(phase[3] for phase in self.phases)
+
+    def __str__(self):
+        lines = ['%-20s%12s%14s%14s%14s' % ('Phase', 'time (s)',
+                                            'current (MB)', 'peak (MB)',
+                                            'RSS (MB)')]
+        for name, seconds, current, peak, rss in self.phases:
+            lines.append('%-20s%12.2f%14.1f%14.1f%14s' %
+                         (name, seconds, current / 2 ** 20, peak / 2 ** 20,
+                          '%.1f' % (rss / 2 ** 20) if rss else '-'))
+        return '\n'.join(lines)
+
+
+def profile_load(source: Union[str, bytes, pathlib.Path, os.PathLike]) \
+        -> LoadMemoryProfile:
+    """Load a model while tracing the memory used in each phase of loading.
+
+    The phases are reading the OWL content, parsing it into an XML tree,
+    the phases of building the model from the tree reported by
+    :meth:`pybiopax.biopax.BioPaxModel.from_xml` (see
+    :mod:`pybiopax.instrumentation`), and releasing the tree. A first
+    ``start`` phase records the baseline before loading. Tracing
+    memory allocations slows down loading considerably, so this is meant
+    for measurements rather than routine use.
+
+    Parameters
+    ----------
+    source :
+        The path to an OWL file (optionally gzipped, with a .gz extension),
+        or the OWL content as bytes.
+
+    Returns
+    -------
+    :
+        The memory profile with the loaded model.
+    """
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    phases = []
+    phase_start = [time.perf_counter()]
+
+    def end_phase(name, seconds=None):
+        current, peak = tracemalloc.get_traced_memory()
+        if seconds is None:
+            seconds = time.perf_counter() - phase_start[0]
+        phases.append((name, seconds, current, peak, _get_rss()))
+        logger.debug('Phase %s: %.1f MB allocated, %.1f MB peak'
+                     % (name, current / 2 ** 20, peak / 2 ** 20))
+        if hasattr(tracemalloc, 'reset_peak'):
+            tracemalloc.reset_peak()
+        phase_start[0] = time.perf_counter()
+
+    try:
+        gc.collect()
+        end_phase('start')
+        if isinstance(source, bytes):
+            content = source
+        else:
+            opener = gzip.open if str(source).endswith('.gz') else open
+            with opener(source, 'rb') as fh:
+                content = fh.read()
+        end_phase('read')
+        tree = etree.fromstring(content)
+        del content
+        end_phase('parse_xml')
+        model = BioPaxModel.from_xml(tree,
+                                     instrumentation=_PhaseHook(end_phase))
+        del tree
+        gc.collect()
+        end_phase('release_xml')
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+    return LoadMemoryProfile(phases, model)
+
+
+class _PhaseHook(LoadInstrumentation):
+    """Records memory at the end of each phase of building a model."""
+    def __init__(self, end_phase):
+        self.end_phase = end_phase
+
+    def phase_finished(self, phase, wall_time, cpu_time):
+        self.end_phase(phase, wall_time)
+
+
+def _get_rss() -> Optional[int]:
+    """Return the resident set size of the process in bytes, if available."""
+    try:
+        with open('/proc/self/statm') as fh:
+            return int(fh.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
@@ -1,9 +1,196 @@
+"""This module implements functions to summarize and normalize the database
+references (xrefs) used in BioPAX models."""
+__all__ = ['XrefNormalizer', 'get_default_normalizer', 'get_prefix_id_pairs',
+           'get_all_prefixes', 'get_prefix_statistics']
+
+import csv
+import gzip
+import logging
+import os
+import pathlib
 from collections import Counter
-from typing import List, Mapping, Set, Tuple
+from typing import (Callable, Iterable, List, Mapping, Optional, Set, Tuple,
+                    Union)
 from .biopax import BioPaxModel, Xref
 
+logger = logging.getLogger(__name__)
+
+
+class XrefNormalizer:
+    """Normalizes the database prefixes of xrefs and maps UniProt IDs to
+    HGNC IDs with memoization.
+
+    Raw database names in BioPAX models (e.g., "UniProt Knowledgebase",
+    "uniprot", "UniProt") repeat many times within and across models, so
+    each distinct raw name is normalized only once and the result is kept
+    in a table. UniProt to HGNC mappings are held in a dict, loaded once
+    from a local mapping file (see :meth:`from_mapping_file`) or from
+    protmapper (see :meth:`from_protmapper`).
+
+    Parameters
+    ----------
+    prefix_normalizer :
+        A function taking a raw database name and returning a normalized
+        prefix or None if it can't be normalized. By default,
+        bioregistry.normalize_prefix is used if bioregistry is installed,
+        otherwise raw names are lowercased with spaces replaced by
+        underscores.
+    uniprot_hgnc :
+        A dict from UniProt IDs to HGNC IDs.
+    """
+    def __init__(self,
+                 prefix_normalizer: Optional[Callable[[str],
+                                                      Optional[str]]] = None,
+                 uniprot_hgnc: Optional[Mapping[str, str]] = None):
+        if prefix_normalizer is None:
+            prefix_normalizer = _get_default_prefix_normalizer()
+        self.prefix_normalizer = prefix_normalizer
+        self.uniprot_hgnc = dict(uniprot_hgnc) if uniprot_hgnc else {}
+        self._prefixes = {}
+
+    @classmethod
+    def from_mapping_file(cls, fname: Union[str, pathlib.Path, os.PathLike],
+                          prefix_normalizer=None) -> "XrefNormalizer":
+        """Return a normalizer with UniProt to HGNC mappings from a file.
+
+        Parameters
+        ----------
+        fname :
+            The path to a tab separated (optionally gzipped) file with
+            UniProt IDs in the first column and HGNC IDs in the second
+            column. Empty lines and lines starting with # are skipped.
+        prefix_normalizer :
+            A function to normalize database names, see
+            :class:`XrefNormalizer`.
+
+        Returns
+        -------
+        :
+            An XrefNormalizer.
+        """
+        opener = gzip.open if str(fname).endswith('.gz') else open
+        uniprot_hgnc = {}
+        with opener(fname, 'rt', encoding='utf-8') as fh:
+            for row in csv.reader(fh, delimiter='\t'):
+                if not row or row[0].startswith('#') or len(row) < 2:
+                    continue
+                uniprot_hgnc[row[0]] = row[1]
+        logger.info('Loaded %d UniProt to HGNC mappings from %s'
+                    % (len(uniprot_hgnc), fname))
+        return cls(prefix_normalizer=prefix_normalizer,
+                   uniprot_hgnc=uniprot_hgnc)
+
+    @classmethod
+    def from_protmapper(cls, prefix_normalizer=None) -> "XrefNormalizer":
+        """Return a normalizer with UniProt to HGNC mappings from protmapper.
+
+        This requires protmapper to be installed, and protmapper may
+        download its resource files on first use.
+        """
+        from protmapper.uniprot_client import um
+        return cls(prefix_normalizer=prefix_normalizer,
+                   uniprot_hgnc=um.uniprot_hgnc)
+
+    def normalize_prefix(self, db: Optional[str]) -> Optional[str]:
+        """Return the normalized prefix for a raw database name.
+
+        Parameters
+        ----------
+        db :
+            A raw database name as used in an xref.
+
+        Returns
+        -------
+        :
+            The normalized prefix, or None if it can't be normalized.
+        """
+        try:
+            return self._prefixes[db]
+        except KeyError:
+            prefix = self.prefix_normalizer(db) if db else None
+            self._prefixes[db] = prefix
+            return prefix
+
+    def normalize_xref(self, xref: Xref) -> Tuple[Optional[str],
+                                                  Optional[str]]:
+        """Return the normalized prefix and the identifier of an xref."""
+        return self.normalize_prefix(xref.db), xref.id
+
+    def map_uniprot_to_hgnc(self, uniprot_ids: Iterable[str]) \
+            -> Mapping[str, Optional[str]]:
+        """Return HGNC IDs for a batch of UniProt IDs.
+
+        UniProt isoform IDs (e.g., P04637-2) are mapped through their
+        canonical UniProt ID if they don't have a mapping of their own.
+
+        Parameters
+        ----------
+        uniprot_ids :
+            UniProt IDs or UniProt isoform IDs.
+
+        Returns
+        -------
+        :
+            A dict from the given IDs to HGNC IDs, or None if there is
+            no mapping.
+        """
+        return {uniprot_id: self._get_uniprot_hgnc(uniprot_id)
+                for uniprot_id in uniprot_ids}
+
+    def get_hgnc_id(self, xrefs: Iterable[Xref]) -> Optional[str]:
+        """Return the HGNC ID given by a list of xrefs, if available.
+
+        An HGNC xref is used if present, otherwise UniProt and then UniProt
+        isoform xrefs are mapped to HGNC.
+        """
+        ids = {}
+        for xref in xrefs:
+            if isinstance(xref, Xref) and xref.id:
+                ids.setdefault(self.normalize_prefix(xref.db), xref.id)
+        if 'hgnc' in ids:
+            return ids['hgnc']
+        for prefix in ('uniprot', 'uniprot.isoform'):
+            if prefix in ids:
+                hgnc_id = self._get_uniprot_hgnc(ids[prefix])
+                if hgnc_id:
+                    return hgnc_id
+        return None
+
+    def _get_uniprot_hgnc(self, uniprot_id):
+        hgnc_id = self.uniprot_hgnc.get(uniprot_id)
+        if hgnc_id is None and '-' in uniprot_id:
+            hgnc_id = self.uniprot_hgnc.get(uniprot_id.split('-')[0])
+        return hgnc_id
+
+
+_default_normalizer = None
+
+
+def get_default_normalizer() -> XrefNormalizer:
+    """Return the shared XrefNormalizer with the default prefix normalizer
+    and no UniProt to HGNC mappings."""
+    global _default_normalizer
+    if _default_normalizer is None:
+        _default_normalizer = XrefNormalizer()
+    return _default_normalizer
+
+
+def _get_default_prefix_normalizer():
+    try:
+        import bioregistry
+        return bioregistry.normalize_prefix
+    except ImportError:
+        logger.debug('Could not import bioregistry, normalizing prefixes '
+                     'by lowercasing.')
+        return _normalize_prefix_simple
+
+
+def _normalize_prefix_simple(db):
+    return db.strip().lower().replace(' ', '_')
+
 
-def get_prefix_id_pairs(model: BioPaxModel) -> List[Tuple[str, str]]:
+def get_prefix_id_pairs(model: BioPaxModel, normalize: bool = False) \
+        -> List[Tuple[str, str]]:
     """Return a list of database/identifier pairs used in the references of
     a BioPAX Model.
 
@@ -11,33 +198,41 @@ def get_prefix_id_pairs(model: BioPaxModel) -> List[Tuple[str, str]]:
     ----------
     model :
         A BioPAX Model.
+    normalize :
+        If True, database names are normalized to prefixes with
+        :meth:`pybiopax.biopax.BioPaxModel.normalized_xrefs`. Default: False
 
     Returns
     -------
     :
         A list of database/identifier pairs used in the model.
     """
+    if normalize:
+        return list(model.normalized_xrefs().values())
     refs = list(model.get_objects_by_type(Xref))
     return [(ref.db, ref.id) for ref in refs]
 
 
-def get_all_prefixes(model: BioPaxModel) -> Set[str]:
+def get_all_prefixes(model: BioPaxModel, normalize: bool = False) -> Set[str]:
     """Return a set of all prefixes used in the references of a BioPAX Model.
 
     Parameters
     ----------
     model :
         A BioPAX Model.
+    normalize :
+        If True, database names are normalized to prefixes. Default: False
 
     Returns
     -------
     :
         A set of all prefixes used in the model.
     """
-    return {db for db, identifier in get_prefix_id_pairs(model)}
+    return {db for db, identifier in get_prefix_id_pairs(model, normalize)}
 
 
-def get_prefix_statistics(model: BioPaxModel) -> Mapping[str, int]:
+def get_prefix_statistics(model: BioPaxModel, normalize: bool = False) \
+        -> Mapping[str, int]:
     """Return a dict of prefixes and the number of times they are used in
      references in a BioPAX Model.
 
@@ -45,6 +240,10 @@ def get_prefix_statistics(model: BioPaxModel) -> Mapping[str, int]:
     ----------
     model :
         A BioPAX Model.
+    normalize :
+        If True, database names are normalized to prefixes so that
+        different spellings of the same database are counted together.
+        Default: False
 
     Returns
     -------
@@ -53,6 +252,7 @@ def get_prefix_statistics(model: BioPaxModel) -> Mapping[str, int]:
         in references in the model.
      """
     return dict(Counter([db for db, identifier
-                         in get_prefix_id_pairs(model)]).most_common())
+                         in get_prefix_id_pairs(model, normalize)])
+                .most_common())
 
 
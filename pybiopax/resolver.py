@@ -0,0 +1,391 @@
+"""This module implements resolving references to objects defined outside
+of the content a model is loaded from, for BioPAX corpora split across
+several files, e.g., pathway files referring to small molecule references
+and xrefs shared by all pathways.
+
+A :class:`ReferenceResolver` maps URI prefixes to other OWL files or to
+already loaded models (snapshots) and is passed to the loading functions,
+e.g., :func:`pybiopax.model_from_owl_file`. References that can't be
+resolved within the loaded content are looked up by prefix in the resolver
+instead of being kept as uid strings.
+
+References to objects in OWL files are resolved to lazy proxies. These
+are instances of (subclasses of) the class of the referenced object, so
+type checks work as usual, but their attributes are only loaded from the
+file when first accessed. Loading an object only parses its own element,
+found through an index of element offsets built by scanning the file
+once, and references of the loaded object are resolved to lazy proxies in
+turn. Each uid is resolved to a single object per resolver, so models
+loaded with the same resolver share the objects they refer to.
+
+Proxies are not part of the models referring to them, and no reverse links
+are added to them, also once they are loaded. The same holds for objects
+of loaded models resolved to. Code that reads attributes from an object's
+``__dict__`` directly, rather than through attribute access, sees a proxy
+as having no attributes until it is loaded, see :func:`load_proxy`.
+"""
+__all__ = ['ReferenceResolver', 'OwlElementIndex', 'is_proxy', 'load_proxy',
+           'make_proxy']
+
+import gzip
+import logging
+import os
+import pathlib
+from functools import partial
+from typing import Callable, Mapping, Optional, Union
+from xml.parsers.expat import ExpatError, ParserCreate
+
+from .biopax import BioPaxModel, BioPaxObject
+from .biopax import model as biopax_model
+from .biopax.base import Unresolved, parse_element
+from .xml_util import namespaces
+
+logger = logging.getLogger(__name__)
+
+
+class OwlElementIndex:
+    """An index of the byte offsets of the elements of an OWL file.
+
+    The file is scanned once with an incremental XML parser when the index
+    is created, recording the byte offsets at which each top-level element
+    starts and ends. Objects are then loaded by parsing only their own
+    element. Gzipped files (with a .gz extension) are supported, but
+    loading elements from them is slower since seeking in a gzipped file
+    decompresses it up to the element.
+
+    Parameters
+    ----------
+    fname :
+        The path to the OWL file.
+
+    Attributes
+    ----------
+    offsets : dict
+        A dict from the uids of top-level elements to their (class name,
+        start, end) byte offsets. Elements with an ``rdf:ID`` are indexed
+        both by their ID and by their URI with the xml:base of the file.
+    xml_base : str
+        The xml:base of the file.
+    """
+    def __init__(self, fname: Union[str, pathlib.Path, os.PathLike]):
+        self.fname = fname
+        self.offsets = {}
+        self.xml_base = None
+        # The content before the root element (e.g., entity declarations)
+        # and the root start and end tags, which elements are wrapped in
+        # when they are parsed
+        self._prolog = None
+        self._root_start = None
+        self._root_end = None
+        self._build()
+
+    def _open(self):
+        opener = gzip.open if str(self.fname).endswith('.gz') else open
+        return opener(self.fname, 'rb')
+
+    def _build(self):
+        parser = ParserCreate(namespace_separator=' ')
+        bp_prefix = namespaces['bp'] + ' '
+        rdf_about = namespaces['rdf'] + ' about'
+        rdf_id = namespaces['rdf'] + ' ID'
+        class_names = {}
+        depth = 0
+        root = None
+        current = None
+        # The root tag and top-level elements end where the next parser
+        # event (including character data) starts
+        pending = None
+
+        def complete_pending():
+            nonlocal pending
+            offset = parser.CurrentByteIndex
+            item = pending
+            pending = None
+            parser.CharacterDataHandler = None
+            if item is root:
+                root.append(offset)
+                return
+            cls_name, uid, is_id, start = item
+            self.offsets[uid] = (cls_name, start, offset)
+            if is_id:
+                self.offsets[self.xml_base + uid] = (cls_name, start, offset)
+
+        def set_pending(item):
+            nonlocal pending
+            pending = item
+            parser.CharacterDataHandler = on_event
+
+        def on_start(name, attrs):
+            nonlocal depth, root, current
+            if pending is not None:
+                complete_pending()
+            depth += 1
+            if depth == 1:
+                self.xml_base = attrs.get(
+                    'http://www.w3.org/XML/1998/namespace base', '')
+                root = [name, parser.CurrentByteIndex]
+                set_pending(root)
+            elif depth == 2 and name.startswith(bp_prefix):
+                uid = attrs.get(rdf_about)
+                is_id = uid is None
+                if is_id:
+                    uid = attrs.get(rdf_id)
+                if uid is not None:
+                    cls_name = name.split(' ')[1]
+                    current = (class_names.setdefault(cls_name, cls_name),
+                               uid, is_id, parser.CurrentByteIndex)
+
+        def on_end(name):
+            nonlocal depth, current
+            if pending is not None:
+                complete_pending()
+            depth -= 1
+            if depth == 1 and current is not None:
+                set_pending(current)
+                current = None
+
+        def on_event(*args):
+            if pending is not None:
+                complete_pending()
+
+        parser.StartElementHandler = on_start
+        parser.EndElementHandler = on_end
+        parser.CommentHandler = on_event
+        parser.ProcessingInstructionHandler = on_event
+        try:
+            with self._open() as fh:
+                parser.ParseFile(fh)
+        except ExpatError as e:
+            raise ValueError('Could not parse %s: %s' % (self.fname, e)) \
+                from None
+        if root is None or root[0] != namespaces['rdf'] + ' RDF':
+            raise ValueError('%s is not an RDF/XML file' % self.fname)
+
+        _, root_start, root_end = root
+        with self._open() as fh:
+            self._prolog = fh.read(root_start)
+            self._root_start = fh.read(root_end - root_start)
+        # The tag is the qualified name at the start of the root start tag
+        tag = self._root_start[1:].split(None, 1)[0].rstrip(b'/>')
+        self._root_end = b'</%s>' % tag
+
+    def __contains__(self, uid):
+        return uid in self.offsets
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def get_element(self, uid: str):
+        """Return the parsed element of an object.
+
+        Parameters
+        ----------
+        uid :
+            The uid of the object.
+
+        Returns
+        -------
+        lxml.etree._Element
+            The element defining the object.
+        """
+        from lxml import etree
+        _, start, end = self.offsets[uid]
+        with self._open() as fh:
+            fh.seek(start)
+            content = fh.read(end - start)
+        tree = etree.fromstring(self._prolog + self._root_start + content +
+                                self._root_end)
+        return tree[0]
+
+
+class ReferenceResolver:
+    """A registry of sources to resolve references to objects from.
+
+    Parameters
+    ----------
+    sources :
+        A dict from URI prefixes to sources, see :meth:`add_source`.
+    """
+    def __init__(self, sources: Optional[Mapping[str, Union[
+            str, pathlib.Path, os.PathLike, BioPaxModel]]] = None):
+        self._sources = []
+        # The objects and proxies uids were resolved to, so that each uid
+        # is resolved to one object
+        self._resolved = {}
+        for prefix, source in (sources or {}).items():
+            self.add_source(prefix, source)
+
+    def add_source(self, prefix: str,
+                   source: Union[str, pathlib.Path, os.PathLike,
+                                 BioPaxModel, OwlElementIndex]):
+        """Register a source of objects for uids starting with a prefix.
+
+        Sources are tried in order of decreasing prefix length.
+
+        Parameters
+        ----------
+        prefix :
+            A URI prefix, e.g., the xml:base of the source. The empty
+            string matches all uids.
+        source :
+            The path to an OWL file (or an index of one), whose objects are
+            loaded lazily, or a loaded model whose objects are used
+            directly.
+        """
+        if not isinstance(source, (BioPaxModel, OwlElementIndex)):
+            source = OwlElementIndex(source)
+            logger.info('Indexed %d elements in %s'
+                        % (len(source), source.fname))
+        self._sources.append((prefix, source))
+        self._sources.sort(key=lambda x: len(x[0]), reverse=True)
+
+    def resolve(self, uid: str) -> Optional[BioPaxObject]:
+        """Return the object with a given uid from the registered sources.
+
+        Parameters
+        ----------
+        uid :
+            The uid of the object.
+
+        Returns
+        -------
+        :
+            The object, a lazy proxy of it, or None if no source defines it.
+        """
+        # References with no resource, e.g., literals of unsupported data
+        # types, are unresolved with no uid
+        if uid is None:
+            return None
+        obj = self._resolved.get(uid)
+        if obj is not None:
+            return obj
+        for prefix, source in self._sources:
+            if not uid.startswith(prefix):
+                continue
+            if isinstance(source, BioPaxModel):
+                obj = source.objects.get(uid)
+                # Objects defined with an rdf:ID have their ID as uid
+                if obj is None and source.xml_base and \
+                        uid.startswith(source.xml_base):
+                    obj = source.objects.get(uid[len(source.xml_base):])
+            elif uid in source:
+                obj = make_proxy(source.offsets[uid][0], uid,
+                                 partial(self._load, source=source))
+            if obj is not None:
+                self._resolved[uid] = obj
+                return obj
+        return None
+
+    def _load(self, proxy, source):
+        """Return the object loaded from the element of a proxy."""
+        element = source.get_element(proxy.uid)
+        obj_cls = getattr(biopax_model, _local_name(element.tag))
+        obj, sub_objs = parse_element(element, cls=obj_cls)
+        objects = {sub_obj.uid: sub_obj for sub_obj in sub_objs}
+        # References of the object to itself refer to the proxy, which
+        # becomes the loaded object
+        objects[proxy.uid] = proxy
+        for sub_obj in sub_objs + [obj]:
+            for key, val in list(sub_obj.__dict__.items()):
+                sub_obj.__dict__[key] = self._resolve_value(objects, val)
+        return obj
+
+    def _resolve_value(self, objects, val):
+        if isinstance(val, Unresolved):
+            if val.obj_id in objects:
+                return objects[val.obj_id]
+            obj = self.resolve(val.obj_id)
+            return obj if obj is not None else val.obj_id
+        elif isinstance(val, list):
+            return [self._resolve_value(objects, v) for v in val]
+        return val
+
+
+def is_proxy(obj: BioPaxObject) -> bool:
+    """Return True if an object is a lazy proxy that wasn't loaded yet."""
+    return isinstance(obj, _LazyObject)
+
+
+def load_proxy(obj: BioPaxObject) -> BioPaxObject:
+    """Load a lazy proxy, if the object is one that wasn't loaded yet.
+
+    Parameters
+    ----------
+    obj :
+        A BioPAX object.
+
+    Returns
+    -------
+    :
+        The object, which is loaded in place.
+    """
+    if isinstance(obj, _LazyObject):
+        obj._load()
+    return obj
+
+
+class _LazyObject:
+    """A mixin turning a BioPAX class into a lazy proxy class."""
+    def __getattr__(self, name):
+        # This is only called for attributes missing from the proxy, which
+        # only has its uid until it is loaded
+        loader = self.__dict__.get('_lazy_loader')
+        if loader is None or name.startswith('__'):
+            raise AttributeError(name)
+        self._load()
+        return getattr(self, name)
+
+    def _load(self):
+        obj = self.__dict__['_lazy_loader'](self)
+        del self.__dict__['_lazy_loader']
+        # The proxy becomes the loaded object so that references to it
+        # don't need to be updated
+        self.__class__ = obj.__class__
+        self.__dict__.update(obj.__dict__)
+
+    def __reduce_ex__(self, protocol):
+        # Proxies are pickled as the objects they load, since the proxy
+        # classes are created dynamically
+        self._load()
+        return self.__reduce_ex__(protocol)
+
+    def __repr__(self):
+        return '<Lazy %s %s>' % (self.__class__.__mro__[2].__name__,
+                                 self.uid)
+
+
+_lazy_classes = {}
+
+
+def make_proxy(cls_name: str, uid: str,
+               loader: Callable[[BioPaxObject], BioPaxObject]) \
+        -> BioPaxObject:
+    """Return a lazy proxy of an object of a given class.
+
+    Parameters
+    ----------
+    cls_name :
+        The name of the BioPAX class of the object.
+    uid :
+        The uid of the object.
+    loader :
+        A function taking the proxy and returning the loaded object, called
+        when an attribute of the proxy is first accessed.
+
+    Returns
+    -------
+    :
+        The proxy, an instance of a subclass of the BioPAX class.
+    """
+    lazy_cls = _lazy_classes.get(cls_name)
+    if lazy_cls is None:
+        cls = getattr(biopax_model, cls_name)
+        lazy_cls = type('Lazy%s' % cls_name, (_LazyObject, cls), {})
+        _lazy_classes[cls_name] = lazy_cls
+    proxy = lazy_cls.__new__(lazy_cls)
+    proxy.__dict__.update({'uid': uid, '_lazy_loader': loader})
+    return proxy
+
+
+def _local_name(tag):
+    return tag.rsplit('}', 1)[-1]
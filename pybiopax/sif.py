@@ -0,0 +1,263 @@
+"""This module implements extracting binary relations in the simple
+interaction format (SIF) from a BioPaxModel, similar to the SIF conversion
+implemented in PaxTools.
+
+Each SIF relation links two entity references, and is derived by one of the
+following rules:
+
+- controls-state-change-of: the (non small molecule) controller of a
+  Conversion changes the state of a (non small molecule) entity that appears
+  on both of its sides.
+- controls-transport-of: like the above, if the Conversion is a Transport.
+- controls-expression-of: the controller of a TemplateReaction controls the
+  expression of its products.
+- controls-production-of: the controller of a Conversion controls the
+  production of a small molecule only appearing on its right side.
+- consumption-controlled-by: a small molecule only appearing on the left side
+  of a Conversion is consumed by it, controlled by the controller.
+- chemical-affects: a small molecule controller of a Conversion affects an
+  entity changing its state in it. This replaces the controls-state-change-of
+  and controls-transport-of relations for small molecule controllers.
+- used-to-produce: a small molecule on the left side of a Conversion is used
+  to produce a small molecule on its right side.
+- in-complex-with: two entities are components of the same Complex.
+- interacts-with: two entities are participants of the same
+  MolecularInteraction.
+"""
+__all__ = ['SIF_RELATIONS', 'UNDIRECTED_SIF_RELATIONS', 'iter_sif_edges',
+           'get_sif_edges', 'model_to_sif_file']
+
+import logging
+import os
+import pathlib
+from typing import Collection, Iterator, List, Optional, Tuple, Union
+
+from .biopax import *
+from .parallel import map_chunks
+
+logger = logging.getLogger(__name__)
+
+SIF_RELATIONS = ['controls-state-change-of', 'controls-transport-of',
+                 'controls-expression-of', 'controls-production-of',
+                 'consumption-controlled-by', 'chemical-affects',
+                 'used-to-produce', 'in-complex-with', 'interacts-with']
+"""The names of the SIF relations that can be extracted."""
+
+UNDIRECTED_SIF_RELATIONS = {'in-complex-with', 'interacts-with'}
+"""The SIF relations that are undirected. Edges of these relations are
+generated once per pair with the source preceding the target."""
+
+
+def iter_sif_edges(model: BioPaxModel,
+                   relations: Optional[Collection[str]] = None,
+                   n_jobs: Optional[int] = 1,
+                   chunk_size: int = 10000) -> Iterator[Tuple[str, str, str]]:
+    """Generate SIF edges extracted from a BioPaxModel.
+
+    Parameters
+    ----------
+    model :
+        A BioPAX Model.
+    relations :
+        The SIF relations to extract, a subset of :data:`SIF_RELATIONS`. By
+        default, all relations are extracted.
+    n_jobs :
+        The number of worker processes to run the extraction rules in. If
+        None, the number of CPUs is used.
+    chunk_size :
+        The number of interactions processed by a worker in one chunk.
+
+    Returns
+    -------
+    :
+        An iterator over unique (source, relation, target) tuples where
+        source and target are uids of EntityReferences. Since the same edge
+        can be derived from several interactions, the edges generated so
+        far are kept in a set to skip duplicates, so memory use grows with
+        the number of unique edges.
+    """
+    relations = set(relations) if relations is not None \
+        else set(SIF_RELATIONS)
+    unknown = relations - set(SIF_RELATIONS)
+    if unknown:
+        raise ValueError('Unknown SIF relations: %s' %
+                         ', '.join(sorted(unknown)))
+    interactions = [obj for obj in model.objects.values()
+                    if isinstance(obj, (Control, Complex,
+                                        MolecularInteraction, Conversion))]
+    # We resolve leaf entity references for all physical entities up front
+    # so that worker processes share the index rather than each
+    # recomputing it
+    er_index = _get_entity_reference_index(model)
+    state = (interactions, er_index, relations)
+    seen = set()
+    for edges in map_chunks(_get_chunk_edges, state, len(interactions),
+                            n_jobs=n_jobs, chunk_size=chunk_size):
+        for edge in edges:
+            if edge not in seen:
+                seen.add(edge)
+                yield edge
+
+
+def get_sif_edges(model: BioPaxModel,
+                  relations: Optional[Collection[str]] = None,
+                  n_jobs: Optional[int] = 1) -> List[Tuple[str, str, str]]:
+    """Return SIF edges extracted from a BioPaxModel.
+
+    Parameters
+    ----------
+    model :
+        A BioPAX Model.
+    relations :
+        The SIF relations to extract. By default, all relations are
+        extracted.
+    n_jobs :
+        The number of worker processes to run the extraction rules in.
+
+    Returns
+    -------
+    :
+        A list of unique (source, relation, target) tuples where source and
+        target are uids of EntityReferences.
+    """
+    return list(iter_sif_edges(model, relations=relations, n_jobs=n_jobs))
+
+
+def model_to_sif_file(model: BioPaxModel,
+                      fname: Union[str, pathlib.Path, os.PathLike],
+                      relations: Optional[Collection[str]] = None,
+                      n_jobs: Optional[int] = 1,
+                      use_names: bool = False):
+    """Write SIF edges extracted from a BioPaxModel into a TSV file.
+
+    Edges are written as they are extracted rather than collected into a
+    list first, but the set of unique edges written so far is kept in
+    memory, see :func:`iter_sif_edges`.
+
+    Parameters
+    ----------
+    model :
+        A BioPAX Model.
+    fname :
+        The path to the target SIF file.
+    relations :
+        The SIF relations to extract. By default, all relations are
+        extracted.
+    n_jobs :
+        The number of worker processes to run the extraction rules in.
+    use_names :
+        If True, entity references are represented by their display name
+        (or standard name) instead of their uid, if available.
+    """
+    with open(fname, 'w') as fh:
+        for source, relation, target in \
+                iter_sif_edges(model, relations=relations, n_jobs=n_jobs):
+            if use_names:
+                source = _get_label(model, source)
+                target = _get_label(model, target)
+            fh.write('%s\t%s\t%s\n' % (source, relation, target))
+
+
+def _get_label(model, uid):
+    er = model.objects.get(uid)
+    if er is None:
+        return uid
+    return er.display_name or er.standard_name or uid
+
+
+def _get_entity_reference_index(model):
+    """Return a dict mapping the uids of physical entities to the
+    (uid, is small molecule) pairs of their leaf entity references."""
+    return {uid: frozenset((er.uid, isinstance(er, SmallMoleculeReference))
+                           for er in ers)
+            for uid, ers in model.get_leaf_entity_references().items()}
+
+
+def _get_chunk_edges(state, start, end):
+    interactions, er_index, relations = state
+    edges = []
+    for interaction in interactions[start:end]:
+        if isinstance(interaction, Control):
+            edges += _get_control_edges(interaction, er_index, relations)
+        elif isinstance(interaction, Complex):
+            if 'in-complex-with' in relations:
+                edges += _get_pair_edges(er_index.get(interaction.uid, ()),
+                                         'in-complex-with')
+        elif isinstance(interaction, MolecularInteraction):
+            if 'interacts-with' in relations:
+                ers = set()
+                for participant in interaction.participant:
+                    if isinstance(participant, BioPaxObject):
+                        ers |= er_index.get(participant.uid, set())
+                edges += _get_pair_edges(ers, 'interacts-with')
+        elif isinstance(interaction, Conversion):
+            if 'used-to-produce' in relations:
+                left, right = _get_sides(interaction, er_index)
+                edges += [(source, 'used-to-produce', target)
+                          for source, is_sm in left if is_sm
+                          for target, is_tgt_sm in right if is_tgt_sm
+                          and (target, True) not in left
+                          and source != target]
+    return edges
+
+
+def _get_pair_edges(ers, relation):
+    uids = sorted({uid for uid, is_sm in ers if not is_sm})
+    return [(source, relation, target)
+            for idx, source in enumerate(uids)
+            for target in uids[idx + 1:]]
+
+
+def _get_sides(conversion, er_index):
+    left = set()
+    for entity in conversion.left:
+        if isinstance(entity, BioPaxObject):
+            left |= er_index.get(entity.uid, set())
+    right = set()
+    for entity in conversion.right:
+        if isinstance(entity, BioPaxObject):
+            right |= er_index.get(entity.uid, set())
+    return left, right
+
+
+def _get_control_edges(control, er_index, relations):
+    controllers = set()
+    for controller in control.controller:
+        if isinstance(controller, PhysicalEntity):
+            controllers |= er_index.get(controller.uid, set())
+    if not controllers:
+        return []
+    controlled = control.get_controlled_process()
+    edges = []
+    if isinstance(controlled, TemplateReaction):
+        if 'controls-expression-of' in relations:
+            products = set()
+            for product in controlled.product:
+                if isinstance(product, BioPaxObject):
+                    products |= er_index.get(product.uid, set())
+            edges += [(source, 'controls-expression-of', target)
+                      for source, _ in controllers
+                      for target, is_sm in products if not is_sm]
+    elif isinstance(controlled, Conversion):
+        left, right = _get_sides(controlled, er_index)
+        changed = {uid for uid, is_sm in left & right if not is_sm}
+        relation = 'controls-transport-of' \
+            if isinstance(controlled, Transport) \
+            else 'controls-state-change-of'
+        for source, is_sm in controllers:
+            if is_sm:
+                if 'chemical-affects' in relations:
+                    edges += [(source, 'chemical-affects', target)
+                              for target in changed]
+            elif relation in relations:
+                edges += [(source, relation, target) for target in changed
+                          if target != source]
+        if 'controls-production-of' in relations:
+            edges += [(source, 'controls-production-of', target)
+                      for source, _ in controllers
+                      for target, is_sm in right - left if is_sm]
+        if 'consumption-controlled-by' in relations:
+            edges += [(target, 'consumption-controlled-by', source)
+                      for source, _ in controllers
+                      for target, is_sm in left - right if is_sm]
+    return edges
@@ -0,0 +1,459 @@
+"""This module implements a persistent store of BioPAX objects in an SQLite
+database, for applications that only need to look up a few objects at a
+time (e.g., by uid, class, xref or name) without holding a whole model in
+memory.
+
+Objects are stored in normalized tables, with one row per attribute value,
+and indexes on uids, classes, the (db, id) pairs of xrefs and names.
+Objects are instantiated on demand when looked up, and the objects they
+refer to are returned as lazy proxies (see :mod:`pybiopax.resolver`) which
+are loaded from the store when their attributes are first accessed. A
+bounded cache of recently returned objects keeps repeated lookups cheap;
+lookups of objects that were evicted from the cache return new instances.
+
+Literal values are stored, and returned, as strings, like the values of
+models loaded from OWL. Reverse links (e.g., ``xref_of``) are not set on
+objects returned by the store, references to an object can be looked up
+with :meth:`SqliteBioPaxStore.get_referring_uids` instead.
+"""
+__all__ = ['SqliteBioPaxStore']
+
+import gzip
+import logging
+import os
+import pathlib
+import sqlite3
+from collections import OrderedDict
+from functools import partial
+from typing import Iterable, Iterator, List, Optional, Union
+
+from .biopax import BioPaxModel, BioPaxObject, Named, Xref
+from .biopax import model as biopax_model
+from .biopax.base import Unresolved, get_attribute_keys, parse_element
+from .resolver import make_proxy
+from .xml_util import get_id_or_about, get_tag, has_ns
+
+logger = logging.getLogger(__name__)
+
+_schema = """
+CREATE TABLE IF NOT EXISTS objects (
+    uid TEXT PRIMARY KEY,
+    class TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS attributes (
+    uid TEXT NOT NULL,
+    attr TEXT NOT NULL,
+    pos INTEGER NOT NULL,
+    value TEXT NOT NULL,
+    is_ref INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS xrefs (
+    uid TEXT PRIMARY KEY,
+    db TEXT,
+    id TEXT
+);
+CREATE TABLE IF NOT EXISTS names (
+    uid TEXT NOT NULL,
+    name TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS metadata (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE INDEX IF NOT EXISTS objects_class ON objects (class);
+CREATE INDEX IF NOT EXISTS attributes_uid ON attributes (uid);
+CREATE INDEX IF NOT EXISTS attributes_ref ON attributes (value, attr)
+    WHERE is_ref = 1;
+CREATE INDEX IF NOT EXISTS xrefs_db_id ON xrefs (db COLLATE NOCASE, id);
+CREATE INDEX IF NOT EXISTS names_uid ON names (uid);
+CREATE INDEX IF NOT EXISTS names_name ON names (name COLLATE NOCASE);
+"""
+
+
+class SqliteBioPaxStore:
+    """A persistent store of BioPAX objects in an SQLite database.
+
+    Parameters
+    ----------
+    path :
+        The path to the database file, created if it doesn't exist. Opening
+        an existing store doesn't read its contents.
+    cache_size :
+        The maximum number of recently looked up objects to keep in memory.
+        Default: 1024
+
+    Attributes
+    ----------
+    connection : sqlite3.Connection
+        The connection to the database.
+    """
+    def __init__(self, path: Union[str, pathlib.Path, os.PathLike],
+                 cache_size: int = 1024):
+        self.path = path
+        self.cache_size = cache_size
+        self.connection = sqlite3.connect(str(path))
+        self.connection.executescript(_schema)
+        self._cache = OrderedDict()
+
+    @classmethod
+    def from_model(cls, model: BioPaxModel,
+                   path: Union[str, pathlib.Path, os.PathLike],
+                   **kwargs) -> 'SqliteBioPaxStore':
+        """Return a store with the objects of a model.
+
+        Parameters
+        ----------
+        model :
+            A BioPAX Model.
+        path :
+            The path to the database file.
+        kwargs :
+            Other arguments to :class:`SqliteBioPaxStore`.
+
+        Returns
+        -------
+        :
+            The store.
+        """
+        store = cls(path, **kwargs)
+        store.add_model(model)
+        return store
+
+    @classmethod
+    def from_owl_file(cls, fname: Union[str, pathlib.Path, os.PathLike],
+                      path: Union[str, pathlib.Path, os.PathLike],
+                      **kwargs) -> 'SqliteBioPaxStore':
+        """Return a store with the objects of an OWL file.
+
+        Parameters
+        ----------
+        fname :
+            The path to an OWL file (optionally gzipped, with a .gz
+            extension), see :meth:`add_owl_file`.
+        path :
+            The path to the database file.
+        kwargs :
+            Other arguments to :class:`SqliteBioPaxStore`.
+
+        Returns
+        -------
+        :
+            The store.
+        """
+        store = cls(path, **kwargs)
+        store.add_owl_file(fname)
+        return store
+
+    def add_model(self, model: BioPaxModel):
+        """Add the objects of a model to the store.
+
+        Objects whose uid is already in the store replace the stored ones.
+
+        Parameters
+        ----------
+        model :
+            A BioPAX Model.
+        """
+        self._set_xml_base(model.xml_base)
+        self._add_objects(model.objects.values())
+
+    def add_owl_file(self, fname: Union[str, pathlib.Path, os.PathLike],
+                     batch_size: int = 10000):
+        """Add the objects of an OWL file to the store.
+
+        The file is streamed, so only one batch of objects is held in
+        memory at a time, and references are stored by uid without being
+        resolved.
+
+        Parameters
+        ----------
+        fname :
+            The path to an OWL file (optionally gzipped, with a .gz
+            extension).
+        batch_size :
+            The number of elements to write to the database at once.
+            Default: 10000
+        """
+        from lxml import etree
+        opener = gzip.open if str(fname).endswith('.gz') else open
+        batch = []
+        with opener(fname, 'rb') as fh:
+            depth = 0
+            for event, element in etree.iterparse(fh,
+                                                  events=('start', 'end')):
+                if event == 'start':
+                    if depth == 0:
+                        self._set_xml_base(element.base)
+                    depth += 1
+                    continue
+                depth -= 1
+                if depth != 1:
+                    continue
+                if has_ns(element, 'bp') and get_id_or_about(element):
+                    obj_cls = getattr(biopax_model, get_tag(element))
+                    obj, sub_objs = parse_element(element, cls=obj_cls)
+                    batch.append(obj)
+                    batch += sub_objs
+                # Elements are released as they are processed
+                element.clear()
+                while element.getprevious() is not None:
+                    del element.getparent()[0]
+                if len(batch) >= batch_size:
+                    self._add_objects(batch)
+                    batch = []
+        self._add_objects(batch)
+
+    def _set_xml_base(self, xml_base):
+        if xml_base:
+            with self.connection:
+                self.connection.execute(
+                    'INSERT OR IGNORE INTO metadata VALUES (?, ?)',
+                    ('xml_base', xml_base))
+
+    def _add_objects(self, objects: Iterable[BioPaxObject]):
+        object_rows = []
+        attribute_rows = []
+        xref_rows = []
+        name_rows = []
+        # Inline objects can be listed more than once
+        objects = {obj.uid: obj for obj in objects}
+        for obj in objects.values():
+            uid = obj.uid
+            object_rows.append((uid, obj.__class__.__name__))
+            for attr, key in get_attribute_keys(obj):
+                val = obj.__dict__.get(key)
+                vals = val if isinstance(val, list) else [val]
+                for pos, v in enumerate(vals):
+                    if isinstance(v, BioPaxObject):
+                        attribute_rows.append((uid, attr, pos, v.uid, 1))
+                    elif isinstance(v, Unresolved):
+                        if v.obj_id is not None:
+                            attribute_rows.append((uid, attr, pos,
+                                                   v.obj_id, 1))
+                    elif v is not None:
+                        attribute_rows.append((uid, attr, pos, str(v), 0))
+            if isinstance(obj, Xref):
+                xref_rows.append((uid, obj.db, obj.id))
+            if isinstance(obj, Named):
+                name_rows += [(uid, name) for name in obj.name if name]
+        if not object_rows:
+            return
+        uid_rows = [row[:1] for row in object_rows]
+        with self.connection:
+            # Objects replacing stored ones don't keep their old values
+            for table in ['attributes', 'xrefs', 'names']:
+                self.connection.executemany(
+                    'DELETE FROM %s WHERE uid = ?' % table, uid_rows)
+            self.connection.executemany(
+                'INSERT OR REPLACE INTO objects VALUES (?, ?)', object_rows)
+            self.connection.executemany(
+                'INSERT INTO attributes VALUES (?, ?, ?, ?, ?)',
+                attribute_rows)
+            self.connection.executemany(
+                'INSERT INTO xrefs VALUES (?, ?, ?)', xref_rows)
+            self.connection.executemany(
+                'INSERT INTO names VALUES (?, ?)', name_rows)
+        for uid, in uid_rows:
+            self._cache.pop(uid, None)
+        logger.debug('Stored %d objects' % len(object_rows))
+
+    @property
+    def xml_base(self) -> Optional[str]:
+        """The XML base of the content in the store."""
+        row = self.connection.execute(
+            'SELECT value FROM metadata WHERE key = ?',
+            ('xml_base',)).fetchone()
+        return row[0] if row else None
+
+    def __len__(self):
+        return self.connection.execute(
+            'SELECT COUNT(*) FROM objects').fetchone()[0]
+
+    def __contains__(self, uid):
+        return self.connection.execute(
+            'SELECT 1 FROM objects WHERE uid = ?', (uid,)).fetchone() \
+            is not None
+
+    def get_object(self, uid: str) -> Optional[BioPaxObject]:
+        """Return an object by uid.
+
+        Parameters
+        ----------
+        uid :
+            The uid of the object.
+
+        Returns
+        -------
+        :
+            The object, or None if it isn't in the store.
+        """
+        obj = self._get_cached(uid)
+        if obj is not None:
+            return obj
+        row = self.connection.execute(
+            'SELECT class FROM objects WHERE uid = ?', (uid,)).fetchone()
+        if row is None:
+            return None
+        obj = self._load(uid, row[0])
+        self._add_cached(obj)
+        return obj
+
+    def get_objects(self, uids: Iterable[str]) -> List[BioPaxObject]:
+        """Return the objects with the given uids that are in the store."""
+        objects = [self.get_object(uid) for uid in uids]
+        return [obj for obj in objects if obj is not None]
+
+    def get_uids_by_class(self, cls: Union[str, type],
+                          subclasses: bool = True) -> List[str]:
+        """Return the uids of the objects of a class.
+
+        Parameters
+        ----------
+        cls :
+            A BioPAX class or its name.
+        subclasses :
+            If True, objects of subclasses of the class are included.
+            Default: True
+
+        Returns
+        -------
+        :
+            The uids of the objects.
+        """
+        if isinstance(cls, str):
+            cls = getattr(biopax_model, cls)
+        names = [cls.__name__]
+        if subclasses:
+            names += _get_subclass_names(cls)
+        return [row[0] for row in self.connection.execute(
+            'SELECT uid FROM objects WHERE class IN (%s)'
+            % ', '.join('?' * len(names)), names)]
+
+    def get_objects_by_class(self, cls: Union[str, type],
+                             subclasses: bool = True) \
+            -> Iterator[BioPaxObject]:
+        """Generate the objects of a class, see
+        :meth:`get_uids_by_class`."""
+        for uid in self.get_uids_by_class(cls, subclasses=subclasses):
+            yield self.get_object(uid)
+
+    def get_objects_by_xref(self, db: str, id: str,
+                            attribute: str = 'xref') -> List[BioPaxObject]:
+        """Return the objects having an xref with a given db and id.
+
+        Parameters
+        ----------
+        db :
+            The database of the xref, compared case-insensitively.
+        id :
+            The identifier of the xref.
+        attribute :
+            The attribute referring to the xref. Default: xref
+
+        Returns
+        -------
+        :
+            The objects referring to matching xrefs.
+        """
+        rows = self.connection.execute(
+            'SELECT DISTINCT a.uid FROM xrefs AS x '
+            'JOIN attributes AS a ON a.value = x.uid '
+            'WHERE x.db = ? COLLATE NOCASE AND x.id = ? '
+            'AND a.is_ref = 1 AND a.attr = ?', (db, id, attribute))
+        return self.get_objects([row[0] for row in rows])
+
+    def get_objects_by_name(self, name: str) -> List[BioPaxObject]:
+        """Return the objects with a given name, compared
+        case-insensitively, among their display, standard and other
+        names."""
+        rows = self.connection.execute(
+            'SELECT DISTINCT uid FROM names '
+            'WHERE name = ? COLLATE NOCASE', (name,))
+        return self.get_objects([row[0] for row in rows])
+
+    def get_referring_uids(self, uid: str,
+                           attribute: Optional[str] = None) -> List[str]:
+        """Return the uids of the objects referring to an object.
+
+        Parameters
+        ----------
+        uid :
+            The uid of the referenced object.
+        attribute :
+            If given, only references via this attribute are considered.
+
+        Returns
+        -------
+        :
+            The uids of the referring objects.
+        """
+        query = 'SELECT DISTINCT uid FROM attributes ' \
+            'WHERE value = ? AND is_ref = 1'
+        args = (uid,)
+        if attribute is not None:
+            query += ' AND attr = ?'
+            args += (attribute,)
+        return [row[0] for row in self.connection.execute(query, args)]
+
+    def close(self):
+        """Close the connection to the database."""
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def _load(self, uid, cls_name, proxy=None):
+        """Return an object instantiated from its rows, with references to
+        other objects as cached objects or lazy proxies."""
+        obj_cls = getattr(biopax_model, cls_name)
+        kwargs = {key: [] for key in obj_cls.list_types}
+        rows = self.connection.execute(
+            'SELECT a.attr, a.value, a.is_ref, o.class FROM attributes AS a '
+            'LEFT JOIN objects AS o ON a.is_ref = 1 AND o.uid = a.value '
+            'WHERE a.uid = ? ORDER BY a.attr, a.pos', (uid,))
+        for attr, value, is_ref, ref_cls_name in rows:
+            # References to objects not in the store are kept as uids
+            if is_ref and ref_cls_name is not None:
+                if value == uid and proxy is not None:
+                    value = proxy
+                else:
+                    value = self._get_reference(value, ref_cls_name)
+            if attr in obj_cls.list_types:
+                kwargs[attr].append(value)
+            else:
+                kwargs[attr] = value
+        return obj_cls(uid=uid, **kwargs)
+
+    def _get_reference(self, uid, cls_name):
+        obj = self._get_cached(uid)
+        if obj is None:
+            obj = make_proxy(cls_name, uid,
+                             partial(self._load_proxy, cls_name=cls_name))
+            self._add_cached(obj)
+        return obj
+
+    def _load_proxy(self, proxy, cls_name):
+        return self._load(proxy.uid, cls_name, proxy)
+
+    def _get_cached(self, uid):
+        obj = self._cache.get(uid)
+        if obj is not None:
+            self._cache.move_to_end(uid)
+        return obj
+
+    def _add_cached(self, obj):
+        self._cache[obj.uid] = obj
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+
+def _get_subclass_names(cls):
+    names = []
+    for subclass in cls.__subclasses__():
+        if subclass.__module__.startswith('pybiopax.biopax'):
+            names.append(subclass.__name__)
+        names += _get_subclass_names(subclass)
+    return names
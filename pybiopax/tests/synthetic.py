@@ -0,0 +1,133 @@
+"""Generate synthetic BioPAX models of a given scale for tests and
+benchmarks.
+
+Models are generated deterministically from a seed, and have the shape of
+typical pathway database exports: proteins and small molecules with
+entity references and xrefs, nested complexes, generics, biochemical
+reactions with catalyses, and pathways grouping the reactions.
+"""
+__all__ = ['make_synthetic_model']
+
+import random
+
+from pybiopax.biopax import *
+
+
+def make_synthetic_model(num_reactions: int = 100, seed: int = 0,
+                         complex_depth: int = 3) -> BioPaxModel:
+    """Return a synthetic BioPAX Model.
+
+    Parameters
+    ----------
+    num_reactions :
+        The number of biochemical reactions in the model. The number of
+        other objects scales linearly with it, there are roughly 8 objects
+        per reaction.
+    seed :
+        The seed of the random generator, models generated with the same
+        arguments are identical.
+    complex_depth :
+        The maximum nesting depth of complexes.
+
+    Returns
+    -------
+    :
+        A BioPAX Model.
+    """
+    rng = random.Random(seed)
+    objects = []
+
+    def add(obj):
+        objects.append(obj)
+        return obj
+
+    provenance = add(Provenance(uid='provenance', display_name='Synthetic'))
+    location = add(CellularLocationVocabulary(uid='cytosol',
+                                              term=['cytosol']))
+    num_proteins = max(2, num_reactions)
+    num_molecules = max(2, num_reactions // 2)
+
+    proteins = []
+    for idx in range(num_proteins):
+        xref = add(UnificationXref(uid='uniprot_%d' % idx, db='UniProt',
+                                   id='P%05d' % idx))
+        hgnc_xref = add(RelationshipXref(uid='hgnc_%d' % idx, db='HGNC',
+                                         id=str(idx)))
+        ref = add(ProteinReference(uid='protein_ref_%d' % idx,
+                                   xref=[xref, hgnc_xref],
+                                   display_name='GENE%d' % idx,
+                                   name=['GENE%d' % idx, 'Gene %d' % idx]))
+        proteins.append(add(Protein(uid='protein_%d' % idx,
+                                    entity_reference=ref,
+                                    display_name='GENE%d' % idx,
+                                    cellular_location=location,
+                                    data_source=[provenance])))
+
+    molecules = []
+    for idx in range(num_molecules):
+        xref = add(UnificationXref(uid='chebi_%d' % idx, db='ChEBI',
+                                   id='CHEBI:%d' % idx))
+        ref = add(SmallMoleculeReference(uid='sm_ref_%d' % idx,
+                                         xref=[xref],
+                                         display_name='molecule %d' % idx))
+        molecules.append(add(SmallMolecule(uid='sm_%d' % idx,
+                                           entity_reference=ref,
+                                           display_name='molecule %d' % idx,
+                                           cellular_location=location,
+                                           data_source=[provenance])))
+
+    # Generics over a few proteins each
+    generics = []
+    for idx in range(max(1, num_proteins // 10)):
+        members = rng.sample(proteins, 2)
+        generics.append(add(Protein(uid='generic_%d' % idx,
+                                    member_physical_entity=members,
+                                    display_name='generic %d' % idx,
+                                    data_source=[provenance])))
+
+    # Complexes, nesting earlier complexes up to the given depth
+    complexes = []
+    depths = {}
+    for idx in range(max(1, num_reactions // 4)):
+        components = rng.sample(proteins, 2)
+        nestable = [cplx for cplx in complexes
+                    if depths[cplx.uid] < complex_depth]
+        if nestable and rng.random() < 0.5:
+            components.append(rng.choice(nestable))
+        cplx = add(Complex(uid='complex_%d' % idx, component=components,
+                           display_name='complex %d' % idx,
+                           data_source=[provenance]))
+        depths[cplx.uid] = 1 + max(depths.get(component.uid, 0)
+                                   for component in components)
+        complexes.append(cplx)
+
+    entities = proteins + molecules + generics + complexes
+    reactions = []
+    for idx in range(num_reactions):
+        xref = add(UnificationXref(uid='reaction_xref_%d' % idx,
+                                   db='Reactome', id='R-HSA-%d' % idx))
+        reaction = add(BiochemicalReaction(
+            uid='reaction_%d' % idx,
+            left=rng.sample(entities, 2),
+            right=rng.sample(entities, 2),
+            xref=[xref],
+            display_name='reaction %d' % idx,
+            data_source=[provenance]))
+        reactions.append(reaction)
+        if rng.random() < 0.5:
+            add(Catalysis(uid='catalysis_%d' % idx,
+                          controller=[rng.choice(entities)],
+                          controlled=reaction,
+                          control_type='ACTIVATION',
+                          data_source=[provenance]))
+
+    pathways = []
+    for idx in range(0, num_reactions, 20):
+        pathways.append(add(Pathway(uid='pathway_%d' % (idx // 20),
+                                    pathway_component=reactions[idx:idx + 20],
+                                    display_name='pathway %d' % (idx // 20),
+                                    data_source=[provenance])))
+    if len(pathways) > 1:
+        add(Pathway(uid='pathway_top', pathway_component=pathways,
+                    display_name='top pathway', data_source=[provenance]))
+    return BioPaxModel(objects, xml_base='http://example.org/synthetic#')
@@ -54,6 +54,60 @@ def test_process_molecular_interactions():
     assert len(model.objects) == 62
 
 
+def test_process_inline_objects():
+    owl_str = """<?xml version="1.0"?>
+<rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#"
+ xmlns:bp="http://www.biopax.org/release/biopax-level3.owl#"
+ xml:base="http://example.org/">
+<bp:Protein rdf:about="http://example.org/p1">
+ <bp:xref>
+  <bp:UnificationXref rdf:about="http://example.org/x1">
+   <bp:db>UniProt</bp:db><bp:id>P1</bp:id>
+  </bp:UnificationXref>
+  <bp:UnificationXref rdf:about="http://example.org/x2">
+   <bp:db>HGNC</bp:db><bp:id>1</bp:id>
+  </bp:UnificationXref>
+ </bp:xref>
+ <bp:xref>
+  <bp:UnificationXref rdf:about="http://example.org/x1"/>
+ </bp:xref>
+</bp:Protein>
+<bp:Protein rdf:about="http://example.org/p2">
+ <bp:xref>
+  <bp:UnificationXref rdf:about="http://example.org/x1"/>
+ </bp:xref>
+</bp:Protein>
+</rdf:RDF>"""
+    model = pybiopax.model_from_owl_str(owl_str)
+    assert set(model.objects) == {'http://example.org/%s' % uid
+                                  for uid in ['p1', 'p2', 'x1', 'x2']}
+    x1 = model.objects['http://example.org/x1']
+    assert x1.id == 'P1'
+    p1 = model.objects['http://example.org/p1']
+    # All inline children are parsed and each URI is parsed once
+    assert p1.xref == [x1, model.objects['http://example.org/x2'], x1]
+    assert model.objects['http://example.org/p2'].xref == [x1]
+
+    # Deeply nested inline objects are parsed iteratively
+    from lxml import etree
+    num_steps = 900
+    owl_str = ''.join('<bp:PathwayStep rdf:about="step_%d">%s' % (
+        idx, '<bp:nextStep>' if idx < num_steps - 1 else '')
+        for idx in range(num_steps)) + \
+        '</bp:PathwayStep></bp:nextStep>' * (num_steps - 1) + \
+        '</bp:PathwayStep>'
+    owl_str = '<rdf:RDF xmlns:rdf="%s" xmlns:bp="%s">%s</rdf:RDF>' % (
+        'http://www.w3.org/1999/02/22-rdf-syntax-ns#',
+        'http://www.biopax.org/release/biopax-level3.owl#', owl_str)
+    tree = etree.fromstring(owl_str.encode('utf-8'),
+                            parser=etree.XMLParser(huge_tree=True))
+    model = BioPaxModel.from_xml(tree)
+    assert len(model.objects) == num_steps
+    assert model.objects['step_0'].next_step == [model.objects['step_1']]
+    assert model.objects['step_899'].next_step_of == \
+        {model.objects['step_898']}
+
+
 @pytest.mark.skip(reason="NetPath is no longer accessible")
 def test_get_netpath():
     m = pybiopax.model_from_netpath("22")
@@ -96,3 +150,151 @@ def test_get_ecocyc():
     assert isinstance(m, BioPaxModel)
     assert m.xml_base is not None
     assert 0 < len(m.objects)
+
+
+def test_leaf_entity_references():
+    refs = [ProteinReference(uid='pr%d' % idx) for idx in range(4)]
+    generic_ref = ProteinReference(uid='generic_pr',
+                                   member_entity_reference=refs[2:4])
+    proteins = [Protein(uid='p%d' % idx, entity_reference=ref)
+                for idx, ref in enumerate(refs[:2] + [generic_ref])]
+    sub = Complex(uid='sub', component=proteins[:2])
+    top = Complex(uid='top', component=[sub, proteins[2]])
+    # A cycle through generic members
+    loop1 = Protein(uid='loop1', entity_reference=refs[0])
+    loop2 = Protein(uid='loop2', member_physical_entity=[loop1])
+    loop1.member_physical_entity = [loop2]
+    model = BioPaxModel(refs + [generic_ref, sub, top, loop1, loop2]
+                        + proteins)
+
+    assert model.leaf_entity_references(top) == set(refs)
+    assert model.leaf_entity_references(sub) == set(refs[:2])
+    assert model.leaf_entity_references(generic_ref) == set(refs[2:4])
+    index = model.get_leaf_entity_references()
+    assert index['loop1'] == index['loop2'] == {refs[0]}
+    assert index['p2'] == set(refs[2:4])
+
+    # Deep nesting doesn't hit the recursion limit
+    complexes = [Complex(uid='c0', component=[proteins[0]])]
+    for idx in range(1, 5000):
+        complexes.append(Complex(uid='c%d' % idx,
+                                 component=[complexes[-1]]))
+    model = BioPaxModel(complexes + [proteins[0], refs[0]])
+    assert model.leaf_entity_references(complexes[-1]) == {refs[0]}
+
+
+def test_get_sub_objects():
+    from pybiopax.biopax.model import get_sub_objects
+    xref = UnificationXref(uid='x', db='UniProt', id='P04637')
+    ref = ProteinReference(uid='pr', xref=[xref])
+    cplx = Complex(uid='c', component=[
+        Protein(uid='p1', entity_reference=ref),
+        Protein(uid='p2', entity_reference=ref)])
+    # A reference cycle back to the object itself
+    cplx.member_physical_entity = [cplx]
+    BioPaxModel([cplx, xref, ref] + cplx.component)
+    sub_objs = get_sub_objects(cplx)
+    assert sorted(obj.uid for obj in sub_objs) == ['p1', 'p2', 'pr', 'x']
+    # Reverse links aren't followed
+    assert get_sub_objects(xref) == []
+
+
+def test_submodel():
+    from pybiopax.tests.synthetic import make_synthetic_model
+    model = make_synthetic_model(40)
+    reaction = model.objects['reaction_0']
+    sub = model.submodel(['reaction_0'])
+    reaction_copy = sub.objects['reaction_0']
+    assert reaction_copy is not reaction
+    for entity in reaction.left + reaction.right:
+        assert entity.uid in sub.objects
+    assert 'provenance' in sub.objects
+    assert 'reaction_1' not in sub.objects
+    # Reverse links are scoped to the submodel
+    for entity in reaction_copy.left:
+        assert entity.participant_of == {reaction_copy}
+        assert entity is sub.objects[entity.uid]
+    # The parent model is unaffected
+    assert reaction in reaction.left[0].participant_of
+
+    sub = model.submodel([reaction], closure='none')
+    assert set(sub.objects) == {'reaction_0'}
+    assert sub.objects['reaction_0'].left == \
+        [entity.uid for entity in reaction.left]
+
+    sub = model.submodel(['pathway_0'], depth=1)
+    assert 'reaction_5' in sub.objects
+    assert sub.objects['reaction_5'].left == \
+        [entity.uid for entity in model.objects['reaction_5'].left]
+
+    # Submodels of subclasses of BioPaxModel are of the same class
+    class CustomModel(BioPaxModel):
+        pass
+    custom = CustomModel(list(model.objects.values()))
+    assert type(custom.submodel(['reaction_0'])) is CustomModel
+
+
+def test_deduplicate():
+    vocab1 = CellularLocationVocabulary(uid='cv1', term=['cytosol'])
+    vocab2 = CellularLocationVocabulary(uid='cv2', term=['cytosol'])
+    xref1 = UnificationXref(uid='x1', db='UniProt', id='P04637')
+    xref2 = UnificationXref(uid='x2', db='UniProt', id='P04637')
+    xref3 = UnificationXref(uid='x3', db='UniProt', id='P38398')
+    ref = ProteinReference(uid='pr', xref=[xref1, xref2, xref3])
+    protein1 = Protein(uid='p1', entity_reference=ref,
+                       cellular_location=vocab1)
+    protein2 = Protein(uid='p2', entity_reference=ref,
+                       cellular_location=vocab2)
+    model = BioPaxModel([vocab1, vocab2, xref1, xref2, xref3, ref,
+                         protein1, protein2])
+
+    aliases = model.deduplicate()
+    assert aliases == {'cv2': 'cv1', 'x2': 'x1'}
+    assert model.uri_aliases == aliases
+    assert set(model.objects) == {'cv1', 'x1', 'x3', 'pr', 'p1', 'p2'}
+    assert ref.xref == [xref1, xref3]
+    assert protein2.cellular_location is vocab1
+    assert xref1.xref_of == {ref}
+    # Proteins aren't deduplicated by default
+    assert model.deduplicate() == {}
+    assert model.deduplicate(classes=(Protein,)) == {'p2': 'p1'}
+    assert model.uri_aliases == {'cv2': 'cv1', 'x2': 'x1', 'p2': 'p1'}
+    assert ref.entity_reference_of == {protein1}
+
+
+def test_lazy_reverse_links():
+    import pickle
+    from pybiopax.tests.synthetic import make_synthetic_model
+    owl_str = pybiopax.model_to_owl_str(make_synthetic_model(20, seed=1))
+    eager = pybiopax.model_from_owl_str(owl_str)
+    lazy = pybiopax.model_from_owl_str(owl_str, lazy_reverse_links=True)
+    assert lazy.lazy_reverse_links
+    # No reverse links are stored in the objects until they are accessed
+    assert all(val is None for obj in lazy.objects.values()
+               for key, val in obj.__dict__.items() if key.endswith('_of'))
+    assert not lazy._indexes
+
+    def get_links(model):
+        return {(obj.uid, attr): {o.uid for o in getattr(obj, attr)}
+                for obj in model.objects.values() for attr in dir(obj)
+                if isinstance(getattr(type(obj), attr, None), ReverseLink)}
+
+    links = get_links(eager)
+    assert any(links.values())
+    assert get_links(lazy) == links
+    reaction = lazy.objects['reaction_0']
+    assert reaction in reaction.left[0].participant_of
+    assert ('reverse_links', 'participant') in lazy._indexes
+
+    # The index is rebuilt after the model is modified
+    ref = lazy.objects['protein_0'].entity_reference
+    protein = Protein(uid='new_protein', entity_reference=ref)
+    lazy.objects[protein.uid] = protein
+    lazy.add_reverse_links()
+    assert protein in ref.entity_reference_of
+
+    lazy2 = pickle.loads(pickle.dumps(lazy))
+    assert lazy2.lazy_reverse_links
+    assert get_links(lazy2) == get_links(lazy)
+    with pytest.raises(AttributeError):
+        reaction.participant_of = set()
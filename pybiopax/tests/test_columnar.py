@@ -0,0 +1,36 @@
+import pytest
+from pybiopax.biopax import *
+from pybiopax.tests.synthetic import make_synthetic_model
+
+pa = pytest.importorskip('pyarrow')
+
+
+def test_to_arrow():
+    model = make_synthetic_model(20)
+    tables = model.to_arrow()
+    proteins = tables.classes['Protein']
+    assert proteins.num_rows == \
+        len(list(model.get_objects_by_type(Protein)))
+    row = proteins.to_pylist()[0]
+    assert row['uid'] == 'protein_0'
+    assert row['entity_reference'] == 'protein_ref_0'
+    assert row['data_source'] == ['provenance']
+    assert row['display_name'] == 'GENE0'
+    assert proteins.schema.field('comment').type == pa.list_(pa.string())
+
+    left = tables.edges['left'].to_pylist()
+    assert {'source': 'reaction_0',
+            'target': model.objects['reaction_0'].left[0].uid} in left
+    assert len(left) == 2 * 20
+    assert 'display_name' not in tables.edges
+
+
+def test_to_parquet(tmp_path):
+    pq = pytest.importorskip('pyarrow.parquet')
+    model = make_synthetic_model(10)
+    model.to_parquet(tmp_path)
+    table = pq.read_table(tmp_path / 'UnificationXref.parquet')
+    assert table.num_rows == \
+        len(list(model.get_objects_by_type(UnificationXref)))
+    edges = pq.read_table(tmp_path / 'edges' / 'xref.parquet')
+    assert set(edges.column_names) == {'source', 'target'}
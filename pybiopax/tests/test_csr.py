@@ -0,0 +1,51 @@
+import pytest
+from pybiopax.biopax import *
+
+np = pytest.importorskip('numpy')
+
+
+def _get_model():
+    prot1 = Protein(uid='p1')
+    prot2 = Protein(uid='p2')
+    prot3 = Protein(uid='p3')
+    bcr = BiochemicalReaction(uid='r1', left=[prot1], right=[prot2])
+    cat = Catalysis(uid='c1', controller=[prot3], controlled=bcr)
+    return BioPaxModel([prot1, prot2, prot3, bcr, cat])
+
+
+def test_to_csr():
+    model = _get_model()
+    graph = model.to_csr()
+    assert graph.uids == ['p1', 'p2', 'p3', 'r1', 'c1']
+    assert graph.num_edges == 4
+    assert graph.indptr.tolist() == [0, 0, 0, 0, 2, 4]
+    r1 = graph.index['r1']
+    targets = graph.indices[graph.indptr[r1]:graph.indptr[r1 + 1]]
+    types = graph.edge_types[graph.indptr[r1]:graph.indptr[r1 + 1]]
+    assert {(graph.uids[t], graph.edge_type_names[et])
+            for t, et in zip(targets, types)} == \
+        {('p1', 'left'), ('p2', 'right')}
+
+    graph = model.to_csr(edge_types=['controller'])
+    assert graph.num_edges == 1
+    assert graph.edge_type_names == ['controller']
+
+
+def test_csr_conversions():
+    pytest.importorskip('scipy')
+    pytest.importorskip('networkx')
+    graph = _get_model().to_csr()
+    mat = graph.to_scipy()
+    assert mat.shape == (5, 5)
+    assert mat.nnz == 4
+    assert mat[graph.index['c1'], graph.index['r1']] == 1
+    assert graph.to_scipy(edge_type='left').nnz == 1
+    mat = graph.to_scipy(edge_type='participant')
+    assert mat.shape == (5, 5)
+    assert mat.nnz == 0
+
+    nxg = graph.to_networkx()
+    assert nxg.number_of_nodes() == 5
+    assert nxg.number_of_edges() == 4
+    edge_data = nxg.get_edge_data('c1', 'p3')
+    assert [d['type'] for d in edge_data.values()] == ['controller']
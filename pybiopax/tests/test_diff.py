@@ -0,0 +1,70 @@
+import json
+from pybiopax.biopax import *
+from pybiopax.diff import ModelDiff, diff_models
+from pybiopax.tests.synthetic import make_synthetic_model
+
+
+def test_diff_models():
+    old = make_synthetic_model(20)
+    new = make_synthetic_model(20)
+    assert diff_models(old, new).is_empty()
+
+    new.objects['uniprot_0'].id = 'Q99999'
+    new.objects['protein_ref_1'].xref = [new.objects['uniprot_1'],
+                                         new.objects['uniprot_2']]
+    new.objects['reaction_2'].display_name = None
+    new.objects['new_xref'] = UnificationXref(uid='new_xref', db='HGNC',
+                                              id='1')
+    del new.objects['chebi_3']
+    new.clear_indexes()
+
+    diff = diff_models(old, new)
+    assert diff.added == ['new_xref']
+    assert diff.removed == ['chebi_3']
+    assert diff.modified == {
+        'uniprot_0': {'id': {'old': 'P00000', 'new': 'Q99999'}},
+        'protein_ref_1': {'xref': {'added': ['uniprot_2'],
+                                   'removed': ['hgnc_1']}},
+        'reaction_2': {'display_name': {'old': 'reaction 2', 'new': None}},
+    }
+    assert diff.changed_uids == ['chebi_3', 'new_xref', 'protein_ref_1',
+                                 'reaction_2', 'uniprot_0']
+    diff_dict = json.loads(json.dumps(diff.to_dict()))
+    assert ModelDiff.from_dict(diff_dict).to_dict() == diff.to_dict()
+
+
+def test_diff_models_match_by_content():
+    x1 = UnificationXref(uid='x1', db='UniProt', id='P04637')
+    x2 = UnificationXref(uid='x2', db='UniProt', id='P38398')
+    old = BioPaxModel([x1, x2, ProteinReference(uid='pr', xref=[x1])])
+    y1 = UnificationXref(uid='y1', db='UniProt', id='P04637')
+    y2 = UnificationXref(uid='y2', db='UniProt', id='P00533')
+    new = BioPaxModel([y1, y2, ProteinReference(uid='pr', xref=[y1])])
+
+    diff = diff_models(old, new)
+    assert diff.added == ['y1', 'y2']
+    assert diff.removed == ['x1', 'x2']
+    assert diff.modified == {'pr': {'xref': {'added': ['y1'],
+                                             'removed': ['x1']}}}
+
+    diff = diff_models(old, new, match_by_content=True)
+    assert diff.matched == {'x1': 'y1'}
+    assert diff.added == ['y2']
+    assert diff.removed == ['x2']
+    assert not diff.modified
+
+
+def test_diff_models_class_changed():
+    ref = ProteinReference(uid='pr')
+    old = BioPaxModel([ref, Protein(uid='p', entity_reference=ref,
+                                    display_name='A')])
+    new = BioPaxModel([ref, Complex(uid='p', display_name='A',
+                                    component_stoichiometry=[])])
+    diff = diff_models(old, new)
+    assert not diff.added
+    assert not diff.removed
+    assert diff.modified == {
+        'p': {'class': {'old': 'Protein', 'new': 'Complex'},
+              'entity_reference': {'old': 'pr', 'new': None}},
+    }
+    assert diff.changed_uids == ['p']
@@ -0,0 +1,37 @@
+import random
+import pytest
+
+np = pytest.importorskip('numpy')
+stats = pytest.importorskip('scipy.stats')
+
+from pybiopax.analysis.enrichment import bh_adjust, \
+    hypergeometric_enrichment
+
+
+def test_hypergeometric_enrichment():
+    rng = random.Random(0)
+    genes = ['HGNC:%d' % idx for idx in range(200)]
+    queries = [set(rng.sample(genes, rng.randint(1, 40))) for _ in range(5)]
+    pathways = [set(rng.sample(genes, rng.randint(1, 40))) for _ in range(7)]
+    universe_size = 300
+    overlaps, p_values, q_values = \
+        hypergeometric_enrichment(queries, pathways, universe_size)
+    assert p_values.shape == (5, 7)
+    for i, query in enumerate(queries):
+        for j, pathway in enumerate(pathways):
+            overlap = len(query & pathway)
+            assert overlaps[i, j] == overlap
+            table = [[overlap, len(query - pathway)],
+                     [len(pathway - query),
+                      universe_size - len(query | pathway)]]
+            _, p_value = stats.fisher_exact(table, alternative='greater')
+            assert p_values[i, j] == pytest.approx(p_value)
+    assert np.all(q_values >= p_values)
+
+
+def test_bh_adjust():
+    p_values = np.array([[0.01, 0.04, 0.03, 0.5], [0.2, 0.2, 0.001, 0.9]])
+    q_values = bh_adjust(p_values, axis=1)
+    expected = [[0.04, 0.0533333, 0.0533333, 0.5],
+                [0.2666666, 0.2666666, 0.004, 0.9]]
+    assert q_values == pytest.approx(np.array(expected), rel=1e-5)
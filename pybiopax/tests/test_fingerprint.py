@@ -0,0 +1,89 @@
+from pybiopax.biopax import *
+from pybiopax.fingerprint import get_fingerprint, get_fingerprints, \
+    get_deep_fingerprints, get_model_fingerprint, invalidate_fingerprints
+from pybiopax.tests.synthetic import make_synthetic_model
+
+
+def test_fingerprint_content():
+    xref1 = UnificationXref(uid='x1', db='UniProt', id='P04637')
+    xref2 = UnificationXref(uid='x2', db='UniProt', id='P04637')
+    xref3 = UnificationXref(uid='x3', db='UniProt', id='P38398')
+    # The uid of the object itself isn't part of the fingerprint
+    assert get_fingerprint(xref1) == get_fingerprint(xref2)
+    assert get_fingerprint(xref1) != get_fingerprint(xref3)
+    # Neither is the order of list values
+    ref1 = ProteinReference(uid='r1', name=['a', 'b'], xref=[xref1, xref3])
+    ref2 = ProteinReference(uid='r2', name=['b', 'a'], xref=[xref3, xref1])
+    assert get_fingerprint(ref1) == get_fingerprint(ref2)
+    # References are included by uid in shallow fingerprints and by content
+    # in deep fingerprints
+    ref3 = ProteinReference(uid='r3', name=['a', 'b'], xref=[xref2, xref3])
+    model = BioPaxModel([xref1, xref2, xref3, ref1, ref2, ref3])
+    assert get_fingerprint(ref1) != get_fingerprint(ref3)
+    deep = get_deep_fingerprints(model)
+    assert deep['r1'] == deep['r3']
+    assert deep['x1'] == deep['x2']
+
+
+def test_model_fingerprint():
+    model1 = make_synthetic_model(50, seed=0)
+    model2 = make_synthetic_model(50, seed=0)
+    model3 = make_synthetic_model(50, seed=1)
+    assert get_fingerprints(model1) == get_fingerprints(model2)
+    assert get_model_fingerprint(model1) == get_model_fingerprint(model2)
+    assert get_model_fingerprint(model1) != get_model_fingerprint(model3)
+    assert set(get_deep_fingerprints(model1)) == set(model1.objects)
+
+
+def test_invalidate_fingerprints():
+    model = make_synthetic_model(20)
+    shallow = dict(get_fingerprints(model))
+    deep = dict(get_deep_fingerprints(model))
+    model_fingerprint = get_model_fingerprint(model)
+
+    model.objects['uniprot_0'].id = 'Q99999'
+    invalidate_fingerprints(model, ['uniprot_0'])
+    new_shallow = get_fingerprints(model)
+    new_deep = get_deep_fingerprints(model)
+    assert new_shallow['uniprot_0'] != shallow['uniprot_0']
+    # The shallow fingerprint of the reference doesn't change but the deep
+    # ones of everything referring to the xref do
+    assert new_shallow['protein_ref_0'] == shallow['protein_ref_0']
+    assert new_deep['protein_ref_0'] != deep['protein_ref_0']
+    assert new_deep['protein_0'] != deep['protein_0']
+    assert new_deep['uniprot_1'] == deep['uniprot_1']
+    assert get_model_fingerprint(model) != model_fingerprint
+
+    model.clear_indexes()
+    assert get_fingerprints(model) == new_shallow
+    assert get_deep_fingerprints(model) == new_deep
+
+
+def test_fingerprints_added_removed():
+    model = make_synthetic_model(20)
+    model_fingerprint = get_model_fingerprint(model)
+    # Removing one object and adding another one keeps the number of objects
+    catalysis = model.objects.pop('catalysis_1')
+    model.objects['catalysis_new'] = Catalysis(
+        uid='catalysis_new', controller=catalysis.controller,
+        controlled=catalysis.controlled, control_type='INHIBITION')
+    assert 'catalysis_1' not in get_fingerprints(model)
+    assert get_fingerprints(model)['catalysis_new'] == \
+        get_fingerprint(model.objects['catalysis_new'])
+    assert set(get_deep_fingerprints(model)) == set(model.objects)
+    assert get_model_fingerprint(model) != model_fingerprint
+
+
+def test_fingerprint_cycle():
+    def make_model(name):
+        cplx1 = Complex(uid='c1', display_name=name)
+        cplx2 = Complex(uid='c2', component=[cplx1])
+        cplx1.component = [cplx2]
+        return BioPaxModel([cplx1, cplx2,
+                            Complex(uid='c3', component=[cplx2])])
+
+    deep1 = get_deep_fingerprints(make_model('a'))
+    deep2 = get_deep_fingerprints(make_model('b'))
+    assert deep1['c2'] != deep2['c2']
+    assert deep1['c3'] != deep2['c3']
+    assert deep1 == get_deep_fingerprints(make_model('a'))
@@ -0,0 +1,52 @@
+import os
+import pickle
+import pytest
+
+pytest.importorskip('scipy')
+
+from pybiopax import model_to_owl_file
+from pybiopax.biopax import *
+from pybiopax.analysis.gene_sets import build_gene_set_matrix
+
+
+def _get_hgnc(er):
+    for xref in er.xref:
+        if xref.db == 'HGNC':
+            return xref.id
+
+
+def _get_model(prefix, gene_ids):
+    objs = []
+    for gene_id in gene_ids:
+        xref = UnificationXref(uid='%s_xref_%s' % (prefix, gene_id),
+                               db='HGNC', id=gene_id)
+        er = ProteinReference(uid='%s_er_%s' % (prefix, gene_id),
+                              xref=[xref])
+        objs += [xref, er, Protein(uid='%s_p_%s' % (prefix, gene_id),
+                                   entity_reference=er)]
+    return BioPaxModel(objs)
+
+
+def test_build_gene_set_matrix(tmpdir):
+    owl_path = os.path.join(str(tmpdir), 'pw1.owl')
+    model_to_owl_file(_get_model('pw1', ['1', '2']), owl_path)
+    pkl_path = os.path.join(str(tmpdir), 'pw2.xml')
+    with open(pkl_path, 'wb') as fh:
+        pickle.dump(_get_model('pw2', ['2', '3']), fh)
+    sources = {'pw1': owl_path, 'pw2': pkl_path,
+               'pw3': _get_model('pw3', ['4'])}
+    cache_dir = os.path.join(str(tmpdir), 'cache')
+
+    matrix = build_gene_set_matrix(sources, gene_mapper=_get_hgnc, n_jobs=2,
+                                   cache_dir=cache_dir)
+    assert matrix.pathways == ['pw1', 'pw2', 'pw3']
+    assert matrix.genes == ['1', '2', '3', '4']
+    assert matrix.matrix.shape == (3, 4)
+    assert matrix.to_gene_sets() == {'pw1': {'1', '2'}, 'pw2': {'2', '3'},
+                                     'pw3': {'4'}}
+    assert os.path.exists(os.path.join(cache_dir, 'matrix.npz'))
+
+    cached = build_gene_set_matrix(sources, gene_mapper=_get_hgnc,
+                                   cache_dir=cache_dir)
+    assert cached.get_gene_set('pw2') == {'2', '3'}
+    assert (cached.matrix != matrix.matrix).nnz == 0
@@ -0,0 +1,75 @@
+import pytest
+from pybiopax.biopax import *
+from pybiopax.graph import neighborhood, paths_between, paths_from_to
+
+
+def _get_model():
+    # A -> B -> C signaling chain and an unrelated D-E interaction
+    ers = {name: ProteinReference(
+        uid=name, display_name=name,
+        xref=[UnificationXref(uid='xref_%s' % name, db='UniProt',
+                              id='P%s' % name)])
+        for name in 'ABCDE'}
+    objs = list(ers.values()) + [er.xref[0] for er in ers.values()]
+    proteins = {}
+    for name, er in ers.items():
+        for state in ['', '_p']:
+            proteins[name + state] = Protein(uid='p' + name + state,
+                                             entity_reference=er)
+    objs += list(proteins.values())
+    bcr1 = BiochemicalReaction(uid='r1', left=[proteins['B']],
+                               right=[proteins['B_p']])
+    cat1 = Catalysis(uid='c1', controller=[proteins['A']], controlled=bcr1)
+    bcr2 = BiochemicalReaction(uid='r2', left=[proteins['C']],
+                               right=[proteins['C_p']])
+    cat2 = Catalysis(uid='c2', controller=[proteins['B_p']],
+                     controlled=bcr2)
+    mi = MolecularInteraction(uid='mi', participant=[proteins['D'],
+                                                     proteins['E']])
+    objs += [bcr1, cat1, bcr2, cat2, mi]
+    return BioPaxModel(objs)
+
+
+def test_neighborhood():
+    model = _get_model()
+    res = neighborhood(model, 'B')
+    assert isinstance(res, BioPaxModel)
+    assert {'A', 'B', 'C', 'c1', 'r1', 'c2', 'r2'} <= set(res.objects)
+    assert 'D' not in res.objects
+    # Referenced objects are part of the result
+    assert 'xref_A' in res.objects
+
+    res = neighborhood(model, ['uniprot:PB'], direction='downstream')
+    assert 'C' in res.objects
+    assert 'A' not in res.objects
+
+    res = neighborhood(model, model.objects['pD_p'])
+    assert set(res.objects) >= {'D', 'E', 'mi'}
+    assert 'r1' not in res.objects
+
+
+def test_paths_from_to():
+    model = _get_model()
+    res = paths_from_to(model, ['A'], ['C'], limit=1)
+    assert not res.objects
+    res = paths_from_to(model, ['A'], ['C'], limit=2)
+    assert {'A', 'B', 'C', 'c1', 'r1', 'c2', 'r2'} <= set(res.objects)
+    assert 'mi' not in res.objects
+    res = paths_from_to(model, ['C'], ['A'], limit=3)
+    assert not res.objects
+
+
+def test_paths_between():
+    model = _get_model()
+    res = paths_between(model, ['A', 'C', 'D'], limit=2)
+    assert {'A', 'B', 'C', 'c1', 'r1', 'c2', 'r2'} <= set(res.objects)
+    assert 'D' not in res.objects
+    res = paths_between(model, ['PA', 'PB'], limit=1)
+    assert {'A', 'B', 'c1', 'r1'} <= set(res.objects)
+    assert 'C' not in res.objects
+
+
+def test_invalid_query_entity():
+    model = _get_model()
+    with pytest.raises(TypeError):
+        neighborhood(model, model.objects['r1'])
@@ -0,0 +1,13 @@
+import subprocess
+import sys
+
+
+def test_lazy_imports():
+    # Network, progress bar and XML dependencies should only be imported
+    # once they are needed
+    code = ('import sys, pybiopax, pybiopax.paths; '
+            'print(",".join(m for m in ("requests", "tqdm", "lxml") '
+            'if m in sys.modules))')
+    out = subprocess.run([sys.executable, '-c', code],
+                         stdout=subprocess.PIPE, check=True)
+    assert out.stdout.decode('utf-8').strip() == ''
@@ -0,0 +1,22 @@
+from pybiopax import model_from_owl_str, model_to_owl_str
+from pybiopax.biopax import Pathway
+from pybiopax.instrumentation import LoadStats
+from pybiopax.tests.synthetic import make_synthetic_model
+
+
+def test_load_stats():
+    model = make_synthetic_model(20)
+    owl_str = model_to_owl_str(model).replace('rdf:resource="#sm_ref_3"',
+                                              'rdf:resource="#missing"')
+    stats = LoadStats()
+    model2 = model_from_owl_str(owl_str, instrumentation=stats)
+    assert list(stats.phases) == ['parse_xml', 'instantiate',
+                                  'resolve_references', 'add_reverse_links']
+    assert stats.wall_time > 0
+    assert sum(stats.class_counts.values()) == len(model.objects)
+    assert stats.class_counts['Pathway'] == \
+        len(list(model.get_objects_by_type(Pathway)))
+    assert stats.num_unresolved == 1
+    assert stats.unresolved_ids == {'missing'}
+    assert model2.objects['sm_3'].entity_reference == 'missing'
+    assert 'resolve_references' in str(stats)
@@ -0,0 +1,83 @@
+import io
+import json
+
+import pybiopax
+from pybiopax import jsonld
+from pybiopax.biopax import *
+from pybiopax.tests.synthetic import make_synthetic_model
+
+
+def test_to_json_dict():
+    model = make_synthetic_model(5)
+    protein = model.objects['protein_0']
+    node = protein.to_json_dict()
+    assert node['@id'] == '#protein_0'
+    assert node['@type'] == 'Protein'
+    assert node['displayName'] == 'GENE0'
+    assert node['entityReference'] == {'@id': '#protein_ref_0'}
+    assert 'comment' not in node
+
+    node = protein.to_json_dict(depth=1)
+    assert node['entityReference']['@type'] == 'ProteinReference'
+    assert node['entityReference']['xref'][0].keys() == {'@id'}
+
+
+def test_model_json_round_trip(monkeypatch):
+    model = make_synthetic_model(20, seed=1)
+    json_str = model.to_json()
+    doc = json.loads(json_str)
+    assert doc['@context']['@vocab'] == \
+        'http://www.biopax.org/release/biopax-level3.owl#'
+    assert len(doc['@graph']) == len(model.objects)
+
+    # Streaming gives the same document in chunks
+    fh = io.StringIO()
+    assert model.to_json(fp=fh) is None
+    assert fh.getvalue() == json_str
+    chunks = list(jsonld.iter_model_json(model, chunk_size=7))
+    assert ''.join(chunks) == json_str
+
+    # The same document is produced with the built-in json module
+    monkeypatch.setattr(jsonld, '_orjson', False)
+    assert model.to_json() == json_str
+    model2 = pybiopax.model_from_json(json_str)
+    assert set(model2.objects) == set(model.objects)
+    reaction = model2.objects['reaction_0']
+    assert reaction.left[0] is model2.objects[reaction.left[0].uid]
+    assert reaction in reaction.left[0].participant_of
+    assert model2.to_json() == json_str
+
+
+def test_model_from_embedded_json():
+    model = make_synthetic_model(5)
+    json_str = model.to_json(objects=['protein_0'], depth=1)
+    model2 = pybiopax.model_from_json(json_str)
+    protein = model2.objects['protein_0']
+    assert isinstance(protein, Protein)
+    ref = protein.entity_reference
+    assert isinstance(ref, ProteinReference)
+    assert ref is model2.objects['protein_ref_0']
+    # References beyond the embedded depth are kept as uids
+    assert ref.xref == [xref.uid for xref in
+                        model.objects['protein_ref_0'].xref]
+
+
+def test_json_ids_resolve_as_in_owl():
+    xref = UnificationXref(uid='x1', db='UniProt', id='P04637')
+    ref = ProteinReference(uid='http://example.org/pr', xref=[xref])
+    # The xml:base has no trailing #, so rdf:ID uids resolve to <base>#uid
+    model = BioPaxModel([xref, ref], xml_base='http://example.org/model')
+    doc = json.loads(model.to_json())
+    assert doc['@context']['@base'] == 'http://example.org/model'
+    nodes = {node['@id']: node for node in doc['@graph']}
+    assert set(nodes) == {'#x1', 'http://example.org/pr'}
+    assert nodes['http://example.org/pr']['xref'] == [{'@id': '#x1'}]
+
+    model2 = pybiopax.model_from_json(json.dumps(doc))
+    assert model2.xml_base == 'http://example.org/model'
+    assert set(model2.objects) == {'x1', 'http://example.org/pr'}
+    assert model2.objects['http://example.org/pr'].xref == \
+        [model2.objects['x1']]
+    owl = pybiopax.model_to_owl_str(model2)
+    assert 'rdf:ID="x1"' in owl
+    assert 'rdf:resource="#x1"' in owl
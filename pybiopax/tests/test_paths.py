@@ -1,7 +1,8 @@
 import pytest
 from pybiopax.biopax import *
 from pybiopax import model_from_pc_query
-from pybiopax.paths import find_objects, BiopaxClassConstraintError
+from pybiopax.paths import find_objects, iter_objects, exists, count, \
+    BiopaxClassConstraintError, BiopaxPathPredicateError
 
 
 def test_find_objects():
@@ -77,6 +78,92 @@ def test_recursive():
     assert set(objects) == {p1, c1}
 
 
+def test_iter_objects():
+    p1 = Protein(uid='1')
+    p2 = Protein(uid='2')
+    c1 = Complex(uid='3', member_physical_entity=[p1, p2])
+    c2 = Complex(uid='4', member_physical_entity=[c1])
+
+    objects = iter_objects(c2, 'member_physical_entity*')
+    assert not isinstance(objects, list)
+    assert list(objects) == find_objects(c2, 'member_physical_entity*')
+    assert list(iter_objects(c2, 'member_physical_entity*', limit=2)) == \
+        [c1, p1]
+
+    assert exists(c2, 'member_physical_entity/member_physical_entity')
+    assert not exists(p1, 'member_physical_entity')
+    assert count(c2, 'member_physical_entity*') == 3
+    assert count(c2, 'member_physical_entity*:Protein') == 2
+
+    with pytest.raises(BiopaxClassConstraintError):
+        iter_objects(c2, 'member_physical_entity:XXX')
+
+
+def test_predicates():
+    xr1 = UnificationXref(uid='x1', db='UniProt', id='P28482')
+    xr2 = UnificationXref(uid='x2', db='HGNC', id='6871')
+    xr3 = RelationshipXref(uid='x3', db='UniProt', id='P27361')
+    protref = ProteinReference(uid='pr1', xref=[xr1, xr2, xr3],
+                               display_name='MAPK1', name=['ERK2'])
+    prot = Protein(uid='p1', entity_reference=protref,
+                   display_name='MAPK1-active')
+    mi = MolecularInteraction(uid='mi1', participant=[prot])
+    model = BioPaxModel([xr1, xr2, xr3, protref, prot, mi])
+
+    for m in [None, model]:
+        objects = find_objects(protref, 'xref[db=UniProt]', model=m)
+        assert objects == [xr1, xr3]
+        objects = find_objects(protref, 'xref:UnificationXref[db=UniProt]',
+                               model=m)
+        assert objects == [xr1]
+        objects = find_objects(protref, "xref[db='UniProt'][id!=P28482]",
+                               model=m)
+        assert objects == [xr3]
+        objects = find_objects(protref, 'xref[db=Reactome]', model=m)
+        assert not objects
+        objects = find_objects(mi, 'participant[display_name^=MAPK]/'
+                                   'entity_reference[name=ERK2]', model=m)
+        assert objects == [protref]
+        assert exists(mi, 'participant/entity_reference/xref[id*=2848]',
+                      model=m)
+        assert count(mi, 'participant/entity_reference/xref[id$=1]',
+                     model=m) == 2
+
+    assert model.get_attribute_index('db')['UniProt'] == {xr1, xr3}
+
+    with pytest.raises(BiopaxPathPredicateError):
+        find_objects(protref, 'xref[db]')
+    # Predicates have to follow the class constraint
+    with pytest.raises(BiopaxPathPredicateError):
+        find_objects(protref, 'xref[db=UniProt]:UnificationXref')
+
+
+def test_quoted_predicates():
+    xr1 = UnificationXref(uid='x1', db='a][b/c', id='1')
+    xr2 = UnificationXref(uid='x2', db='d]', id='2')
+    protref = ProteinReference(uid='pr1', xref=[xr1, xr2])
+    model = BioPaxModel([xr1, xr2, protref])
+    for m in [None, model]:
+        assert find_objects(protref, "xref[db='a][b/c']", model=m) == [xr1]
+        assert find_objects(protref, 'xref[db="d]"][id=2]', model=m) == \
+            [xr2]
+        assert find_objects(protref, "xref[db^='a]']", model=m) == [xr1]
+
+
+def test_predicates_outside_model():
+    # Objects referenced from the model but not part of it aren't in its
+    # attribute indexes
+    xr1 = UnificationXref(uid='x1', db='UniProt', id='P28482')
+    xr2 = UnificationXref(uid='x2', db='HGNC', id='6871')
+    protref = ProteinReference(uid='pr1', xref=[xr1, xr2])
+    model = BioPaxModel([protref, xr2])
+
+    for m in [None, model]:
+        assert find_objects(protref, 'xref[db=UniProt]', model=m) == [xr1]
+        assert find_objects(protref, 'xref[db!=HGNC]', model=m) == [xr1]
+        assert find_objects(protref, 'xref[db=HGNC]', model=m) == [xr2]
+
+
 def test_multi_step():
     model = model_from_pc_query('pathsfromto', ['MAP2K1'], ['MAPK1'])
     bcr = model.objects['BiochemicalReaction_4f689747397d98089c551022a3ae2d88']
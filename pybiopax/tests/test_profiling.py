@@ -0,0 +1,30 @@
+from pybiopax import model_to_owl_str
+from pybiopax.biopax import Protein
+from pybiopax.profiling import MEMORY_CATEGORIES, format_memory_report, \
+    memory_report, profile_load
+from pybiopax.tests.synthetic import make_synthetic_model
+
+
+def test_memory_report():
+    model = make_synthetic_model(20)
+    report = memory_report(model)
+    assert report['Protein']['count'] == \
+        len(list(model.get_objects_by_type(Protein)))
+    for stats in report.values():
+        assert stats['total'] == sum(stats[category]
+                                     for category in MEMORY_CATEGORIES)
+    assert report['Protein']['reverse_links'] > 0
+    assert report['UnificationXref']['strings'] > 0
+    table = format_memory_report(report)
+    assert table.splitlines()[-1].startswith('Total')
+
+
+def test_profile_load():
+    model = make_synthetic_model(20)
+    profile = profile_load(model_to_owl_str(model).encode('utf-8'))
+    assert set(profile.model.objects) == set(model.objects)
+    assert [phase[0] for phase in profile.phases] == \
+        ['start', 'read', 'parse_xml', 'instantiate', 'resolve_references',
+         'add_reverse_links', 'release_xml']
+    assert profile.peak > 0
+    assert 'resolve_references' in str(profile)
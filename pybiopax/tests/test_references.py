@@ -0,0 +1,53 @@
+import os
+from pybiopax.biopax import *
+from pybiopax.references import XrefNormalizer, get_prefix_statistics
+
+
+def _get_model():
+    return BioPaxModel([
+        UnificationXref(uid='x1', db='UniProt Knowledgebase', id='P04637'),
+        UnificationXref(uid='x2', db='uniprot', id='P38398'),
+        UnificationXref(uid='x3', db='HGNC', id='11998'),
+        UnificationXref(uid='x4', db='UniProt Isoform', id='P04637-2'),
+    ])
+
+
+def _normalize_prefix(db):
+    return {'uniprot knowledgebase': 'uniprot', 'uniprot': 'uniprot',
+            'hgnc': 'hgnc', 'uniprot isoform': 'uniprot.isoform'}.get(
+        db.lower())
+
+
+def test_normalized_xrefs():
+    calls = []
+
+    def prefix_normalizer(db):
+        calls.append(db)
+        return _normalize_prefix(db)
+
+    normalizer = XrefNormalizer(prefix_normalizer=prefix_normalizer)
+    model = _get_model()
+    xrefs = model.normalized_xrefs(normalizer)
+    assert xrefs['x1'] == ('uniprot', 'P04637')
+    assert xrefs['x4'] == ('uniprot.isoform', 'P04637-2')
+    assert model.normalized_xrefs(normalizer) is xrefs
+    # Each distinct database name is normalized once
+    _get_model().normalized_xrefs(normalizer)
+    assert len(calls) == 4
+
+    stats = get_prefix_statistics(model, normalize=True)
+    assert stats['hgnc'] == 1
+    assert 'HGNC' not in stats
+
+
+def test_map_uniprot_to_hgnc(tmpdir):
+    fname = os.path.join(str(tmpdir), 'uniprot_hgnc.tsv')
+    with open(fname, 'w') as fh:
+        fh.write('# uniprot\thgnc\nP04637\t11998\nP38398\t1100\n')
+    normalizer = XrefNormalizer.from_mapping_file(
+        fname, prefix_normalizer=_normalize_prefix)
+    assert normalizer.map_uniprot_to_hgnc(['P04637', 'P04637-2', 'X']) == \
+        {'P04637': '11998', 'P04637-2': '11998', 'X': None}
+    model = _get_model()
+    assert normalizer.get_hgnc_id([model.objects['x2']]) == '1100'
+    assert normalizer.get_hgnc_id(model.objects.values()) == '11998'
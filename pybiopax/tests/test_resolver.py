@@ -0,0 +1,128 @@
+import pybiopax
+from pybiopax.biopax import *
+from pybiopax.resolver import OwlElementIndex, ReferenceResolver, is_proxy, \
+    load_proxy
+
+BASE = 'http://example.org/'
+
+
+def _write_split_corpus(tmp_path):
+    # Shared references with a nested inline object and a reference to
+    # another shared object
+    xref = UnificationXref(uid=BASE + 'chebi_15422', db='ChEBI',
+                           id='CHEBI:15422')
+    ref = SmallMoleculeReference(uid=BASE + 'atp_ref', xref=[xref],
+                                 display_name='ATP')
+    shared = BioPaxModel([xref, ref], xml_base=BASE)
+    shared_path = str(tmp_path / 'shared.owl')
+    pybiopax.model_to_owl_file(shared, shared_path)
+
+    # A pathway file referring to the shared entity reference by URI
+    molecule = SmallMolecule(uid=BASE + 'atp', entity_reference=ref,
+                             display_name='ATP')
+    pathway = BioPaxModel([molecule], xml_base=BASE)
+    pathway_path = str(tmp_path / 'pathway.owl')
+    pybiopax.model_to_owl_file(pathway, pathway_path)
+    return shared_path, pathway_path
+
+
+def test_owl_element_index(tmp_path):
+    shared_path, _ = _write_split_corpus(tmp_path)
+    index = OwlElementIndex(shared_path)
+    assert set(index.offsets) == {BASE + 'chebi_15422', BASE + 'atp_ref'}
+    assert index.offsets[BASE + 'atp_ref'][0] == 'SmallMoleculeReference'
+    element = index.get_element(BASE + 'chebi_15422')
+    assert element.tag.endswith('UnificationXref')
+
+
+def test_owl_element_index_layout(tmp_path):
+    # A long comment and entity declarations before the root, and several
+    # top-level elements on one line
+    content = ('<?xml version="1.0" encoding="UTF-8"?>\n'
+               '<!DOCTYPE rdf:RDF [<!ENTITY ex "%s">]>\n'
+               '<!-- %s -->\n'
+               '<rdf:RDF '
+               'xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#"'
+               ' xmlns:bp="http://www.biopax.org/release/biopax-level3.owl#"'
+               ' xml:base="%s">'
+               '<bp:UnificationXref rdf:about="&ex;x1"><bp:db>ChEBI</bp:db>'
+               '</bp:UnificationXref><bp:SmallMoleculeReference rdf:ID="ref">'
+               '<bp:xref rdf:resource="&ex;x1"/></bp:SmallMoleculeReference>'
+               '<bp:UnificationXref rdf:about="&ex;x2"/></rdf:RDF>'
+               % (BASE, 'x' * 100000, BASE))
+    path = tmp_path / 'layout.owl'
+    path.write_text(content)
+    index = OwlElementIndex(str(path))
+    assert set(index.offsets) == {BASE + 'x1', BASE + 'x2', 'ref',
+                                  BASE + 'ref'}
+    assert index.get_element(BASE + 'x1')[0].text == 'ChEBI'
+    element = index.get_element('ref')
+    assert element.tag.endswith('SmallMoleculeReference')
+    assert element[0].values() == [BASE + 'x1']
+    assert index.get_element(BASE + 'x2').tag.endswith('UnificationXref')
+
+
+def test_lazy_resolution(tmp_path):
+    shared_path, pathway_path = _write_split_corpus(tmp_path)
+    model = pybiopax.model_from_owl_file(pathway_path)
+    assert model.objects[BASE + 'atp'].entity_reference == BASE + 'atp_ref'
+
+    resolver = ReferenceResolver({BASE: shared_path})
+    model = pybiopax.model_from_owl_file(pathway_path, resolver=resolver)
+    ref = model.objects[BASE + 'atp'].entity_reference
+    assert isinstance(ref, SmallMoleculeReference)
+    assert is_proxy(ref)
+    assert ref.uid == BASE + 'atp_ref'
+    assert BASE + 'atp_ref' not in model.objects
+    # Accessing an attribute loads the object, whose references are lazy
+    # in turn
+    assert ref.display_name == 'ATP'
+    assert not is_proxy(ref)
+    assert type(ref) is SmallMoleculeReference
+    xref = ref.xref[0]
+    assert is_proxy(xref)
+    assert load_proxy(xref).id == 'CHEBI:15422'
+    # The same uid resolves to the same object
+    other = pybiopax.model_from_owl_file(pathway_path, resolver=resolver)
+    assert other.objects[BASE + 'atp'].entity_reference is ref
+
+
+def test_snapshot_resolution(tmp_path):
+    shared_path, pathway_path = _write_split_corpus(tmp_path)
+    shared = pybiopax.model_from_owl_file(shared_path)
+    resolver = ReferenceResolver({BASE: shared})
+    model = pybiopax.model_from_owl_file(pathway_path, resolver=resolver)
+    assert model.objects[BASE + 'atp'].entity_reference is \
+        shared.objects[BASE + 'atp_ref']
+    # Objects outside the model don't get its reverse links
+    assert not shared.objects[BASE + 'atp_ref'].entity_reference_of
+
+
+def test_proxy_reverse_links(tmp_path):
+    shared_path, pathway_path = _write_split_corpus(tmp_path)
+    resolver = ReferenceResolver({BASE: shared_path})
+    model = pybiopax.model_from_owl_file(pathway_path, resolver=resolver)
+    ref = model.objects[BASE + 'atp'].entity_reference
+    # Reading reverse links doesn't load the proxy, and they are the same
+    # before and after it is loaded
+    assert ref.entity_reference_of == set()
+    assert is_proxy(ref)
+    load_proxy(ref)
+    assert ref.entity_reference_of == set()
+    # Loading another model referring to the same proxy doesn't add links
+    # to it either
+    other = pybiopax.model_from_owl_file(pathway_path, resolver=resolver)
+    assert other.objects[BASE + 'atp'].entity_reference is ref
+    assert ref.entity_reference_of == set()
+    assert not ref.xref[0].xref_of
+
+
+def test_pickle_proxy(tmp_path):
+    import pickle
+    shared_path, pathway_path = _write_split_corpus(tmp_path)
+    resolver = ReferenceResolver({BASE: shared_path})
+    model = pybiopax.model_from_owl_file(pathway_path, resolver=resolver)
+    model2 = pickle.loads(pickle.dumps(model))
+    ref = model2.objects[BASE + 'atp'].entity_reference
+    assert type(ref) is SmallMoleculeReference
+    assert ref.xref[0].id == 'CHEBI:15422'
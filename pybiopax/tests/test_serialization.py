@@ -11,3 +11,44 @@ def test_serialize_sequence_site():
     tree = seq_site.to_xml()
     assert len(tree) == 2
     assert '185' in model_owl, seq_site.to_xml()
+
+
+def test_synthetic_model_round_trip():
+    from pybiopax import model_from_owl_str
+    from pybiopax.tests.synthetic import make_synthetic_model
+    model = make_synthetic_model(50, seed=1)
+    owl_str = model_to_owl_str(model)
+    assert owl_str == model_to_owl_str(make_synthetic_model(50, seed=1))
+    model2 = model_from_owl_str(owl_str)
+    assert set(model2.objects) == set(model.objects)
+    assert model2.objects['reaction_0'].left[0].uid == \
+        model.objects['reaction_0'].left[0].uid
+
+
+def test_pickle_model():
+    import pickle
+    from pybiopax.biopax import PathwayStep
+    from pybiopax.tests.synthetic import make_synthetic_model
+    model = make_synthetic_model(50, seed=1)
+    model.uri_aliases['alias'] = 'reaction_0'
+    model2 = pickle.loads(pickle.dumps(model))
+    assert model_to_owl_str(model2) == model_to_owl_str(model)
+    assert model2.uri_aliases == {'alias': 'reaction_0'}
+    reaction = model2.objects['reaction_0']
+    participant = reaction.left[0]
+    assert participant is model2.objects[participant.uid]
+    assert reaction in participant.participant_of
+
+    # Pickling is iterative, so long chains of references don't hit the
+    # recursion limit
+    steps = [PathwayStep(uid='step_%d' % idx) for idx in range(5000)]
+    for step, next_step in zip(steps, steps[1:]):
+        step.next_step.append(next_step)
+    model2 = pickle.loads(pickle.dumps(BioPaxModel(steps)))
+    assert model2.objects['step_4999'].next_step_of == \
+        {model2.objects['step_4998']}
+
+    # Objects pickled on their own leave out their reverse links
+    step = pickle.loads(pickle.dumps(steps[-1]))
+    assert step.uid == 'step_4999'
+    assert step.next_step_of == set()
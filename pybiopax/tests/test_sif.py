@@ -0,0 +1,77 @@
+import os
+from pybiopax.biopax import *
+from pybiopax.sif import get_sif_edges, iter_sif_edges, model_to_sif_file
+
+
+def _get_model():
+    era = ProteinReference(uid='A', display_name='MAP2K1')
+    erb = ProteinReference(uid='B', display_name='MAPK1')
+    erc = ProteinReference(uid='C')
+    erd = ProteinReference(uid='D')
+    atp = SmallMoleculeReference(uid='ATP')
+    adp = SmallMoleculeReference(uid='ADP')
+    pa = Protein(uid='pa', entity_reference=era)
+    pb1 = Protein(uid='pb1', entity_reference=erb)
+    pb2 = Protein(uid='pb2', entity_reference=erb)
+    pc = Protein(uid='pc', entity_reference=erc)
+    pd = Protein(uid='pd', entity_reference=erd)
+    satp = SmallMolecule(uid='satp', entity_reference=atp)
+    sadp = SmallMolecule(uid='sadp', entity_reference=adp)
+    cplx = Complex(uid='cplx', component=[pa, pc])
+    bcr = BiochemicalReaction(uid='bcr', left=[pb1, satp], right=[pb2, sadp])
+    cat = Catalysis(uid='cat', controller=[cplx], controlled=bcr)
+    tr = TemplateReaction(uid='tr', product=[pd])
+    trr = TemplateReactionRegulation(uid='trr', controller=[pb2],
+                                     controlled=tr)
+    return BioPaxModel([era, erb, erc, erd, atp, adp, pa, pb1, pb2, pc, pd,
+                        satp, sadp, cplx, bcr, cat, tr, trr])
+
+
+def test_sif_rules():
+    edges = set(get_sif_edges(_get_model()))
+    assert edges == {
+        ('A', 'in-complex-with', 'C'),
+        ('A', 'controls-state-change-of', 'B'),
+        ('C', 'controls-state-change-of', 'B'),
+        ('A', 'controls-production-of', 'ADP'),
+        ('C', 'controls-production-of', 'ADP'),
+        ('ATP', 'consumption-controlled-by', 'A'),
+        ('ATP', 'consumption-controlled-by', 'C'),
+        ('ATP', 'used-to-produce', 'ADP'),
+        ('B', 'controls-expression-of', 'D'),
+    }, edges
+    edges = get_sif_edges(_get_model(), relations=['in-complex-with'])
+    assert edges == [('A', 'in-complex-with', 'C')]
+
+
+def test_sif_small_molecule_controller():
+    model = _get_model()
+    camp = SmallMoleculeReference(uid='cAMP')
+    scamp = SmallMolecule(uid='scamp', entity_reference=camp)
+    mod = Catalysis(uid='mod', controller=[scamp],
+                    controlled=model.objects['bcr'])
+    model = BioPaxModel(list(model.objects.values()) + [camp, scamp, mod])
+    edges = set(get_sif_edges(model, relations=['chemical-affects',
+                                                'controls-state-change-of']))
+    assert edges == {
+        ('cAMP', 'chemical-affects', 'B'),
+        ('A', 'controls-state-change-of', 'B'),
+        ('C', 'controls-state-change-of', 'B'),
+    }, edges
+
+
+def test_sif_parallel():
+    model = _get_model()
+    assert set(iter_sif_edges(model, n_jobs=2, chunk_size=2)) == \
+        set(get_sif_edges(model))
+
+
+def test_sif_file(tmpdir):
+    fname = os.path.join(str(tmpdir), 'test.sif')
+    model_to_sif_file(_get_model(), fname, relations=['in-complex-with',
+                                                      'controls-expression-of'],
+                      use_names=True)
+    with open(fname) as fh:
+        rows = sorted(line.rstrip('\n').split('\t') for line in fh)
+    assert rows == [['MAP2K1', 'in-complex-with', 'C'],
+                    ['MAPK1', 'controls-expression-of', 'D']]
@@ -0,0 +1,59 @@
+import pybiopax
+from pybiopax.biopax import *
+from pybiopax.resolver import is_proxy
+from pybiopax.store import SqliteBioPaxStore
+from pybiopax.tests.synthetic import make_synthetic_model
+
+
+def test_store_from_model(tmp_path):
+    model = make_synthetic_model(20)
+    path = str(tmp_path / 'model.db')
+    SqliteBioPaxStore.from_model(model, path).close()
+
+    with SqliteBioPaxStore(path, cache_size=10) as store:
+        assert len(store) == len(model.objects)
+        assert 'reaction_0' in store
+        assert store.xml_base == model.xml_base
+        assert store.get_object('missing') is None
+
+        protein = store.get_object('protein_0')
+        assert isinstance(protein, Protein)
+        assert protein.display_name == 'GENE0'
+        assert store.get_object('protein_0') is protein
+        ref = protein.entity_reference
+        assert is_proxy(ref)
+        assert isinstance(ref, ProteinReference)
+        assert ref.name == ['GENE0', 'GENE0', 'Gene 0']
+        assert {xref.uid for xref in ref.xref} == {'uniprot_0', 'hgnc_0'}
+
+        assert sorted(store.get_uids_by_class(Pathway)) == \
+            sorted(obj.uid for obj in model.get_objects_by_type(Pathway))
+        assert len(store.get_uids_by_class('Xref')) == \
+            len(list(model.get_objects_by_type(Xref)))
+        assert store.get_uids_by_class('Xref', subclasses=False) == []
+
+        refs = store.get_objects_by_xref('uniprot', 'P00003')
+        assert [obj.uid for obj in refs] == ['protein_ref_3']
+        assert [obj.uid for obj in store.get_objects_by_name('gene 3')] == \
+            ['protein_ref_3']
+        assert set(store.get_referring_uids('protein_ref_3')) == \
+            {'protein_3'}
+
+
+def test_store_from_owl_file(tmp_path):
+    model = make_synthetic_model(10)
+    fname = str(tmp_path / 'model.owl')
+    pybiopax.model_to_owl_file(model, fname)
+    store = SqliteBioPaxStore(str(tmp_path / 'model.db'))
+    store.add_owl_file(fname, batch_size=7)
+    assert len(store) == len(model.objects)
+    reaction = store.get_object('reaction_0')
+    assert [entity.uid for entity in reaction.left] == \
+        [entity.uid for entity in model.objects['reaction_0'].left]
+    # Replacing objects doesn't duplicate their values
+    store.add_model(model)
+    store._cache.clear()
+    assert len(store.get_object('protein_ref_0').xref) == 2
+    assert store.get_objects_by_xref('UniProt', 'P00000')[0].uid == \
+        'protein_ref_0'
+    store.close()
@@ -0,0 +1,37 @@
+import json
+from pybiopax.biopax import *
+from pybiopax.tests.synthetic import make_synthetic_model
+from pybiopax.validation import validate_model
+
+
+def test_validate_model():
+    model = make_synthetic_model(20)
+    report = validate_model(model)
+    assert report.is_valid, report.issues
+
+    reaction = model.objects['reaction_0']
+    reaction.left.append('missing_entity')
+    reaction.right.append(model.objects['uniprot_0'])
+    reaction.display_name = ['reaction 0']
+    model.objects['protein_0'].entity_reference = \
+        ProteinReference(uid='not_in_model')
+    model.objects['uniprot_1'].db = model.objects['provenance']
+
+    report = validate_model(model)
+    assert report.get_counts() == {'dangling_reference': 2, 'type': 2,
+                                   'cardinality': 1}
+    issues = report.get_issues(uid='reaction_0')
+    assert {(issue.kind, issue.attribute, str(issue.value))
+            for issue in issues} == {
+        ('dangling_reference', 'left', 'missing_entity'),
+        ('type', 'right', 'uniprot_0'),
+        ('cardinality', 'display_name', "['reaction 0']"),
+    }
+    assert report.get_issues('dangling_reference', 'protein_0')[0].value == \
+        'not_in_model'
+    assert report.get_issues('type', 'uniprot_1')[0].value == 'provenance'
+    assert json.loads(json.dumps(report.to_dict()))['counts'] == \
+        report.get_counts()
+
+    parallel_report = validate_model(model, n_jobs=2, chunk_size=50)
+    assert parallel_report.to_dict() == report.to_dict()
@@ -0,0 +1,285 @@
+"""This module implements a validator for BioPAX models checking, in a
+single pass over the objects of a model, that:
+
+- references point to objects in the model, rather than being left as uid
+  strings because the referenced object wasn't defined in the content
+  (dangling references),
+- referenced objects are of the class the BioPAX Level 3 ontology requires
+  for the attribute (type constraints), and literal attributes don't refer
+  to objects,
+- list-valued attributes hold lists and single-valued attributes don't
+  (cardinality).
+
+Type constraints are checked against the global range of each property in
+the ontology, restrictions of ranges in specific classes (e.g., that the
+controlled process of a Catalysis is a Conversion) aren't checked.
+"""
+__all__ = ['ATTRIBUTE_RANGES', 'ValidationIssue', 'ValidationReport',
+           'validate_model']
+
+import logging
+from collections import Counter
+from typing import Any, List, Mapping, Optional
+
+from . import biopax
+from .biopax import BioPaxModel, BioPaxObject
+from .biopax.base import get_attribute_keys
+from .parallel import map_chunks
+
+logger = logging.getLogger(__name__)
+
+ATTRIBUTE_RANGES = {
+    'absolute_region': ['SequenceLocation'],
+    'binds_to': ['BindingFeature'],
+    'cell_type': ['CellVocabulary'],
+    'cellular_location': ['CellularLocationVocabulary'],
+    'cofactor': ['PhysicalEntity'],
+    'component': ['PhysicalEntity'],
+    'component_stoichiometry': ['Stoichiometry'],
+    'confidence': ['Score'],
+    'controlled': ['Interaction', 'Pathway'],
+    'controller': ['PhysicalEntity', 'Pathway'],
+    'data_source': ['Provenance'],
+    'delta_g': ['DeltaG'],
+    'entity_feature': ['EntityFeature'],
+    'entity_reference': ['EntityReference'],
+    'entity_reference_type': ['EntityReferenceTypeVocabulary'],
+    'evidence': ['Evidence'],
+    'evidence_code': ['EvidenceCodeVocabulary'],
+    'experimental_feature': ['EntityFeature'],
+    'experimental_form': ['ExperimentalForm'],
+    'experimental_form_description': ['ExperimentalFormVocabulary'],
+    'experimental_form_entity': ['PhysicalEntity', 'Gene'],
+    'feature': ['EntityFeature'],
+    'feature_location': ['SequenceLocation'],
+    'feature_location_type': ['SequenceRegionVocabulary'],
+    'interaction_type': ['InteractionVocabulary'],
+    'k_e_q': ['KPrime'],
+    'left': ['PhysicalEntity'],
+    'member_entity_reference': ['EntityReference'],
+    'member_feature': ['EntityFeature'],
+    'member_physical_entity': ['PhysicalEntity'],
+    'modification_type': ['SequenceModificationVocabulary'],
+    'next_step': ['PathwayStep'],
+    'not_feature': ['EntityFeature'],
+    'organism': ['BioSource'],
+    'owner_entity_reference': ['EntityReference'],
+    'participant': ['Entity'],
+    'participant_stoichiometry': ['Stoichiometry'],
+    'pathway_component': ['Interaction', 'Pathway'],
+    'pathway_order': ['PathwayStep'],
+    'phenotype': ['PhenotypeVocabulary'],
+    'physical_entity': ['PhysicalEntity'],
+    'product': ['Dna', 'Rna', 'Protein'],
+    'region_type': ['SequenceRegionVocabulary'],
+    'relationship_type': ['RelationshipTypeVocabulary'],
+    'right': ['PhysicalEntity'],
+    'score_source': ['Provenance'],
+    'sequence_interval_begin': ['SequenceSite'],
+    'sequence_interval_end': ['SequenceSite'],
+    'step_conversion': ['Conversion'],
+    'step_process': ['Interaction', 'Pathway'],
+    'structure': ['ChemicalStructure'],
+    'sub_region': ['NucleicAcidRegionReference'],
+    'taxon_xref': ['Xref'],
+    'template': ['Dna', 'Rna'],
+    'tissue': ['TissueVocabulary'],
+    'xref': ['Xref'],
+}
+"""The names of the classes the values of attributes referring to other
+objects can be instances of, following the ranges of the corresponding
+properties in the BioPAX Level 3 ontology. All other attributes are
+literals."""
+
+_range_classes = {attr: tuple(getattr(biopax, cls) for cls in classes)
+                  for attr, classes in ATTRIBUTE_RANGES.items()}
+
+
+class ValidationIssue:
+    """A problem found in an attribute value of an object.
+
+    Attributes
+    ----------
+    kind : str
+        The kind of issue: ``dangling_reference`` for a reference to an
+        object not in the model, ``type`` for a value of the wrong class
+        and ``cardinality`` for a list in a single-valued attribute or vice
+        versa.
+    uid : str
+        The uid of the object.
+    attribute : str
+        The name of the attribute.
+    value : Any
+        The offending value, with objects given by uid.
+    message : str
+        A description of the issue.
+    """
+    def __init__(self, kind: str, uid: str, attribute: str, value: Any,
+                 message: str):
+        self.kind = kind
+        self.uid = uid
+        self.attribute = attribute
+        self.value = value
+        self.message = message
+
+    def to_dict(self) -> Mapping[str, Any]:
+        """Return the issue as a JSON-serializable dict."""
+        return {'kind': self.kind, 'uid': self.uid,
+                'attribute': self.attribute, 'value': self.value,
+                'message': self.message}
+
+    def __str__(self):
+        return '%s.%s: %s' % (self.uid, self.attribute, self.message)
+
+    def __repr__(self):
+        return '%s(%s)' % (self.__class__.__name__, str(self))
+
+
+class ValidationReport:
+    """The issues found by validating a model.
+
+    Attributes
+    ----------
+    issues : list of ValidationIssue
+        The issues found, in the order of the objects in the model.
+    num_objects : int
+        The number of objects validated.
+    """
+    def __init__(self, issues: List[ValidationIssue], num_objects: int):
+        self.issues = issues
+        self.num_objects = num_objects
+
+    @property
+    def is_valid(self) -> bool:
+        """True if no issues were found."""
+        return not self.issues
+
+    def get_counts(self) -> Mapping[str, int]:
+        """Return the number of issues of each kind."""
+        return dict(Counter(issue.kind for issue in self.issues))
+
+    def get_issues(self, kind: Optional[str] = None,
+                   uid: Optional[str] = None) -> List[ValidationIssue]:
+        """Return the issues of a given kind and/or object.
+
+        Parameters
+        ----------
+        kind :
+            If given, only issues of this kind are returned.
+        uid :
+            If given, only issues of the object with this uid are returned.
+
+        Returns
+        -------
+        :
+            A list of issues.
+        """
+        return [issue for issue in self.issues
+                if (kind is None or issue.kind == kind)
+                and (uid is None or issue.uid == uid)]
+
+    def to_dict(self) -> Mapping[str, Any]:
+        """Return the report as a JSON-serializable dict."""
+        return {'num_objects': self.num_objects,
+                'counts': self.get_counts(),
+                'issues': [issue.to_dict() for issue in self.issues]}
+
+    def __str__(self):
+        if not self.issues:
+            return 'No issues in %d objects' % self.num_objects
+        counts = ', '.join('%d %s' % (count, kind)
+                           for kind, count in sorted(self.get_counts()
+                                                     .items()))
+        return '%d issues in %d objects: %s' % (len(self.issues),
+                                                self.num_objects, counts)
+
+
+def validate_model(model: BioPaxModel, n_jobs: Optional[int] = 1,
+                   chunk_size: int = 10000) -> ValidationReport:
+    """Validate the references, types and cardinalities of a model.
+
+    Parameters
+    ----------
+    model :
+        A BioPAX Model.
+    n_jobs :
+        The number of worker processes to validate chunks of objects in,
+        see :func:`pybiopax.parallel.map_chunks`. Default: 1
+    chunk_size :
+        The number of objects per chunk. Default: 10000
+
+    Returns
+    -------
+    :
+        The report of the issues found.
+    """
+    objects = list(model.objects.values())
+    issues = []
+    for chunk_issues in map_chunks(_validate_chunk, (model, objects),
+                                   len(objects), n_jobs=n_jobs,
+                                   chunk_size=chunk_size):
+        issues += chunk_issues
+    report = ValidationReport(issues, len(objects))
+    logger.info('Validated model: %s' % report)
+    return report
+
+
+def _validate_chunk(state, start, end):
+    model, objects = state
+    issues = []
+    for obj in objects[start:end]:
+        issues += _validate_object(model, obj)
+    return issues
+
+
+def _validate_object(model, obj):
+    issues = []
+    list_types = obj.list_types
+    for attr, key in get_attribute_keys(obj):
+        val = obj.__dict__.get(key)
+        if val is None:
+            continue
+        is_list = isinstance(val, list)
+        if is_list != (attr in list_types):
+            issues.append(ValidationIssue(
+                'cardinality', obj.uid, attr, _get_value(val),
+                'expected a list' if not is_list
+                else 'expected a single value'))
+        classes = _range_classes.get(attr)
+        for v in (val if is_list else [val]):
+            if classes is None:
+                if isinstance(v, BioPaxObject):
+                    issues.append(ValidationIssue(
+                        'type', obj.uid, attr, v.uid,
+                        'expected a literal, got %s %s'
+                        % (v.__class__.__name__, v.uid)))
+            elif isinstance(v, BioPaxObject):
+                if model.objects.get(v.uid) is not v:
+                    issues.append(ValidationIssue(
+                        'dangling_reference', obj.uid, attr, v.uid,
+                        '%s is not in the model' % v.uid))
+                if not isinstance(v, classes):
+                    issues.append(ValidationIssue(
+                        'type', obj.uid, attr, v.uid,
+                        'expected %s, got %s %s'
+                        % (' or '.join(ATTRIBUTE_RANGES[attr]),
+                           v.__class__.__name__, v.uid)))
+            elif isinstance(v, str):
+                issues.append(ValidationIssue(
+                    'dangling_reference', obj.uid, attr, v,
+                    '%s is not defined' % v))
+            else:
+                issues.append(ValidationIssue(
+                    'type', obj.uid, attr, _get_value(v),
+                    'expected %s, got %s'
+                    % (' or '.join(ATTRIBUTE_RANGES[attr]),
+                       type(v).__name__)))
+    return issues
+
+
+def _get_value(val):
+    if isinstance(val, list):
+        return [_get_value(v) for v in val]
+    elif isinstance(val, BioPaxObject):
+        return val.uid
+    return val
@@ -3,9 +3,6 @@ import pathlib
 import re
 from typing import Union
 
-from lxml import etree
-from lxml.builder import ElementMaker
-
 
 namespaces = {
     'xsd': 'http://www.w3.org/2001/XMLSchema#',
@@ -16,14 +13,22 @@ namespaces = {
 }
 
 
-makers = {
-    ns: ElementMaker(namespace=prefix)
-    for ns, prefix in namespaces.items()
-}
+class _ElementMakers(dict):
+    """A dict of lxml element makers by namespace prefix, created on first
+    use so that lxml is only imported when XML is actually built."""
+    def __missing__(self, ns):
+        from lxml.builder import ElementMaker
+        maker = ElementMaker(namespace=namespaces[ns])
+        self[ns] = maker
+        return maker
+
+
+makers = _ElementMakers()
 
 
 def wrap_xml_elements(elements, xml_base):
     """Return a valid BioPAX OWL wrapping XML-serialized BioPAX objects."""
+    from lxml.builder import ElementMaker
     # We first make the RDF wrapper and add an Ontology element first
     rdfm = ElementMaker(namespace=namespaces['rdf'],
                         nsmap=namespaces)
@@ -43,6 +48,7 @@ def wrap_xml_elements(elements, xml_base):
 
 def xml_to_str(xml):
     """Return the OWL string for an XML element tree."""
+    from lxml import etree
     xmlb = etree.tostring(xml, pretty_print=True,
                           encoding='utf-8', xml_declaration=True)
     xmls = xmlb.decode('utf-8')
@@ -35,8 +35,14 @@ setup(name='pybiopax',
           'Programming Language :: Python :: 3.9',
           'License :: OSI Approved :: BSD License',
       ],
-      packages=find_packages(),
+      packages=find_packages(exclude=['benchmarks', 'benchmarks.*']),
       install_requires=['lxml', 'requests', 'tqdm'],
+      extras_require={
+          'graph': ['numpy', 'scipy', 'networkx'],
+          'references': ['bioregistry'],
+          'columnar': ['pyarrow'],
+          'json': ['orjson'],
+      },
       tests_require=['pytest', 'pytest-cov', 'tox'],
       keywords=['biology', 'pathway']
       )